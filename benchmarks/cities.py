@@ -0,0 +1,110 @@
+"""Micro-benchmark of the city index: build time, suggestion and nearby latency.
+
+Synthetic cities with diacritics and multi-word names spread over Central Europe
+are indexed, then random prefixes of their names (1-8 characters, with and without
+diacritics) and cities nearby random ones are queried:
+
+    PYTHONPATH=src python -m benchmarks.cities --cities 50000 --queries 20000
+
+Results are printed as JSON, latencies are in microseconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from random import Random
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import orjson
+
+from rides.domain.models import City, CityId
+from rides.infrastructure.repositories.city_index import CityIndex, normalize_city_name
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SYLLABLES = ('ber', 'lin', 'ko', 'pen', 'ha', 'gen', 'ár', 'hus', 'mün', 'chen', 'łódź', 'krak', 'ów', 'sø', 'borg')
+WORDS = ('am Main', 'upon Tyne', 'Saint', 'Nowy', 'Sankt', 'Bad', 'le Grand')
+MULTI_WORD_SHARE = 0.2
+LATITUDES, LONGITUDES = (47.0, 57.0), (5.0, 25.0)
+NORMALIZED_QUERIES_SHARE = 0.5
+
+
+def generate_cities(count: int, rng: Random) -> list[City]:
+    """Return cities with names of 2-4 syllables, some of them with a second word
+    and popularity of a long-tail distribution.
+    """
+    cities = []
+    for n in range(count):
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if rng.random() < MULTI_WORD_SHARE:
+            word = rng.choice(WORDS)
+            name = f'{word} {name}' if rng.getrandbits(1) else f'{name} {word}'
+        cities.append(
+            City(
+                id=CityId(UUID(int=n)),
+                name=name,
+                latitude=rng.uniform(*LATITUDES),
+                longitude=rng.uniform(*LONGITUDES),
+                popularity=int(rng.paretovariate(1.2) * 1000),
+            )
+        )
+    return cities
+
+
+def measure_us[T](func: Callable[[T], object], args: list[T]) -> dict[str, float]:
+    """Call the function with every argument and return latency stats."""
+    latencies_us = []
+    for arg in args:
+        started = time.perf_counter()
+        func(arg)
+        latencies_us.append((time.perf_counter() - started) * 1e6)
+
+    percentiles = statistics.quantiles(latencies_us, n=100)
+    return {
+        'max': round(max(latencies_us), 1),
+        'mean': round(statistics.fmean(latencies_us), 1),
+        'p50': round(percentiles[49], 1),
+        'p99': round(percentiles[98], 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.cities', description=__doc__.split('\n')[0])
+    parser.add_argument('--cities', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=20_000)
+    parser.add_argument('--limit', type=int, default=10, help='suggestions per query')
+    parser.add_argument('--radius', type=int, default=30, help='radius of nearby cities in km')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = Random(args.seed)  # noqa: S311
+    cities = generate_cities(args.cities, rng)
+
+    started = time.perf_counter()
+    index = CityIndex(cities)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(cities).name
+        name = normalize_city_name(name) if rng.random() < NORMALIZED_QUERIES_SHARE else name
+        queries.append(name[: rng.randint(1, 8)])
+
+    suggest_us = measure_us(lambda query: index.suggest(query, args.limit), queries)
+    nearby_us = measure_us(
+        lambda city: index.list_nearby_ids(city.id, args.radius), rng.choices(cities, k=args.queries)
+    )
+
+    results = {'build_ms': round(build_ms, 1), 'cities': len(index), 'nearby_us': nearby_us, 'suggest_us': suggest_us}
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Micro-benchmarks of domain entities and value objects.
+
+Measure construction and mutation costs, i.e. the overhead of change tracking
+(importing the models requires envs of the app, e.g. infra/dev.env):
+
+    PYTHONPATH=src python -m benchmarks.entities --number 100000
+
+Results are printed as JSON in nanoseconds per call (best of --repeat runs).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+import orjson
+
+from rides.domain.models import CityId, Currency, OwnerId, Passenger, PassengerId, PriceVO, Ride, RideId, RouteVO
+from rides.domain.params_spec import CreateRideParams
+from users.domain.models import User, UserId
+from users.domain.params_spec import CreateUserParams
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEPARTURE_TIME = datetime.now(UTC) + timedelta(days=7)
+PRICE = PriceVO(currency=Currency.EUR_CENT, value=1500)
+CITY_ID_DEPARTURE, CITY_ID_DESTINATION = CityId(uuid4()), CityId(uuid4())
+ROUTE = RouteVO(city_id_departure=CITY_ID_DEPARTURE, city_id_destination=CITY_ID_DESTINATION)
+OWNER_ID = OwnerId(UserId(uuid4()))
+CREATE_RIDE_PARAMS = CreateRideParams(
+    departure_time=DEPARTURE_TIME,
+    description=None,
+    owner_id=OWNER_ID,
+    price=PRICE,
+    route=ROUTE,
+    seats_number=4,
+    series_id=None,
+)
+CREATE_USER_PARAMS = CreateUserParams(
+    birth_date=date(1990, 1, 1), email='bench@example.com', first_name='Anna', last_name='Andersen'
+)
+PASSENGER_ID = PassengerId(UserId(uuid4()))
+RIDE_ID = RideId(uuid4())
+USER_ID = UserId(uuid4())
+
+
+def load_ride() -> Ride:
+    """Initialize a ride as repositories do."""
+    return Ride(
+        departure_time=DEPARTURE_TIME,
+        description=None,
+        id=RIDE_ID,
+        is_cancelled=False,
+        owner_id=OWNER_ID,
+        passengers=[],
+        price=PRICE,
+        route=ROUTE,
+        seats_number=4,
+        series_id=None,
+        waitlist=[],
+    )
+
+
+def load_user() -> User:
+    """Initialize a user as repositories do."""
+    return User(
+        birth_date=date(1990, 1, 1),
+        email='bench@example.com',
+        email_confirmed=True,
+        first_name='Anna',
+        id=USER_ID,
+        last_name='Andersen',
+    )
+
+
+def update_ride() -> None:
+    """Update a ride as UpdateRideUsecase and the repository do."""
+    ride = load_ride()
+    ride.description = 'No smoking'
+    ride.price = PRICE
+    ride.get_changed_fields()
+    ride.clear_changed_fields()
+
+
+def book_and_leave_ride() -> None:
+    """Add and remove a passenger."""
+    ride = load_ride()
+    ride.add_passenger(Passenger(id=PASSENGER_ID, seats_booked=1))
+    ride.remove_passenger(PASSENGER_ID)
+    ride.get_changed_fields()
+
+
+def update_user() -> None:
+    """Update a user as UpdateUserUsecase and the repository do."""
+    user = load_user()
+    user.first_name = 'Ben'
+    user.email = 'other@example.com'
+    user.get_changed_fields()
+    user.clear_changed_fields()
+
+
+def read_ride() -> tuple[object, ...]:
+    """Read fields of a loaded ride as queries and responses do."""
+    ride = RIDE
+    return (ride.id, ride.departure_time, ride.description, ride.price, ride.route, ride.seats_available)
+
+
+def read_user() -> tuple[object, ...]:
+    """Read fields of a loaded user as responses do."""
+    user = USER
+    return (user.id, user.birth_date, user.email, user.email_confirmed, user.first_name, user.last_name)
+
+
+RIDE = load_ride()
+USER = load_user()
+
+CASES: dict[str, Callable[[], object]] = {
+    'passenger': lambda: Passenger(id=PASSENGER_ID, seats_booked=1),
+    'price_vo': lambda: PriceVO(currency=Currency.EUR_CENT, value=1500),
+    'ride.book_and_leave': book_and_leave_ride,
+    'ride.create': lambda: Ride.create(CREATE_RIDE_PARAMS),
+    'ride.load': load_ride,
+    'ride.read': read_ride,
+    'ride.update': update_ride,
+    'route_vo': lambda: RouteVO(city_id_departure=CITY_ID_DEPARTURE, city_id_destination=CITY_ID_DESTINATION),
+    'user.create': lambda: User.create(CREATE_USER_PARAMS),
+    'user.load': load_user,
+    'user.read': read_user,
+    'user.update': update_user,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.entities', description=__doc__.split('\n')[0])
+    parser.add_argument('--number', type=int, default=100_000, help='calls per run')
+    parser.add_argument('--repeat', type=int, default=5, help='runs, the best is reported')
+    parser.add_argument('cases', nargs='*', help=f'cases to run, all by default: {", ".join(CASES)}')
+    args = parser.parse_args(argv)
+    if unknown := set(args.cases) - CASES.keys():
+        parser.error(f'unknown cases: {", ".join(sorted(unknown))}')
+
+    results = {}
+    for name in args.cases or CASES:
+        timings = timeit.repeat(CASES[name], number=args.number, repeat=args.repeat)
+        results[name] = {'ns_per_call': round(min(timings) / args.number * 1e9, 1)}
+
+    report = {'python': sys.version.split()[0], 'number': args.number, 'repeat': args.repeat, 'results': results}
+    sys.stdout.buffer.write(orjson.dumps(report, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Plans of the rides filter variants before and after the covering index.
+
+Runs against the configured Postgres (e.g. infra/dev.env with infra/compose.yaml),
+migrated to the head:
+
+    PYTHONPATH=src python -m benchmarks.filter_plans --seed-rides 200000
+
+Every variant of SQLAlchemyFilterRidesQuery is explained with ANALYZE and BUFFERS
+on the current schema ('after') and in a rolled back transaction, which replaces
+ix_ride_active_route_departure with the previous ix_ride_city_from_to_departure
+('before'). The transaction locks the rides table, use a benchmark database.
+
+--seed-rides inserts synthetic rides and vacuums the table, so the visibility map
+allows index-only scans. The rides are committed. The busiest route-day and cities
+of the table are filtered. Results are printed as JSON, times are in milliseconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+from dataclasses import replace
+from datetime import UTC, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+import orjson
+from sqlalchemy import text
+
+from rides.application.queries.filter_rides import PriceDTO, RidesFilterDTO
+from rides.domain.models import Currency
+from rides.infrastructure.queries.sqlalchemy_filter_rides import SQLAlchemyFilterRidesQuery
+from shared.infrastructure.config import get_settings
+from shared.infrastructure.sqlalchemy import create_engine
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+RADIUS_CITIES = 8  # per side, as MAX_NEARBY_CITIES
+
+SEED_RIDES_SQL = """
+INSERT INTO rides (
+    city_id_departure, city_id_destination, created_at, departure_time, description, id, is_cancelled,
+    owner_id, price_currency, price_value, seats_available, seats_number
+)
+SELECT
+    cities[1 + floor(random() * array_length(cities, 1))::int],
+    cities[1 + floor(random() * array_length(cities, 1))::int],
+    now(),
+    date_trunc('day', now()) + interval '1 day' + random() * (:days * interval '1 day'),
+    NULL,
+    gen_random_uuid(),
+    random() < 0.05,
+    gen_random_uuid(),
+    CASE WHEN random() < 0.9 THEN 'DKK_ORE' ELSE 'EUR_CENT' END::currency,
+    100 * (10 + floor(random() * 490)::int),
+    floor(random() * 5)::int,
+    4
+FROM generate_series(1, :count), (SELECT CAST(:cities AS uuid[]) AS cities) AS c
+"""
+BUSIEST_ROUTE_DAY_SQL = """
+SELECT city_id_departure, city_id_destination, (departure_time AT TIME ZONE 'UTC')::date
+FROM rides WHERE NOT is_cancelled AND departure_time > now()
+GROUP BY 1, 2, 3 ORDER BY count(*) DESC LIMIT 1
+"""
+BUSIEST_CITIES_SQL = """
+SELECT {column} FROM rides WHERE NOT is_cancelled GROUP BY 1 ORDER BY count(*) DESC LIMIT :limit
+"""
+PREVIOUS_INDEX_SQL = (
+    'DROP INDEX ix_ride_active_route_departure',
+    'CREATE INDEX ix_ride_city_from_to_departure ON rides (city_id_departure, city_id_destination, departure_time)',
+)
+
+
+async def seed_rides(engine: AsyncEngine, count: int, cities: int, days: int) -> None:
+    """Insert random rides between random cities departing within the days."""
+    city_ids = [str(uuid4()) for _ in range(cities)]
+    async with engine.begin() as conn:
+        await conn.execute(text(SEED_RIDES_SQL), {'cities': city_ids, 'count': count, 'days': days})
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level='AUTOCOMMIT')
+        await conn.execute(text('VACUUM ANALYZE rides'))
+
+
+async def get_variants(conn: AsyncConnection) -> dict[str, RidesFilterDTO]:
+    """Return filters of every variant for the busiest route-day."""
+    row = (await conn.execute(text(BUSIEST_ROUTE_DAY_SQL))).one_or_none()
+    if row is None:
+        msg = 'No upcoming rides, use --seed-rides'
+        raise SystemExit(msg)
+
+    city_id_departure, city_id_destination, day = row
+    day_start = datetime.combine(day, time(0, 0, tzinfo=UTC))
+    base = RidesFilterDTO(
+        city_ids_departure=(city_id_departure,),
+        city_ids_destination=(city_id_destination,),
+        departure_time_from=day_start,
+        departure_time_to=day_start + timedelta(days=1),
+        max_price=None,
+        min_seats_available=1,
+        sort_by='departure_time',
+    )
+
+    busiest: dict[str, tuple[Any, ...]] = {}
+    for column in ('city_id_departure', 'city_id_destination'):
+        q = text(BUSIEST_CITIES_SQL.format(column=column))
+        busiest[column] = tuple((await conn.execute(q, {'limit': RADIUS_CITIES})).scalars())
+
+    return {
+        'day': base,
+        'time_window': replace(
+            base, departure_time_from=day_start + timedelta(hours=8), departure_time_to=day_start + timedelta(hours=12)
+        ),
+        'max_price': replace(base, max_price=PriceDTO(currency=Currency.DKK_ORE, value=20000)),
+        'sort_by_price': replace(base, sort_by='price'),
+        'radius': replace(
+            base, city_ids_departure=busiest['city_id_departure'], city_ids_destination=busiest['city_id_destination']
+        ),
+        'radius_all_filters': replace(
+            base,
+            city_ids_departure=busiest['city_id_departure'],
+            city_ids_destination=busiest['city_id_destination'],
+            departure_time_from=day_start + timedelta(hours=8),
+            departure_time_to=day_start + timedelta(hours=12),
+            max_price=PriceDTO(currency=Currency.DKK_ORE, value=20000),
+            sort_by='price',
+        ),
+    }
+
+
+def summarize(plan: dict[str, Any]) -> dict[str, Any]:
+    """Return the scans, heap fetches and buffers of the plan."""
+    nodes, stack = [], [plan['Plan']]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get('Plans', ()))
+
+    return {
+        'heap_fetches': sum(node.get('Heap Fetches', 0) for node in nodes),
+        'nodes': [' '.join(filter(None, (node['Node Type'], node.get('Index Name')))) for node in nodes],
+        'shared_blocks': plan['Plan'].get('Shared Hit Blocks', 0) + plan['Plan'].get('Shared Read Blocks', 0),
+    }
+
+
+async def explain(conn: AsyncConnection, variants: dict[str, RidesFilterDTO], repeat: int) -> dict[str, Any]:
+    """Explain every variant, the execution time is the median of the runs."""
+    results = {}
+    for name, rides_filter in variants.items():
+        stmt = SQLAlchemyFilterRidesQuery.get_statement(rides_filter)
+        sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+
+        plans = [
+            (await conn.execute(text(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}'))).scalar_one()[0]
+            for _ in range(repeat)
+        ]
+        results[name] = summarize(plans[-1]) | {
+            'execution_ms': round(statistics.median(plan['Execution Time'] for plan in plans), 3),
+            'rows': plans[-1]['Plan']['Actual Rows'],
+        }
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Seed, explain the variants with the current index, then with the previous one."""
+    engine = create_engine(get_settings())
+    try:
+        if args.seed_rides:
+            await seed_rides(engine, args.seed_rides, args.cities, args.days)
+
+        async with engine.connect() as conn:
+            variants = await get_variants(conn)
+            after = await explain(conn, variants, args.repeat)
+            await conn.rollback()
+
+            async with conn.begin() as transaction:
+                for sql in PREVIOUS_INDEX_SQL:
+                    await conn.execute(text(sql))
+                await conn.execute(text('ANALYZE rides'))
+                before = await explain(conn, variants, args.repeat)
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    return {name: {'after': after[name], 'before': before[name]} for name in variants}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.filter_plans', description=__doc__.split('\n')[0])
+    parser.add_argument('--seed-rides', type=int, default=0, help='rides to insert before explaining')
+    parser.add_argument('--cities', type=int, default=200, help='cities of the seeded rides')
+    parser.add_argument('--days', type=int, default=60, help='seeded rides depart within this number of days')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of every variant')
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
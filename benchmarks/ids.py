@@ -0,0 +1,156 @@
+"""Insert throughput of random (UUIDv4) and time-ordered (UUIDv7) primary keys.
+
+Runs against the configured Postgres (e.g. infra/dev.env with infra/compose.yaml):
+
+    PYTHONPATH=src python -m benchmarks.ids --prefill 1000000 --rows 200000
+
+Every scheme gets a table shaped like the users one. 'uuid4_id_index' is the
+previous scheme: random ids plus the redundant index on id next to the primary
+key. 'uuid4' drops that index, and 'uuid7' also uses time-ordered ids. A table is
+prefilled, then rows are inserted by batches in separate transactions, as the
+app does. Throughput, WAL written and the size of the indexes are measured, and
+the tables are dropped. Use a benchmark database, since the WAL of other
+sessions is counted too.
+
+--no-db measures only how long the ids take to generate. Results are printed as
+JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import timeit
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+import orjson
+from sqlalchemy import TIMESTAMP, Boolean, Column, Date, MetaData, String, Table, Uuid, text
+
+from shared.domain.ids import uuid7
+from shared.infrastructure.config import get_settings
+from shared.infrastructure.sqlalchemy import create_engine
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+SCHEMES: dict[str, tuple[Callable[[], UUID], bool]] = {  # id factory, if id has an own index
+    'uuid4_id_index': (uuid4, True),
+    'uuid4': (uuid4, False),
+    'uuid7': (uuid7, False),
+}
+PREFILL_BATCH = 10_000
+MB = 1024 * 1024
+
+
+def create_table(metadata: MetaData, name: str, *, id_index: bool) -> Table:
+    """Return a table shaped like the users one."""
+    return Table(
+        f'bench_ids_{name}',
+        metadata,
+        Column('birth_date', Date, nullable=False),
+        Column('created_at', TIMESTAMP(timezone=True), nullable=False),
+        Column('email_confirmed', Boolean, nullable=False),
+        Column('first_name', String, nullable=False),
+        Column('id', Uuid, primary_key=True, index=id_index),
+        Column('last_name', String, nullable=False),
+    )
+
+
+async def insert_rows(engine: AsyncEngine, table: Table, new_id: Callable[[], UUID], rows: int, batch: int) -> float:
+    """Insert the rows by batches, a transaction each. Return the elapsed seconds."""
+    now = datetime.now(UTC)
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        values = [
+            {
+                'birth_date': date(1990, 1, 1),
+                'created_at': now,
+                'email_confirmed': False,
+                'first_name': 'Benchmark',
+                'id': new_id(),
+                'last_name': 'User',
+            }
+            for _ in range(min(batch, rows - offset))
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(table.insert(), values)
+    return time.perf_counter() - started
+
+
+async def measure_scheme(
+    engine: AsyncEngine, name: str, new_id: Callable[[], UUID], *, id_index: bool, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Prefill the table of the scheme, then measure the inserts."""
+    metadata = MetaData()
+    table = create_table(metadata, name, id_index=id_index)
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    try:
+        await insert_rows(engine, table, new_id, args.prefill, PREFILL_BATCH)
+        async with engine.connect() as conn:
+            wal_lsn = await conn.scalar(text('SELECT pg_current_wal_insert_lsn()'))
+
+        elapsed = await insert_rows(engine, table, new_id, args.rows, args.batch)
+
+        async with engine.connect() as conn:
+            wal_q = text('SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), CAST(:lsn AS pg_lsn))')
+            wal_bytes = await conn.scalar(wal_q, {'lsn': str(wal_lsn)})
+            indexes_bytes = await conn.scalar(
+                text('SELECT pg_indexes_size(CAST(:table AS regclass))'), {'table': table.name}
+            )
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+
+    return {
+        'indexes_mb': round(indexes_bytes / MB, 1),
+        'rows_per_sec': round(args.rows / elapsed),
+        'wal_bytes_per_row': round(float(wal_bytes) / args.rows),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure every scheme on its own table."""
+    engine = create_engine(get_settings())
+    try:
+        return {
+            name: await measure_scheme(engine, name, new_id, id_index=id_index, args=args)
+            for name, (new_id, id_index) in SCHEMES.items()
+        }
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ids', description=__doc__.split('\n')[0])
+    parser.add_argument('--prefill', type=int, default=1_000_000, help='rows inserted before measuring')
+    parser.add_argument('--rows', type=int, default=200_000, help='measured rows')
+    parser.add_argument('--batch', type=int, default=10, help='rows per transaction')
+    parser.add_argument('--no-db', action='store_true', help='measure the ids generation only')
+    args = parser.parse_args(argv)
+
+    number = 200_000
+    results: dict[str, Any] = {
+        'generate_ns': {
+            'uuid4': round(timeit.timeit(uuid4, number=number) / number * 1e9),
+            'uuid7': round(timeit.timeit(uuid7, number=number) / number * 1e9),
+        }
+    }
+    if not args.no_db:
+        results['inserts'] = asyncio.run(run(args))
+
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
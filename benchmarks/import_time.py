@@ -0,0 +1,90 @@
+"""Import-time profile of the app's entry points.
+
+Each target is imported in fresh interpreters with -X importtime, the best run is
+reported with the heaviest top-level packages and modules (self time):
+
+    PYTHONPATH=src python -m benchmarks.import_time --runs 5
+
+The app envs are required, e.g. infra/dev.env. Targets:
+- app: import main and create the app, i.e. a worker cold start;
+- models: import the SQLAlchemy models, i.e. what alembic and CLI tasks load;
+- domain: import the domain models only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass
+
+import orjson
+
+TARGETS = {
+    'app': 'import main; main.create_app()',
+    'models': 'from rides import RideSQLAlchemyModel; from users import UserSQLAlchemyModel',
+    'domain': 'import rides.domain.models, users.domain.models',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """Import times of a run in microseconds."""
+
+    modules: dict[str, int]  # self time by module
+    total_us: int
+    wall_us: int
+
+
+def profile(code: str) -> Profile:
+    """Run the code in a fresh interpreter and parse -X importtime output."""
+    timed_code = f'import time; t = time.perf_counter(); {code}; print(int((time.perf_counter() - t) * 1e6))'
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', timed_code], capture_output=True, check=True, text=True
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line.removeprefix('import time:').split('|')
+        modules[name.strip()] = int(self_us)
+
+    return Profile(modules=modules, total_us=sum(modules.values()), wall_us=int(result.stdout.split()[-1]))
+
+
+def report(code: str, runs: int, top: int) -> dict[str, object]:
+    """Return the report of the fastest run."""
+    best = min((profile(code) for _ in range(runs)), key=lambda p: p.wall_us)
+
+    packages: Counter[str] = Counter()
+    for name, self_us in best.modules.items():
+        packages[name.split('.')[0]] += self_us
+
+    return {
+        'imports_ms': round(best.total_us / 1000, 1),
+        'modules': len(best.modules),
+        'wall_ms': round(best.wall_us / 1000, 1),
+        'top_packages_ms': {k: round(v / 1000, 1) for k, v in packages.most_common(top)},
+        'top_modules_ms': {k: round(v / 1000, 1) for k, v in Counter(best.modules).most_common(top)},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Profile the targets."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.import_time', description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='runs per target, the fastest is reported')
+    parser.add_argument('--top', type=int, default=10, help='number of the heaviest packages and modules')
+    parser.add_argument('targets', nargs='*', help=f'targets, all by default: {", ".join(TARGETS)}')
+    args = parser.parse_args(argv)
+    if unknown := set(args.targets) - TARGETS.keys():
+        parser.error(f'unknown targets: {", ".join(sorted(unknown))}')
+
+    results = {name: report(TARGETS[name], args.runs, args.top) for name in args.targets or TARGETS}
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
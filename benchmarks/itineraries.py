@@ -0,0 +1,121 @@
+"""Micro-benchmark of multi-leg itineraries search: build time of a day's
+connections and search latency.
+
+Rides of a day connect random pairs of cities within a country-sized area, most of
+them in the same currency, then itineraries between random cities are searched:
+
+    PYTHONPATH=src python -m benchmarks.itineraries --cities 1000 --rides 20000
+
+Results are printed as JSON, latencies are in milliseconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import UTC, date, datetime, timedelta
+from random import Random
+from uuid import UUID
+
+import orjson
+
+from rides.application.queries.search_itineraries import ItinerariesFilterDTO
+from rides.domain.models import City, CityId, Currency, RideId
+from rides.infrastructure.queries.ride_connections import Connection, ConnectionsDay, estimate_arrival_time
+from rides.infrastructure.repositories.city_index import CityIndex
+
+LATITUDES, LONGITUDES = (54.5, 57.5), (8.0, 15.0)
+MAIN_CURRENCY_SHARE = 0.9
+DAY = date(2030, 1, 1)
+
+
+def generate_connections(cities: list[City], count: int, city_index: CityIndex, rng: Random) -> list[Connection]:
+    """Return rides between random cities, the popular ones take more rides."""
+    weights = [city.popularity for city in cities]
+    start = datetime.combine(DAY, datetime.min.time(), tzinfo=UTC)
+
+    connections = []
+    for n in range(count):
+        departure, destination = rng.choices(cities, weights, k=2)
+        if departure.id == destination.id:
+            continue
+
+        departure_time = start + timedelta(minutes=rng.randrange(5 * 60, 22 * 60, 5))
+        arrival_time = estimate_arrival_time(city_index, departure.id, destination.id, departure_time)
+        assert arrival_time is not None  # noqa: S101
+        connections.append(
+            Connection(
+                arrival_time=arrival_time,
+                city_id_departure=departure.id,
+                city_id_destination=destination.id,
+                currency=Currency.DKK_ORE if rng.random() < MAIN_CURRENCY_SHARE else Currency.EUR_CENT,
+                departure_time=departure_time,
+                id=RideId(UUID(int=n)),
+                price=rng.randrange(5000, 50000, 500),
+                seats_available=rng.randint(1, 4),
+            )
+        )
+    return connections
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.itineraries', description=__doc__.split('\n')[0])
+    parser.add_argument('--cities', type=int, default=1000)
+    parser.add_argument('--rides', type=int, default=20_000, help='rides of the day')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = Random(args.seed)  # noqa: S311
+    cities = [
+        City(
+            id=CityId(UUID(int=n)),
+            name=f'City {n}',
+            latitude=rng.uniform(*LATITUDES),
+            longitude=rng.uniform(*LONGITUDES),
+            popularity=int(rng.paretovariate(1.2) * 1000),
+        )
+        for n in range(args.cities)
+    ]
+    city_index = CityIndex(cities)
+    connections = generate_connections(cities, args.rides, city_index, rng)
+
+    started = time.perf_counter()
+    day = ConnectionsDay(connections)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    latencies_ms, found = [], 0
+    for _ in range(args.queries):
+        departure, destination = rng.sample(cities, 2)
+        itineraries_filter = ItinerariesFilterDTO(
+            city_id_departure=departure.id,
+            city_id_destination=destination.id,
+            departure_date=DAY,
+            limit=5,
+            min_seats_available=1,
+        )
+        started = time.perf_counter()
+        found += bool(day.search(itineraries_filter))
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    percentiles = statistics.quantiles(latencies_ms, n=100)
+    results = {
+        'build_ms': round(build_ms, 1),
+        'connections': len(day),
+        'found_share': round(found / args.queries, 2),
+        'search_ms': {
+            'max': round(max(latencies_ms), 2),
+            'mean': round(statistics.fmean(latencies_ms), 2),
+            'p50': round(percentiles[49], 2),
+            'p99': round(percentiles[98], 2),
+        },
+    }
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""End-to-end load test of the REST API.
+
+Run from the repository root against the app in-process (the storage is configured
+by the usual envs, e.g. infra/dev.env with Postgres and Redis from infra/compose.yaml):
+
+    PYTHONPATH=src python -m benchmarks.load --target inprocess --duration 30
+
+or against a running server:
+
+    python -m benchmarks.load --target http://localhost:8000 --concurrency 64
+
+The report is printed as JSON. --save-baseline stores it in benchmarks/load/baselines,
+--baseline compares the run with a stored one and exits with 1 on regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from random import Random
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import orjson
+
+from . import report as report_builder
+from .client import BenchClient, Recorder
+from .distributions import KeySampler
+from .scenarios import DEFAULT_MIX, SCENARIOS, Scenario, ScenarioContext
+from .seed import DEFAULT_CITY_IDS, seed
+
+if TYPE_CHECKING:
+    from .counters import OpCounters
+
+BASELINES_DIR = Path(__file__).parent / 'baselines'
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load', description=__doc__.split('\n')[0])
+    parser.add_argument('--target', default='inprocess', help="'inprocess' or a base URL of a running server")
+    parser.add_argument('--concurrency', type=int, default=16, help='number of concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds before measuring')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for data and workload')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--rides', type=int, default=2000)
+    parser.add_argument('--passengers-per-ride', type=int, default=2)
+    parser.add_argument('--days-ahead', type=int, default=14, help='rides depart within this number of days')
+    parser.add_argument('--city-ids', default=','.join(DEFAULT_CITY_IDS), help='comma-separated existing city ids')
+    parser.add_argument(
+        '--distribution', default='zipf:1.1', help="key popularity: 'uniform' or 'zipf:S', e.g. zipf:1.1"
+    )
+    parser.add_argument(
+        '--mix',
+        default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()),
+        help=f'comma-separated scenario=weight, scenarios: {", ".join(SCENARIOS)}',
+    )
+    parser.add_argument('--output', type=Path, help='write the report to the file instead of stdout')
+    parser.add_argument('--save-baseline', metavar='NAME', help='store the report as a baseline')
+    parser.add_argument('--baseline', metavar='NAME', help='compare the report with a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed deviation from the baseline')
+    return parser.parse_args(argv)
+
+
+def parse_mix(mix: str) -> dict[Scenario, int]:
+    """Parse 'scenario=weight,...'."""
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name not in SCENARIOS:
+            msg = f'Unknown scenario: {name}'
+            raise SystemExit(msg)
+        if int(weight) > 0:
+            weights[SCENARIOS[name]] = int(weight)
+    return weights
+
+
+async def run_worker(ctx: ScenarioContext, mix: dict[Scenario, int], recorder: Recorder, deadline: float) -> None:
+    """Run randomly picked scenarios until the deadline."""
+    scenarios, weights = list(mix), list(mix.values())
+
+    while time.perf_counter() < deadline:
+        scenario = ctx.rng.choices(scenarios, weights)[0]
+        try:
+            await scenario(ctx)
+        except httpx.TransportError:
+            recorder.errors['transport'] += 1
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Seed data, run the load and build a report."""
+    counters: OpCounters | None = None
+    stack = AsyncExitStack()
+
+    if args.target == 'inprocess':
+        # The app is imported only when needed, since it requires envs of the app
+        from main import create_app
+
+        from .counters import install
+
+        app = create_app()
+        await stack.enter_async_context(app.router.lifespan_context(app))  # ASGITransport doesn't run lifespan
+        counters = install(getattr(app.state, 'db_engine', None))
+        transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=app)
+        base_url = 'http://inprocess'
+    else:
+        transport = httpx.AsyncHTTPTransport(retries=0)
+        base_url = args.target
+
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    http = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30, transport=transport)
+    async with stack, http:
+        client = BenchClient(http, recorder)
+        run_id = f'{int(time.time())}'
+        rng = Random(args.seed)  # noqa: S311
+
+        dataset = await seed(
+            client,
+            rng,
+            bookers=args.concurrency,
+            city_ids=args.city_ids.split(','),
+            days_ahead=args.days_ahead,
+            passengers_per_ride=args.passengers_per_ride,
+            rides=args.rides,
+            run_id=run_id,
+            users=args.users,
+        )
+
+        rides = KeySampler(dataset.rides, args.distribution)
+        editable_rides = KeySampler(dataset.editable_rides, args.distribution)
+        users = KeySampler(dataset.users, args.distribution)
+        contexts = [
+            ScenarioContext(
+                booker_id=dataset.bookers[n],
+                client=client,
+                dataset=dataset,
+                editable_rides=editable_rides,
+                rides=rides,
+                rng=Random(args.seed + n),  # noqa: S311
+                run_id=run_id,
+                users=users,
+            )
+            for n in range(args.concurrency)
+        ]
+
+        mix = parse_mix(args.mix)
+        started_at = time.perf_counter()
+        deadline = started_at + args.warmup + args.duration
+        workers = [asyncio.create_task(run_worker(ctx, mix, recorder, deadline)) for ctx in contexts]
+
+        await asyncio.sleep(args.warmup)
+        recorder.enabled = True
+        if counters:
+            counters.reset()
+        measured_from = time.perf_counter()
+
+        await asyncio.gather(*workers)
+        duration = time.perf_counter() - measured_from
+
+    config = {k: v for k, v in vars(args).items() if k not in {'baseline', 'output', 'save_baseline', 'tolerance'}}
+    return report_builder.build(recorder, counters, duration, config)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    report_json = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+    if args.output:
+        args.output.write_bytes(report_json)
+    else:
+        sys.stdout.buffer.write(report_json + b'\n')
+
+    if args.save_baseline:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        (BASELINES_DIR / f'{args.save_baseline}.json').write_bytes(report_json)
+
+    if args.baseline:
+        baseline = orjson.loads((BASELINES_DIR / f'{args.baseline}.json').read_bytes())
+        if regressions := report_builder.compare(report, baseline, args.tolerance):
+            sys.stderr.write('Regressions:\n' + '\n'.join(f'  - {r}' for r in regressions) + '\n')
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
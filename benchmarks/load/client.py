@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    from collections.abc import Container
+
+    import httpx
+
+
+class Recorder:
+    """Collects latencies and unexpected responses per route."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.errors: Counter[str] = Counter()
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+
+    def add(self, route: str, seconds: float, ok: bool) -> None:  # noqa: FBT001
+        """Record a response if the recording is enabled (i.e. warmup is over)."""
+        if not self.enabled:
+            return
+
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+
+class BenchClient:
+    """A thin wrapper over httpx client that times requests and adds project headers."""
+
+    def __init__(self, http: httpx.AsyncClient, recorder: Recorder) -> None:
+        self._http = http
+        self._recorder = recorder
+
+    async def request(
+        self,
+        route: str,
+        method: str,
+        url: str,
+        *,
+        expected: Container[int] = (200,),
+        idempotent: bool = False,
+        user_id: str | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> httpx.Response:
+        """Send a request and record it under the route name.
+
+        route - a route template used for grouping, e.g. 'GET /rides/{ride_id}';
+        expected - status codes that aren't counted as errors;
+        idempotent - whether to send a new Idempotency-Key header;
+        user_id - the user the request is authenticated as.
+        """
+        headers = {}
+        if user_id:
+            headers['Authorization'] = f'Bearer {user_id}'
+        if idempotent:
+            headers['Idempotency-Key'] = str(uuid4())
+
+        start = perf_counter()
+        response = await self._http.request(method, url, headers=headers, **kwargs)
+        self._recorder.add(route, perf_counter() - start, response.status_code in expected)
+        return response
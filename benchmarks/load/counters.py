@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import wraps
+from typing import TYPE_CHECKING, Any
+
+from redis.asyncio.client import Pipeline, Redis
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(slots=True)
+class OpCounters:
+    """Numbers of storage operations issued by the app.
+
+    Pipelined Redis commands are counted one by one, the pipeline is one roundtrip.
+    """
+
+    redis_commands: int = 0
+    redis_roundtrips: int = 0
+    sql_statements: int = 0
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        self.redis_commands = self.redis_roundtrips = self.sql_statements = 0
+
+
+def install(engine: AsyncEngine | None) -> OpCounters:
+    """Count SQL statements of the engine (if any) and commands of all Redis clients.
+
+    Only works for the in-process target, a remote server is a black box.
+    """
+    counters = OpCounters()
+
+    def count_statement(*args: Any) -> None:  # noqa: ANN401
+        counters.sql_statements += 1
+
+    if engine is not None:
+        event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+
+    execute_command = Redis.execute_command
+    execute_pipeline = Pipeline.execute
+
+    @wraps(execute_command)
+    async def counting_execute_command(self: Redis, *args: Any, **options: Any) -> Any:  # noqa: ANN401
+        counters.redis_commands += 1
+        counters.redis_roundtrips += 1
+        return await execute_command(self, *args, **options)  # type: ignore[no-untyped-call]
+
+    @wraps(execute_pipeline)
+    async def counting_execute_pipeline(self: Pipeline, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        counters.redis_commands += len(self.command_stack)
+        counters.redis_roundtrips += 1
+        return await execute_pipeline(self, *args, **kwargs)
+
+    Redis.execute_command = counting_execute_command  # type: ignore[method-assign]
+    Pipeline.execute = counting_execute_pipeline  # type: ignore[method-assign]
+
+    return counters
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from bisect import bisect
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from random import Random
+
+
+class KeySampler[T]:
+    """Picks keys with a configured popularity distribution.
+
+    Supported distributions:
+    - 'uniform' - every key is equally popular;
+    - 'zipf:S' - the key of rank k has weight 1 / k**S (S ~ 1 is typical for hot keys).
+    """
+
+    def __init__(self, keys: Sequence[T], distribution: str) -> None:
+        if not keys:
+            msg = 'At least one key is required'
+            raise ValueError(msg)
+
+        self._keys = keys
+
+        if distribution == 'uniform':
+            self._cum_weights = None
+        elif distribution.startswith('zipf:'):
+            s = float(distribution.removeprefix('zipf:'))
+            self._cum_weights = list(accumulate(1 / rank**s for rank in range(1, len(keys) + 1)))
+        else:
+            msg = f'Unknown distribution: {distribution}'
+            raise ValueError(msg)
+
+    def pick(self, rng: Random) -> T:
+        """Return a key."""
+        if self._cum_weights is None:
+            return self._keys[rng.randrange(len(self._keys))]
+
+        idx = bisect(self._cum_weights, rng.random() * self._cum_weights[-1])
+        return self._keys[min(idx, len(self._keys) - 1)]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from statistics import mean, quantiles
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import Recorder
+    from .counters import OpCounters
+
+
+def _latency_stats(latencies: list[float], duration: float) -> dict[str, float]:
+    if len(latencies) > 1:
+        percentiles = quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+
+    return {
+        'count': len(latencies),
+        'mean_ms': round(mean(latencies) * 1000, 3),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'throughput_rps': round(len(latencies) / duration, 2),
+    }
+
+
+def build(recorder: Recorder, counters: OpCounters | None, duration: float, config: dict[str, Any]) -> dict[str, Any]:
+    """Build a JSON-serializable report."""
+    routes = {}
+    for route, latencies in sorted(recorder.latencies.items()):
+        routes[route] = _latency_stats(latencies, duration) | {'errors': recorder.errors[route]}
+
+    all_latencies = [lat for latencies in recorder.latencies.values() for lat in latencies]
+    report: dict[str, Any] = {
+        'config': config,
+        'duration_secs': round(duration, 3),
+        'routes': routes,
+        'total': _latency_stats(all_latencies, duration) | {'errors': recorder.errors.total()} if all_latencies else {},
+    }
+
+    if counters is not None and all_latencies:
+        report['ops'] = {
+            'redis_commands': counters.redis_commands,
+            'redis_roundtrips': counters.redis_roundtrips,
+            'sql_statements': counters.sql_statements,
+            'per_request': {
+                'redis_commands': round(counters.redis_commands / len(all_latencies), 3),
+                'redis_roundtrips': round(counters.redis_roundtrips / len(all_latencies), 3),
+                'sql_statements': round(counters.sql_statements / len(all_latencies), 3),
+            },
+        }
+
+    return report
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return regressions of the report against the baseline.
+
+    Latency percentiles and throughput may deviate by tolerance (a share, e.g. 0.15).
+    Storage operations per request are nearly deterministic for a seed, so they catch
+    N+1 queries and lost caching even on a noisy machine.
+    """
+    regressions: list[str] = []
+
+    for route, base in baseline['routes'].items():
+        current = report['routes'].get(route)
+        if current is None:
+            regressions.append(f'{route}: missing in the report')
+            continue
+
+        regressions.extend(
+            f'{route}: {metric} {current[metric]} > {base[metric]} (baseline)'
+            for metric in ('p50_ms', 'p95_ms', 'p99_ms')
+            if current[metric] > base[metric] * (1 + tolerance)
+        )
+
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f'{route}: throughput_rps {current["throughput_rps"]} < {base["throughput_rps"]} (baseline)'
+            )
+
+        if current['errors'] > base['errors']:
+            regressions.append(f'{route}: errors {current["errors"]} > {base["errors"]} (baseline)')
+
+    base_ops = baseline.get('ops', {}).get('per_request', {})
+    current_ops = report.get('ops', {}).get('per_request', {})
+    for op, base_value in base_ops.items():
+        if (value := current_ops.get(op)) is not None and value > base_value * (1 + tolerance):
+            regressions.append(f'ops: {op} per request {value} > {base_value} (baseline)')
+
+    return regressions
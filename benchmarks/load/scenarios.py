@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .seed import new_ride_body, new_user_body
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from random import Random
+
+    from .client import BenchClient
+    from .distributions import KeySampler
+    from .seed import Dataset, SeededRide
+
+
+@dataclass(slots=True)
+class ScenarioContext:
+    """State shared by scenarios of one worker."""
+
+    booker_id: str
+    client: BenchClient
+    dataset: Dataset
+    editable_rides: KeySampler[SeededRide]
+    rides: KeySampler[SeededRide]
+    rng: Random
+    run_id: str
+    users: KeySampler[str]
+
+
+type Scenario = Callable[[ScenarioContext], Awaitable[None]]
+
+
+async def filter_rides(ctx: ScenarioContext) -> None:
+    """Search rides of a popular route and day."""
+    ride = ctx.rides.pick(ctx.rng)
+    params = {
+        'city_id_departure': ride.route[0],
+        'city_id_destination': ride.route[1],
+        'departure_date': ride.departure_date.isoformat(),
+        'min_seats_available': ctx.rng.randint(1, 2),
+    }
+    # 422 is expected if the picked ride departs today (the date must be in the future)
+    await ctx.client.request('GET /rides', 'GET', '/api/v1/rides', expected=(200, 422), params=params)
+
+
+async def get_complex_ride(ctx: ScenarioContext) -> None:
+    """Open a ride page."""
+    ride = ctx.rides.pick(ctx.rng)
+    await ctx.client.request('GET /rides/{ride_id}', 'GET', f'/api/v1/rides/{ride.id}')
+
+
+async def create_and_cancel_ride(ctx: ScenarioContext) -> None:
+    """Create a ride and cancel it, so the dataset doesn't drift."""
+    owner_id = ctx.users.pick(ctx.rng)
+    route = ctx.rng.choice(ctx.dataset.routes)
+    response = await ctx.client.request(
+        'POST /rides',
+        'POST',
+        '/api/v1/rides',
+        expected=(201,),
+        idempotent=True,
+        user_id=owner_id,
+        json=new_ride_body(ctx.rng, route, max_days_ahead=30),
+    )
+    if response.status_code != 201:  # noqa: PLR2004
+        return
+
+    ride_id = response.json()['id']
+    await ctx.client.request(
+        'POST /rides/{ride_id}/cancel', 'POST', f'/api/v1/rides/{ride_id}/cancel', expected=(204,), user_id=owner_id
+    )
+
+
+async def update_ride(ctx: ScenarioContext) -> None:
+    """Change the description of a ride without passengers."""
+    ride = ctx.editable_rides.pick(ctx.rng)
+    await ctx.client.request(
+        'PATCH /rides/{ride_id}',
+        'PATCH',
+        f'/api/v1/rides/{ride.id}',
+        idempotent=True,
+        user_id=ride.owner_id,
+        json={'description': f'Updated {ctx.rng.randrange(1_000_000)}'},
+    )
+
+
+async def book_and_leave_ride(ctx: ScenarioContext) -> None:
+    """Book a popular ride and leave it. Each worker has its own booker."""
+    ride = ctx.rides.pick(ctx.rng)
+    response = await ctx.client.request(
+        'POST /rides/{ride_id}/book',
+        'POST',
+        f'/api/v1/rides/{ride.id}/book',
+        expected=(204, 400),  # 400 - the ride is full
+        idempotent=True,
+        user_id=ctx.booker_id,
+        json={'seats_booked': 1},
+    )
+    if response.status_code != 204:  # noqa: PLR2004
+        return
+
+    await ctx.client.request(
+        'POST /rides/{ride_id}/leave',
+        'POST',
+        f'/api/v1/rides/{ride.id}/leave',
+        expected=(204,),
+        idempotent=True,
+        user_id=ctx.booker_id,
+    )
+
+
+async def create_user(ctx: ScenarioContext) -> None:
+    """Sign up."""
+    body = new_user_body(ctx.rng, f'{ctx.run_id}-{ctx.booker_id}', ctx.rng.randrange(10**12))
+    await ctx.client.request('POST /users', 'POST', '/api/v1/users', expected=(201,), json=body)
+
+
+async def get_own_profile(ctx: ScenarioContext) -> None:
+    """Open own profile."""
+    await ctx.client.request('GET /users/me', 'GET', '/api/v1/users/me', user_id=ctx.users.pick(ctx.rng))
+
+
+async def update_user(ctx: ScenarioContext) -> None:
+    """Change own last name."""
+    await ctx.client.request(
+        'PATCH /users/me',
+        'PATCH',
+        '/api/v1/users/me',
+        idempotent=True,
+        user_id=ctx.users.pick(ctx.rng),
+        json={'last_name': ctx.rng.choice(('Smith', 'Novak', 'Rossi', 'Nielsen'))},
+    )
+
+
+async def confirm_email(ctx: ScenarioContext) -> None:
+    """Try to confirm email with a wrong code."""
+    await ctx.client.request(
+        'POST /users/me/confirm-email',
+        'POST',
+        '/api/v1/users/me/confirm-email',
+        expected=(204, 400),
+        user_id=ctx.users.pick(ctx.rng),
+        json={'code': '000000'},
+    )
+
+
+async def send_confirmation_mail(ctx: ScenarioContext) -> None:
+    """Request a confirmation code."""
+    await ctx.client.request(
+        'POST /users/me/send-confirmation-mail',
+        'POST',
+        '/api/v1/users/me/send-confirmation-mail',
+        expected=(204, 400),  # 400 - the email is already confirmed
+        idempotent=True,
+        user_id=ctx.users.pick(ctx.rng),
+    )
+
+
+async def get_user(ctx: ScenarioContext) -> None:
+    """Open someone's profile."""
+    await ctx.client.request('GET /users/{user_id}', 'GET', f'/api/v1/users/{ctx.users.pick(ctx.rng)}')
+
+
+# A read-heavy mix; weights are relative
+DEFAULT_MIX: dict[str, int] = {
+    'book_and_leave_ride': 6,
+    'confirm_email': 1,
+    'create_and_cancel_ride': 3,
+    'create_user': 2,
+    'filter_rides': 30,
+    'get_complex_ride': 30,
+    'get_own_profile': 8,
+    'get_user': 14,
+    'send_confirmation_mail': 1,
+    'update_ride': 3,
+    'update_user': 2,
+}
+
+SCENARIOS: dict[str, Scenario] = {
+    'book_and_leave_ride': book_and_leave_ride,
+    'confirm_email': confirm_email,
+    'create_and_cancel_ride': create_and_cancel_ride,
+    'create_user': create_user,
+    'filter_rides': filter_rides,
+    'get_complex_ride': get_complex_ride,
+    'get_own_profile': get_own_profile,
+    'get_user': get_user,
+    'send_confirmation_mail': send_confirmation_mail,
+    'update_ride': update_ride,
+    'update_user': update_user,
+}
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from itertools import permutations
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Iterable
+    from random import Random
+
+    from .client import BenchClient
+
+# Cities of the in-memory backend, see rides.infrastructure.repositories.city_fake
+DEFAULT_CITY_IDS = (
+    '00000000-0000-0000-0000-000000000000',
+    '00000000-0000-0000-0000-000000000001',
+    '00000000-0000-0000-0000-000000000002',
+)
+CURRENCIES = ('EUR_cent', 'GBP_pence', 'PLN_grosz')
+FIRST_NAMES = ('Anna', 'Ben', 'Chloe', 'Dmitry', 'Emma', 'Filip', 'Greta', 'Hugo', 'Ines', 'Jonas')
+LAST_NAMES = ('Andersen', 'Becker', 'Costa', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Horvath', 'Ivanov', 'Jensen')
+SEED_CONCURRENCY = 32
+
+
+@dataclass(frozen=True, slots=True)
+class SeededRide:
+    """A ride created by seeding."""
+
+    departure_date: date
+    id: str
+    owner_id: str
+    route: tuple[str, str]
+
+
+@dataclass(slots=True)
+class Dataset:
+    """Seeded data the scenarios pick keys from.
+
+    Lists are ordered by popularity rank, samplers treat the first items as the hottest.
+    """
+
+    bookers: list[str] = field(default_factory=list)  # users reserved for book/leave, one per worker
+    editable_rides: list[SeededRide] = field(default_factory=list)  # never booked, owners may update them
+    rides: list[SeededRide] = field(default_factory=list)  # rides with passengers
+    routes: list[tuple[str, str]] = field(default_factory=list)
+    users: list[str] = field(default_factory=list)
+
+
+def new_user_body(rng: Random, run_id: str, n: int) -> dict[str, str]:
+    """Return a body for POST /users."""
+    birth_date = date(1960, 1, 1) + timedelta(days=rng.randrange(365 * 40))
+    return {
+        'birth_date': birth_date.isoformat(),
+        'email': f'bench-{run_id}-{n}@example.com',
+        'first_name': rng.choice(FIRST_NAMES),
+        'last_name': rng.choice(LAST_NAMES),
+    }
+
+
+def new_ride_body(rng: Random, route: tuple[str, str], max_days_ahead: int) -> dict[str, Any]:
+    """Return a body for POST /rides departing in 2 hours to max_days_ahead days."""
+    departure = datetime.now(UTC) + timedelta(hours=2, minutes=rng.randrange(max_days_ahead * 24 * 60))
+    return {
+        'departure_time': departure.isoformat(),
+        'description': rng.choice((None, 'No smoking', 'Pets allowed', 'Two small bags max')),
+        'price': {'currency': rng.choice(CURRENCIES), 'value': rng.randrange(500, 10_000, 50)},
+        'route': {'city_id_departure': route[0], 'city_id_destination': route[1]},
+        'seats_number': rng.randint(3, 7),
+    }
+
+
+async def _gather_limited(coros: Iterable[Awaitable[Any]]) -> list[Any]:
+    semaphore = asyncio.Semaphore(SEED_CONCURRENCY)
+
+    async def run(coro: Awaitable[Any]) -> Any:  # noqa: ANN401
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros))
+
+
+async def seed(
+    client: BenchClient,
+    rng: Random,
+    *,
+    bookers: int,
+    city_ids: Iterable[str],
+    days_ahead: int,
+    passengers_per_ride: int,
+    rides: int,
+    run_id: str,
+    users: int,
+) -> Dataset:
+    """Create users, rides and passengers through the public API.
+
+    Going through the API keeps seeding independent of the storage backend and
+    the target (in-process app or a running server).
+    """
+    dataset = Dataset()
+
+    user_bodies = [new_user_body(rng, run_id, n) for n in range(users + bookers)]
+    responses = await _gather_limited(
+        client.request('POST /users', 'POST', '/api/v1/users', expected=(201,), json=body) for body in user_bodies
+    )
+    user_ids = [r.raise_for_status().json()['id'] for r in responses]
+    dataset.users, dataset.bookers = user_ids[:users], user_ids[users:]
+
+    dataset.routes = list(permutations(city_ids, 2))
+    rng.shuffle(dataset.routes)
+
+    ride_requests = []
+    for _ in range(rides):
+        route = dataset.routes[min(int(rng.expovariate(0.5)), len(dataset.routes) - 1)]  # popular routes first
+        owner_id = rng.choice(dataset.users)
+        ride_requests.append((owner_id, route, new_ride_body(rng, route, days_ahead)))
+
+    responses = await _gather_limited(
+        client.request(
+            'POST /rides', 'POST', '/api/v1/rides', expected=(201,), idempotent=True, user_id=owner_id, json=body
+        )
+        for owner_id, _, body in ride_requests
+    )
+    seeded_rides = []
+    for (owner_id, route, _), response in zip(ride_requests, responses, strict=True):
+        ride = response.raise_for_status().json()
+        departure_date = datetime.fromisoformat(ride['departure_time']).astimezone(UTC).date()
+        seeded_rides.append(SeededRide(departure_date=departure_date, id=ride['id'], owner_id=owner_id, route=route))
+
+    editable_count = max(1, rides // 10)
+    dataset.editable_rides, dataset.rides = seeded_rides[:editable_count], seeded_rides[editable_count:]
+
+    bookings: list[tuple[str, str]] = []
+    for ride in dataset.rides:
+        candidates = [u for u in rng.sample(dataset.users, min(len(dataset.users), 10)) if u != ride.owner_id]
+        bookings.extend((ride.id, user_id) for user_id in candidates[: rng.randint(0, passengers_per_ride)])
+
+    await _gather_limited(
+        client.request(
+            'POST /rides/{ride_id}/book',
+            'POST',
+            f'/api/v1/rides/{ride_id}/book',
+            expected=(204,),
+            idempotent=True,
+            user_id=user_id,
+            json={'seats_booked': 1},
+        )
+        for ride_id, user_id in bookings
+    )
+
+    return dataset
@@ -0,0 +1,96 @@
+"""Build time, memory and matching latency of the index of ride alerts.
+
+Alerts of random users are spread over routes and days, a third of them without a
+max price, as RedisRideAlertsWorker loads them:
+
+    PYTHONPATH=src python -m benchmarks.ride_alerts --alerts 1000000 --routes 10000
+
+Rides of random routes and days are matched then, the latency per ride is compared
+to the number of matched alerts. Memory is measured by tracemalloc. Results are
+printed as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as dt_time
+from random import Random
+from uuid import UUID
+
+import orjson
+
+from rides.domain.models import CityId, Currency, PriceVO, RideAlert, RouteVO, UserId
+from rides.infrastructure.ride_alert_index import RideAlertIndex
+
+MB = 1024 * 1024
+CURRENCIES = (Currency.EUR_CENT, Currency.GBP_PENCE)
+
+
+def run(args: argparse.Namespace) -> dict[str, float]:
+    """Build the index of the alerts, then match the rides."""
+    rng = Random(args.seed)  # noqa: S311
+    cities = [CityId(UUID(int=rng.getrandbits(128))) for _ in range(args.routes * 2)]
+    routes = [RouteVO(city_id_departure=cities[i], city_id_destination=cities[i + 1]) for i in range(0, len(cities), 2)]
+    first_day = datetime.now(UTC).date()
+
+    def random_price() -> PriceVO:
+        return PriceVO(currency=rng.choice(CURRENCIES), value=rng.randrange(100, 10_000))
+
+    def random_day() -> date:
+        return first_day + timedelta(days=rng.randrange(args.days))
+
+    alerts = [
+        RideAlert.create(
+            random_day(),
+            None if rng.random() < 1 / 3 else random_price(),
+            rng.choice(routes),
+            UserId(UUID(int=rng.getrandbits(128))),
+        )
+        for _ in range(args.alerts)
+    ]
+
+    tracemalloc.start()
+    index = RideAlertIndex()
+    started = time.perf_counter()
+    for alert in alerts:
+        index.add(alert)
+    build_secs = time.perf_counter() - started
+    index_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    matched = 0
+    started = time.perf_counter()
+    for _ in range(args.rides):
+        departure_time = datetime.combine(random_day(), dt_time(12, 0), tzinfo=UTC)
+        matched += sum(1 for _ in index.match(rng.choice(routes), departure_time, random_price()))
+    match_secs = time.perf_counter() - started
+
+    return {
+        'build_secs': round(build_secs, 2),
+        'index_mb': round(index_mem / MB, 1),
+        'match_us': round(match_secs / args.rides * 1_000_000, 2),
+        'matched_per_ride': round(matched / args.rides, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ride_alerts', description=__doc__.split('\n')[0])
+    parser.add_argument('--alerts', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=30, help='alerts and rides are for the days ahead')
+    parser.add_argument('--rides', type=int, default=100_000)
+    parser.add_argument('--routes', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
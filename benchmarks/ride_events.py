@@ -0,0 +1,111 @@
+"""Memory of idle server-sent events connections and fan-out latency of the hub.
+
+Every connection is a task consuming stream_ride_events() of a few random rides,
+as the route does, without sockets and Redis:
+
+    PYTHONPATH=src python -m benchmarks.ride_events --connections 50000 --rides 5000
+
+Memory is measured by tracemalloc, so the sockets and buffers of the server aren't
+counted. An event of a ride with many subscribers is dispatched and the time till
+all of them got it is measured. Results are printed as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from random import Random
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import orjson
+
+from rides.constants import RIDE_EVENTS_CHANNEL
+from rides.domain.models import RideId
+from rides.infrastructure.ride_events_hub import RideEventsHub
+from rides.presentation.rest.ride_events import stream_ride_events
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+KB = 1024
+
+
+@dataclass
+class Received:
+    """Counts frames with events, done is set once the expected number came."""
+
+    count: int = 0
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    expected: int = 0
+
+
+async def consume(hub: RideEventsHub, ride_ids: Sequence[RideId], received: Received) -> None:
+    """Read the stream like a connection, count the frames with events."""
+    async for frame in stream_ride_events(hub, ride_ids):
+        if frame.startswith(b'event:'):
+            received.count += 1
+            if received.count == received.expected:
+                received.done.set()
+
+
+async def run(args: argparse.Namespace) -> dict[str, float]:
+    """Open the connections, then dispatch an event of the most subscribed ride."""
+    rng = Random(args.seed)  # noqa: S311
+    rides = [RideId(UUID(int=rng.getrandbits(128))) for _ in range(args.rides)]
+    hub = RideEventsHub()
+    received = Received()
+
+    tracemalloc.start()
+    started_mem = tracemalloc.get_traced_memory()[0]
+    tasks = [
+        asyncio.create_task(consume(hub, rng.sample(rides, args.rides_per_connection), received))
+        for _ in range(args.connections)
+    ]
+    await asyncio.sleep(0.1)  # the connections are subscribed and wait for events
+    connections_mem = tracemalloc.get_traced_memory()[0] - started_mem
+    tracemalloc.stop()
+
+    ride_id = max(rides, key=lambda id_: len(hub._subscriptions.get(str(id_), ())))  # noqa: SLF001
+    received.expected = len(hub._subscriptions[str(ride_id)])  # noqa: SLF001
+    message = orjson.dumps({'id': str(ride_id), 'seats_available': 1, 'type': 'booked'})
+
+    started = time.perf_counter()
+    hub.dispatch(RIDE_EVENTS_CHANNEL, message)
+    dispatch_secs = time.perf_counter() - started
+    await received.done.wait()
+    delivered_secs = time.perf_counter() - started
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        'connection_kb': round(connections_mem / args.connections / KB, 2),
+        'connections_mb': round(connections_mem / KB / KB, 1),
+        'dispatch_ms': round(dispatch_secs * 1000, 2),
+        'delivered_ms': round(delivered_secs * 1000, 2),
+        'subscribers': received.expected,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ride_events', description=__doc__.split('\n')[0])
+    parser.add_argument('--connections', type=int, default=50_000)
+    parser.add_argument('--rides', type=int, default=5_000, help='rides the connections are subscribed to')
+    parser.add_argument('--rides-per-connection', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Contract check: the OpenAPI schema of the app must match the snapshot.
+
+Routes return pre-encoded responses, so the schema is kept by response_model
+only. Check it after changing routes or schemas:
+
+    PYTHONPATH=src python -m contracts.openapi [--update]
+
+The app envs are required, e.g. infra/dev.env.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import sys
+from pathlib import Path
+
+import orjson
+
+from main import create_app
+
+SNAPSHOT_PATH = Path(__file__).with_name('openapi.json')
+
+
+def dump_schema() -> bytes:
+    """Return the schema of a new app in a stable form."""
+    return orjson.dumps(create_app().openapi(), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b'\n'
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Compare the schema with the snapshot or update the snapshot."""
+    parser = argparse.ArgumentParser(prog='python -m contracts.openapi', description=__doc__.split('\n')[0])
+    parser.add_argument('--update', action='store_true', help='overwrite the snapshot with the current schema')
+    args = parser.parse_args(argv)
+
+    schema = dump_schema()
+    if args.update:
+        SNAPSHOT_PATH.write_bytes(schema)
+        return 0
+
+    snapshot = SNAPSHOT_PATH.read_bytes()
+    if schema == snapshot:
+        return 0
+
+    diff = difflib.unified_diff(
+        snapshot.decode().splitlines(), schema.decode().splitlines(), 'snapshot', 'current', lineterm=''
+    )
+    print('\n'.join(diff))  # noqa: T201
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
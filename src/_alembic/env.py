@@ -6,9 +6,9 @@ from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
-from shared.infrastructure.config import settings
+from shared.infrastructure.config import get_settings
 
-DATABASE_URL = settings.DATABASE_URL
+DATABASE_URL = get_settings().DATABASE_URL
 
 config = context.config
 
@@ -21,8 +21,22 @@ target_metadata = Base.metadata
 
 
 # Add your models here
-from rides import RideSQLAlchemyModel
+from rides import CitySQLAlchemyModel, RideAlertSQLAlchemyModel, RideSQLAlchemyModel
 from users import UserSQLAlchemyModel
+from shared.infrastructure.outbox_sqlalchemy import OutboxSQLAlchemyModel
+from rides.infrastructure.repositories.ride_partitions import PARTITION_NAME
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Skip partitions, they are created by SQLAlchemyRidePartitionsMaintainer."""
+    return not (type_ == 'table' and PARTITION_NAME.match(name))
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Skip foreign keys referencing partitions, Postgres clones a foreign key of a
+    partitioned table for every partition it references, e.g. passengers_ride_id_fkey_1.
+    """
+    return not (type_ == 'foreign_key_constraint' and PARTITION_NAME.match(object.referred_table.name))
 
 
 def run_migrations_offline() -> None:
@@ -30,6 +44,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={'paramstyle': 'named'},
     )
@@ -39,7 +55,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,163 @@
+"""rides partitions
+
+Revision ID: 3f7a2c1d8b90
+Revises: 9d0b7c4e1f26
+Create Date: 2026-10-19 16:02:11.284519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7a2c1d8b90'
+down_revision: Union[str, None] = '9d0b7c4e1f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RIDES_COLUMNS = (
+    'city_id_departure, city_id_destination, created_at, departure_time, description, id, is_cancelled, '
+    'owner_id, price_currency, price_value, seats_available, seats_number'
+)
+
+# Monthly partitions from the first ride till 2 months after MAX_DEPARTURE_DAYS (365) ahead,
+# then SQLAlchemyRidePartitionsMaintainer keeps them
+CREATE_PARTITIONS_SQL = """
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', least(min(departure_time), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', greatest(max(departure_time), now() + interval '365 days') AT TIME ZONE 'UTC')
+                + interval '2 months',
+            interval '1 month'
+        )
+        FROM rides_unpartitioned
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF rides FOR VALUES FROM (%L) TO (%L)',
+            'rides_p' || to_char(month, 'YYYY_MM'), month AT TIME ZONE 'UTC', (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF passengers FOR VALUES FROM (%L) TO (%L)',
+            'passengers_p' || to_char(month, 'YYYY_MM'), month AT TIME ZONE 'UTC', (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END $$
+"""
+
+
+def create_indexes() -> None:
+    op.create_index('ix_ride_active_route_departure', 'rides', ['city_id_departure', 'city_id_destination', 'departure_time'], unique=False, postgresql_include=['id', 'price_currency', 'price_value', 'seats_available', 'seats_number'], postgresql_where=sa.text('NOT is_cancelled'))
+    op.create_index(op.f('ix_rides_id'), 'rides', ['id'], unique=False)
+    op.create_index(op.f('ix_passengers_id'), 'passengers', ['id'], unique=False)
+    op.create_index(op.f('ix_passengers_ride_id'), 'passengers', ['ride_id'], unique=False)
+
+
+def drop_indexes() -> None:
+    op.drop_index(op.f('ix_passengers_ride_id'), table_name='passengers')
+    op.drop_index(op.f('ix_passengers_id'), table_name='passengers')
+    op.drop_index(op.f('ix_rides_id'), table_name='rides')
+    op.drop_index('ix_ride_active_route_departure', table_name='rides', postgresql_where=sa.text('NOT is_cancelled'))
+
+
+def rename_tables(suffix: str) -> None:
+    """Rename the tables and their primary keys, so new ones can be created."""
+    for table in ('passengers', 'rides'):
+        op.rename_table(table, f'{table}_{suffix}')
+        op.execute(f'ALTER INDEX {table}_pkey RENAME TO {table}_{suffix}_pkey')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE SCHEMA IF NOT EXISTS archive')  # detached partitions are moved there
+
+    drop_indexes()
+    rename_tables('unpartitioned')
+
+    op.create_table('rides',
+    sa.Column('city_id_departure', sa.Uuid(), nullable=False),
+    sa.Column('city_id_destination', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('departure_time', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('is_cancelled', sa.Boolean(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('price_currency', postgresql.ENUM(name='currency', create_type=False), nullable=False),
+    sa.Column('price_value', sa.Integer(), nullable=False),
+    sa.Column('seats_available', sa.SmallInteger(), nullable=False),
+    sa.Column('seats_number', sa.SmallInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'departure_time'),
+    postgresql_partition_by='RANGE (departure_time)'
+    )
+    op.create_table('passengers',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('ride_departure_time', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('ride_id', sa.Uuid(), nullable=False),
+    sa.Column('seats_booked', sa.SmallInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['ride_id', 'ride_departure_time'], ['rides.id', 'rides.departure_time'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'ride_departure_time', 'ride_id'),
+    postgresql_partition_by='RANGE (ride_departure_time)'
+    )
+    op.execute(CREATE_PARTITIONS_SQL)
+
+    op.execute(f'INSERT INTO rides ({RIDES_COLUMNS}) SELECT {RIDES_COLUMNS} FROM rides_unpartitioned')
+    op.execute(
+        """
+        INSERT INTO passengers (id, ride_departure_time, ride_id, seats_booked)
+        SELECT p.id, r.departure_time, p.ride_id, p.seats_booked
+        FROM passengers_unpartitioned p JOIN rides_unpartitioned r ON r.id = p.ride_id
+        """
+    )
+    op.drop_table('passengers_unpartitioned')
+    op.drop_table('rides_unpartitioned')
+
+    create_indexes()
+    op.execute('ANALYZE rides, passengers')
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Rides of archived partitions aren't restored, the archive schema is kept.
+    """
+    drop_indexes()
+    rename_tables('partitioned')
+
+    op.create_table('rides',
+    sa.Column('city_id_departure', sa.Uuid(), nullable=False),
+    sa.Column('city_id_destination', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('departure_time', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('is_cancelled', sa.Boolean(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('price_currency', postgresql.ENUM(name='currency', create_type=False), nullable=False),
+    sa.Column('price_value', sa.Integer(), nullable=False),
+    sa.Column('seats_available', sa.SmallInteger(), nullable=False),
+    sa.Column('seats_number', sa.SmallInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('passengers',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('ride_id', sa.Uuid(), nullable=False),
+    sa.Column('seats_booked', sa.SmallInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['ride_id'], ['rides.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'ride_id')
+    )
+
+    op.execute(f'INSERT INTO rides ({RIDES_COLUMNS}) SELECT {RIDES_COLUMNS} FROM rides_partitioned')
+    op.execute(
+        'INSERT INTO passengers (id, ride_id, seats_booked) SELECT id, ride_id, seats_booked FROM passengers_partitioned'
+    )
+    op.drop_table('passengers_partitioned')  # with the partitions
+    op.drop_table('rides_partitioned')
+
+    create_indexes()
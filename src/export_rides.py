@@ -0,0 +1,49 @@
+"""Export rides or passengers as CSV for analytics.
+
+Rows are read as by GET /api/v1/rides/export, see SQLAlchemyExportRowsQuery. With
+--state the export is incremental: it starts at the time written to the file by the
+previous export, and the file is updated once the output is written.
+
+Run: python export_rides.py --table rides --state rides.state rides.csv
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from rides.application import use_cases as uc
+from rides.infrastructure.queries.sqlalchemy_export_rows import SQLAlchemyExportRowsQuery
+from rides.presentation.ride_export import encode_csv
+from shared.infrastructure.config import get_settings
+from shared.infrastructure.sqlalchemy import create_engine, create_sessionmaker
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Export the rows, then store the time the next export starts at."""
+    since = None
+    if args.state and args.state.exists():
+        since = datetime.fromisoformat(args.state.read_text().strip())
+
+    db_engine = create_engine(get_settings())
+    try:
+        export = uc.ExportRowsUsecase(SQLAlchemyExportRowsQuery(create_sessionmaker(db_engine))).execute(
+            args.table, since
+        )
+        with sys.stdout.buffer if str(args.path) == '-' else args.path.open('wb') as file:
+            async for piece in encode_csv(export.columns, export.chunks):
+                await asyncio.to_thread(file.write, piece)
+    finally:
+        await db_engine.dispose()
+
+    if args.state:
+        args.state.write_text(export.until.isoformat())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python export_rides.py', description=__doc__.split('\n')[0])
+    parser.add_argument('--state', type=Path, help='the file of the time the next export starts at')
+    parser.add_argument('--table', choices=('passengers', 'rides'), required=True)
+    parser.add_argument('path', type=Path, help='- for stdout')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,71 @@
+"""Import rides of a fleet operator from CSV or NDJSON.
+
+Rows are parsed and created as by POST /api/v1/rides/import, see
+rides.presentation.ride_import. The report is printed as JSON.
+
+Run: python import_rides.py --owner-id <user id> rides.csv
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+from uuid import UUID
+
+import orjson
+
+from rides.application import use_cases as uc
+from rides.domain.models import OwnerId
+from rides.infrastructure.repositories.city_sqlalchemy import SQLAlchemyCityIndexLoader
+from rides.infrastructure.uow import RideSQLAlchemyCityUnitOfWork
+from rides.presentation.ride_import import ImportFormat, read_import_batches
+from shared.errors import ProjectError
+from shared.infrastructure.config import get_settings
+from shared.infrastructure.outbox_sqlalchemy import SQLAlchemyOutboxRelay
+from shared.infrastructure.redis import create_redis
+from shared.infrastructure.sqlalchemy import create_engine, create_sessionmaker
+from users import UserId
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    """Yield chunks of the file, it's read in a thread."""
+    while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+        yield chunk
+
+
+async def main(args: argparse.Namespace) -> uc.ImportRidesReturnDTO:
+    """Import the rides. Outbox messages are relayed by the app instances."""
+    settings = get_settings()
+    db_engine = create_engine(settings)
+    redis = create_redis(settings)
+    session_factory = create_sessionmaker(db_engine)
+    try:
+        city_index_loader = SQLAlchemyCityIndexLoader(session_factory)
+        await city_index_loader.reload()
+        uow = RideSQLAlchemyCityUnitOfWork(
+            session_factory, city_index_loader.index, SQLAlchemyOutboxRelay(session_factory, redis)
+        )
+
+        import_format: ImportFormat = args.format or ('ndjson' if args.path.suffix in {'.jsonl', '.ndjson'} else 'csv')
+        with sys.stdin.buffer if str(args.path) == '-' else args.path.open('rb') as file:
+            batches = read_import_batches(read_chunks(file), import_format)
+            return await uc.ImportRidesUsecase(uow).execute(OwnerId(UserId(args.owner_id)), batches)
+    finally:
+        await redis.aclose()
+        await db_engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python import_rides.py', description=__doc__.split('\n')[0])
+    parser.add_argument('--format', choices=('csv', 'ndjson'), help='by default, by the extension of the file')
+    parser.add_argument('--owner-id', type=UUID, required=True)
+    parser.add_argument('path', type=Path, help='- for stdin')
+    try:
+        report = asyncio.run(main(parser.parse_args()))
+    except ProjectError as err:
+        sys.exit(err.detail)
+    sys.stdout.buffer.write(orjson.dumps(report, option=orjson.OPT_INDENT_2) + b'\n')
@@ -1,43 +1,192 @@
+import asyncio
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import ORJSONResponse
 
+from rides.application import use_cases as rides_use_cases
+from rides.infrastructure.queries.cached_in_memory_complex_ride import CachedInMemoryComplexRideQuery
+from rides.infrastructure.queries.cached_sqlaclhemy_complex_ride import CachedSQLAlchemyComplexRideQuery
+from rides.infrastructure.queries.city_index_suggest_cities import CityIndexSuggestCitiesQuery
+from rides.infrastructure.queries.in_memory_filter_rides import InMemoryFilterRidesQuery
+from rides.infrastructure.queries.in_memory_ride_calendar import InMemoryRideCalendarQuery
+from rides.infrastructure.queries.in_memory_search_itineraries import InMemorySearchItinerariesQuery
+from rides.infrastructure.queries.ride_connections import ConnectionsDays
+from rides.infrastructure.queries.sqlalchemy_filter_rides import SQLAlchemyFilterRidesQuery
+from rides.infrastructure.queries.sqlalchemy_ride_calendar import SQLAlchemyRideCalendarQuery
+from rides.infrastructure.queries.sqlalchemy_search_itineraries import SQLAlchemySearchItinerariesQuery
+from rides.infrastructure.repositories.city_fake import FAKE_CITIES
+from rides.infrastructure.repositories.city_index import CityIndex
+from rides.infrastructure.repositories.city_sqlalchemy import SQLAlchemyCityIndexLoader
+from rides.infrastructure.repositories.ride_in_memory import InMemoryRideRepository, RideInMemoryStorage
+from rides.infrastructure.repositories.ride_partitions import SQLAlchemyRidePartitionsMaintainer
+from rides.infrastructure.repositories.ride_sqlalchemy import SQLAlchemyRideRepository
+from rides.infrastructure.ride_events_hub import RideEventsHub
+from rides.presentation.rest.city_routes import router as cities_router
 from rides.presentation.rest.routes import router as rides_router
-from shared.infrastructure.config import settings
-from shared.infrastructure.redis import connections as redis_connections
+from rides.presentation.rest.user_routes import router as user_rides_router
+from shared.infrastructure import tracing
+from shared.infrastructure.config import get_settings
+from shared.infrastructure.in_memory_cache import InMemoryCache
+from shared.infrastructure.logging import logger
+from shared.infrastructure.outbox_sqlalchemy import SQLAlchemyOutboxRelay
+from shared.infrastructure.redis import create_redis
+from shared.infrastructure.redis_cache import RedisCache
+from shared.infrastructure.sqlalchemy import create_engine, create_sessionmaker
+from shared.presentation.compression import CompressionMiddleware, PrecompressedBodies
+from shared.presentation.tracing_middleware import TracingMiddleware
+from users.application import use_cases as users_use_cases
+from users.infrastructure.in_memory_mail_queue import InMemoryMailQueue
+from users.infrastructure.mail_service import FakeMailClient
+from users.infrastructure.repositories.in_memory import InMemoryUserRepository, UserInMemoryStorage
+from users.infrastructure.repositories.redis_cached_sqlalchemy import RedisCachedSQLAlchemyUserRepository
+from users.infrastructure.repositories.sqlalchemy import SQLAlchemyUserRepository
 from users.presentation.rest.routes import router as users_router
 
 
+def instrument_layers() -> None:
+    """Trace use cases, queries, repositories and cache of sampled requests.
+
+    SQL is traced once the engine is created, see lifespan().
+    """
+    for module in (rides_use_cases, users_use_cases):
+        for name, usecase in vars(module).items():
+            if name.endswith('Usecase'):
+                tracing.instrument(usecase, 'usecase')
+
+    for query in (
+        CachedInMemoryComplexRideQuery,
+        CachedSQLAlchemyComplexRideQuery,
+        CityIndexSuggestCitiesQuery,
+        InMemoryFilterRidesQuery,
+        InMemoryRideCalendarQuery,
+        InMemorySearchItinerariesQuery,
+        SQLAlchemyFilterRidesQuery,
+        SQLAlchemyRideCalendarQuery,
+        SQLAlchemySearchItinerariesQuery,
+    ):
+        tracing.instrument(query, 'query')
+
+    for repo in (
+        CityIndex,
+        InMemoryRideRepository,
+        InMemoryUserRepository,
+        RedisCachedSQLAlchemyUserRepository,
+        SQLAlchemyRideRepository,
+        SQLAlchemyUserRepository,
+    ):
+        tracing.instrument(repo, 'repository')
+
+    for cache in (InMemoryCache, RedisCache):
+        tracing.instrument(cache, 'cache')
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
-    """Actions on shutdown:
-    - Close Redis connections;
+    """Actions on startup:
+    - Create the infrastructure of the storage backend, dependencies take it from
+      app.state;
+    - Load the cities index and start its periodic reload;
+    - Start the periodic maintenance of the rides partitions;
+    - Start the outbox relay and the subscription to ride events, or the mail sending
+      of the memory backend (mails of Redis are sent by worker.py);
+
+    Actions on shutdown:
+    - Stop the background tasks;
+    - Close Redis connections and DB pool;
+    - Flush buffered traces;
     """
+    settings = get_settings()
+    state = app.state
+    state.ride_connections_days = ConnectionsDays(settings.RIDE_CONNECTIONS_TTL_SECS)
+    state.ride_events_hub = RideEventsHub()
+
+    if settings.STORAGE_BACKEND == 'memory':
+        state.city_index = CityIndex(FAKE_CITIES)
+        state.in_memory_cache = InMemoryCache()
+        state.ride_storage = RideInMemoryStorage()
+        state.user_storage = UserInMemoryStorage()
+        state.mail_queue = InMemoryMailQueue(FakeMailClient(logger))
+        background_tasks = [asyncio.create_task(state.mail_queue.run())]
+    else:
+        state.db_engine = create_engine(settings)
+        state.db_sessionmaker = create_sessionmaker(state.db_engine)
+        state.redis = create_redis(settings)
+
+        if state.tracing_enabled:
+            tracing.instrument_engine(state.db_engine)
+
+        state.city_index_loader = SQLAlchemyCityIndexLoader(state.db_sessionmaker)
+        await state.city_index_loader.reload()
+        cities_reload = asyncio.create_task(
+            state.city_index_loader.reload_periodically(settings.CITIES_RELOAD_INTERVAL_SECS)
+        )
+        partitions_maintainer = SQLAlchemyRidePartitionsMaintainer(state.db_engine, settings.RIDES_ARCHIVE_AFTER_DAYS)
+        partitions_maintenance = asyncio.create_task(
+            partitions_maintainer.maintain_periodically(settings.RIDES_PARTITIONS_INTERVAL_SECS)
+        )
+        state.outbox_relay = SQLAlchemyOutboxRelay(state.db_sessionmaker, state.redis)
+        outbox_relay = asyncio.create_task(state.outbox_relay.relay_periodically(settings.OUTBOX_RELAY_INTERVAL_SECS))
+        ride_events = asyncio.create_task(state.ride_events_hub.listen(state.redis))
+        background_tasks = [cities_reload, partitions_maintenance, outbox_relay, ride_events]
+
     yield
 
-    for redis_con in redis_connections:
-        await redis_con.aclose()
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    if settings.STORAGE_BACKEND != 'memory':
+        await state.redis.aclose()
+        await state.db_engine.dispose()
+
+    if state.span_exporter:
+        state.span_exporter.flush()
+
+
+def create_app() -> FastAPI:
+    """Create the app. Clients and pools are created on startup, see lifespan().
+
+    Run: granian --factory main:create_app
+    """
+    settings = get_settings()
+
+    app = FastAPI(
+        default_response_class=ORJSONResponse,
+        docs_url=None if not settings.DEBUG else '/docs',
+        lifespan=lifespan,
+        redoc_url=None,
+    )
+    app.state.span_exporter = (
+        tracing.FileSpanExporter(settings.TRACING_EXPORT_PATH) if settings.TRACING_EXPORT_PATH else None
+    )
+    app.state.precompressed_bodies = PrecompressedBodies()
+    app.state.tracing_enabled = bool(settings.DEBUG or settings.TRACING_SAMPLE_RATE)
 
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_headers=['*'],
+        allow_methods=['*'],
+        allow_origin_regex=settings.CORS_ORIGINS_REGEX,
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
 
-app = FastAPI(
-    default_response_class=ORJSONResponse,
-    docs_url=None if not settings.DEBUG else '/docs',
-    lifespan=lifespan,
-    redoc_url=None,
-)
+    if app.state.tracing_enabled:
+        instrument_layers()
+        app.add_middleware(
+            TracingMiddleware,
+            exporter=app.state.span_exporter,
+            sample_rate=settings.TRACING_SAMPLE_RATE,
+            breakdown_header=settings.DEBUG,
+        )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_headers=['*'],
-    allow_methods=['*'],
-    allow_origin_regex=settings.CORS_ORIGINS_REGEX,
-)
-app.add_middleware(GZipMiddleware)
+    app.include_router(users_router, prefix='/api/v1/users')
+    app.include_router(user_rides_router, prefix='/api/v1/users/me')
+    app.include_router(rides_router, prefix='/api/v1/rides')
+    app.include_router(cities_router, prefix='/api/v1/cities')
 
-app.include_router(users_router, prefix='/api/v1/users')
-app.include_router(rides_router, prefix='/api/v1/rides')
+    return app
@@ -1,3 +1,24 @@
-from .infrastructure.repositories.ride_sqlalchemy import RideSQLAlchemyModel
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ['RideSQLAlchemyModel']
+if TYPE_CHECKING:
+    from .infrastructure.repositories.city_sqlalchemy import CitySQLAlchemyModel
+    from .infrastructure.repositories.ride_alert_sqlalchemy import RideAlertSQLAlchemyModel
+    from .infrastructure.repositories.ride_sqlalchemy import RideSQLAlchemyModel
+
+__all__ = ['CitySQLAlchemyModel', 'RideAlertSQLAlchemyModel', 'RideSQLAlchemyModel']
+
+# Imported on first access, so the domain users don't load SQLAlchemy
+_LAZY_EXPORTS = {
+    'CitySQLAlchemyModel': '.infrastructure.repositories.city_sqlalchemy',
+    'RideAlertSQLAlchemyModel': '.infrastructure.repositories.ride_alert_sqlalchemy',
+    'RideSQLAlchemyModel': '.infrastructure.repositories.ride_sqlalchemy',
+}
+
+
+def __getattr__(name: str) -> object:
+    if module := _LAZY_EXPORTS.get(name):
+        return getattr(import_module(module, __name__), name)
+
+    msg = f'module {__name__!r} has no attribute {name!r}'
+    raise AttributeError(msg)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date, datetime
+
+    from users import UserId
+
+    from ..domain.models import CityId, OwnerId, Passenger, PassengerId, PriceVO, Ride, RideAlert, RideAlertId, RideId
+
+type RideEventType = Literal['booked', 'cancelled', 'created', 'left', 'updated']
+type RideNotificationType = Literal['cancelled', 'promoted', 'updated']
+type RideAlertChangeType = Literal['created', 'deleted']
+
+
+@dataclass(frozen=True, slots=True)
+class RideEventDTO:
+    """A committed change of a ride, published to RIDE_EVENTS_CHANNEL."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_time: datetime
+    id: RideId
+    passenger_id: PassengerId | None  # who booked or left
+    seats_available: int
+    type: RideEventType
+
+    @classmethod
+    def from_ride(cls, event_type: RideEventType, ride: Ride, passenger_id: PassengerId | None = None) -> RideEventDTO:
+        """Return the event of the ride's current state."""
+        return cls(
+            city_id_departure=ride.route.city_id_departure,
+            city_id_destination=ride.route.city_id_destination,
+            departure_time=ride.departure_time,
+            id=ride.id,
+            passenger_id=passenger_id,
+            seats_available=ride.seats_available,
+            type=event_type,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RideNotificationDTO:
+    """A change of a ride to notify its passengers of, added to
+    RIDE_NOTIFICATIONS_STREAM. Promotions are notified to the promoted passengers only.
+    """
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_time: datetime
+    fields_updated: tuple[str, ...]
+    id: RideId
+    passenger_ids: tuple[PassengerId, ...]
+    type: RideNotificationType
+
+    @classmethod
+    def from_ride(
+        cls,
+        notification_type: RideNotificationType,
+        ride: Ride,
+        fields_updated: Iterable[str] = (),
+        passengers: Iterable[Passenger] | None = None,
+    ) -> RideNotificationDTO:
+        """Return the notification of the passengers, all the ride's ones by default."""
+        return cls(
+            city_id_departure=ride.route.city_id_departure,
+            city_id_destination=ride.route.city_id_destination,
+            departure_time=ride.departure_time,
+            fields_updated=tuple(fields_updated),
+            id=ride.id,
+            passenger_ids=tuple(p.id for p in (ride.passengers if passengers is None else passengers)),
+            type=notification_type,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BookableRideDTO:
+    """A ride which became bookable, i.e. created or got seats freed, added to
+    BOOKABLE_RIDES_STREAM.
+    """
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_time: datetime
+    id: RideId
+    owner_id: OwnerId
+    price: PriceVO
+    seats_available: int
+
+    @classmethod
+    def from_ride(cls, ride: Ride) -> BookableRideDTO:
+        """Return the ride's current state."""
+        return cls(
+            city_id_departure=ride.route.city_id_departure,
+            city_id_destination=ride.route.city_id_destination,
+            departure_time=ride.departure_time,
+            id=ride.id,
+            owner_id=ride.owner_id,
+            price=ride.price,
+            seats_available=ride.seats_available,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RideAlertChangeDTO:
+    """A created or deleted alert, added to RIDE_ALERTS_STREAM."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    day: date
+    id: RideAlertId
+    max_price: PriceVO | None
+    type: RideAlertChangeType
+    user_id: UserId
+
+    @classmethod
+    def from_alert(cls, change_type: RideAlertChangeType, alert: RideAlert) -> RideAlertChangeDTO:
+        """Return the change of the alert."""
+        return cls(
+            city_id_departure=alert.route.city_id_departure,
+            city_id_destination=alert.route.city_id_destination,
+            day=alert.day,
+            id=alert.id,
+            max_price=alert.max_price,
+            type=change_type,
+            user_id=alert.user_id,
+        )
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+    from datetime import datetime
+
+type ExportTable = Literal['passengers', 'rides']
+
+EXPORT_COLUMNS: dict[ExportTable, tuple[str, ...]] = {
+    'passengers': ('created_at', 'id', 'ride_departure_time', 'ride_id', 'seats_booked'),
+    'rides': (
+        'city_id_departure',
+        'city_id_destination',
+        'created_at',
+        'departure_time',
+        'description',
+        'id',
+        'is_cancelled',
+        'owner_id',
+        'price_currency',
+        'price_value',
+        'seats_available',
+        'seats_number',
+        'series_id',
+    ),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ExportFilterDTO:
+    """Rows of the table created from since inclusive till until exclusive, all the
+    rows before until without since.
+    """
+
+    since: datetime | None
+    table: ExportTable
+    until: datetime
+
+
+class ExportRowsQuery(Protocol):
+    """A query for analytics exports of rides and passengers."""
+
+    def handle(self, export_filter: ExportFilterDTO) -> AsyncIterator[Sequence[tuple[object, ...]]]:
+        """Yield the rows by chunks in no order, a row is the values of EXPORT_COLUMNS
+        of the table.
+        """
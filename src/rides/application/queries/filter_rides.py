@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Literal, Protocol
 
 if TYPE_CHECKING:
     from datetime import datetime
 
-    from ...domain.models import Currency, RideId
-    from ..use_cases.filter_rides import FilterParamsDTO
+    from ...domain.models import CityId, Currency, RideId
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,6 +21,8 @@ class PriceDTO:
 class FilteredRidesDTO:
     """Ride brief info."""
 
+    city_id_departure: CityId
+    city_id_destination: CityId
     departure_time: datetime
     id: RideId
     price: PriceDTO
@@ -29,8 +30,29 @@ class FilteredRidesDTO:
     seats_number: int
 
 
+type RidesSorting = Literal['departure_time', 'price']
+
+
+@dataclass(frozen=True, slots=True)
+class RidesFilterDTO:
+    """Rides of every route from any departure city to any destination city match.
+
+    With max_price only rides in its currency match.
+    """
+
+    city_ids_departure: tuple[CityId, ...]
+    city_ids_destination: tuple[CityId, ...]
+    departure_time_from: datetime
+    departure_time_to: datetime  # exclusive
+    max_price: PriceDTO | None
+    min_seats_available: int
+    sort_by: RidesSorting
+
+
 class FilterRidesQuery(Protocol):
     """A query for rides filtering."""
 
-    async def handle(self, params: FilterParamsDTO) -> list[FilteredRidesDTO]:
-        """Handle the query."""
+    async def handle(self, rides_filter: RidesFilterDTO) -> list[FilteredRidesDTO]:
+        """Return matching rides ordered by departure time or price, then by
+        departure time and id.
+        """
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from ...domain.models import CityId
+    from .filter_rides import PriceDTO
+
+
+@dataclass(frozen=True, slots=True)
+class CalendarDayDTO:
+    """Bookable rides of a route departing on a day."""
+
+    date: date
+    max_seats_available: int
+    min_prices: tuple[PriceDTO, ...]  # per currency
+    rides_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class CalendarFilterDTO:
+    """Days of a route from date_from to date_to inclusive."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    date_from: date
+    date_to: date
+
+
+class RideCalendarQuery(Protocol):
+    """A query for route calendars."""
+
+    async def handle(self, calendar_filter: CalendarFilterDTO) -> list[CalendarDayDTO]:
+        """Return days with bookable rides ordered by date."""
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from datetime import date, datetime
+
+    from ...domain.models import CityId, RideId
+    from .filter_rides import PriceDTO
+
+
+@dataclass(frozen=True, slots=True)
+class ItineraryLegDTO:
+    """A ride of an itinerary. Arrival time is estimated by the distance."""
+
+    arrival_time: datetime
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_time: datetime
+    id: RideId
+    price: PriceDTO
+    seats_available: int
+
+
+@dataclass(frozen=True, slots=True)
+class ItineraryDTO:
+    """Rides from the departure city to the destination one with transfers."""
+
+    arrival_time: datetime
+    departure_time: datetime
+    legs: tuple[ItineraryLegDTO, ...]
+    price: PriceDTO  # total, all legs are in the same currency
+    transfers: int
+
+
+@dataclass(frozen=True, slots=True)
+class ItinerariesFilterDTO:
+    """Itineraries of rides departing on the date with enough seats on every leg."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_date: date
+    limit: int
+    min_seats_available: int
+
+
+class SearchItinerariesQuery(Protocol):
+    """A query for multi-leg itineraries."""
+
+    async def handle(self, itineraries_filter: ItinerariesFilterDTO) -> list[ItineraryDTO]:
+        """Return itineraries not worse than others by arrival time, price and the
+        number of transfers at once, ordered by arrival time and price.
+        """
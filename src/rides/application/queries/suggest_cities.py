@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from ...domain.models import CityId
+
+
+@dataclass(frozen=True, slots=True)
+class SuggestedCityDTO:
+    """City suggestion."""
+
+    id: CityId
+    name: str
+
+
+class SuggestCitiesQuery(Protocol):
+    """A query for cities autocomplete."""
+
+    async def handle(self, text: str, limit: int) -> list[SuggestedCityDTO]:
+        """Return the most popular cities, which name or its word starts with text."""
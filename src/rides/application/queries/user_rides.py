@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Protocol
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from users import UserId
+
+    from ...domain.models import CityId, RideId
+    from .filter_rides import PriceDTO
+
+type RidesPeriod = Literal['past', 'upcoming']
+type UserRole = Literal['owner', 'passenger']
+
+
+@dataclass(frozen=True, slots=True)
+class RideCardDTO:
+    """Ride brief info for lists of the user's rides."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_time: datetime
+    id: RideId
+    is_cancelled: bool
+    price: PriceDTO
+    seats_available: int
+    seats_booked: int | None  # by the user, for bookings
+    seats_number: int
+
+
+@dataclass(frozen=True, slots=True)
+class RideCursorDTO:
+    """Position of a ride in a list, the next page starts after it."""
+
+    departure_time: datetime
+    id: RideId
+
+
+@dataclass(frozen=True, slots=True)
+class UserRidesFilterDTO:
+    """Rides the user owns or is a passenger of, cancelled ones included.
+
+    Upcoming rides depart after now and are ordered by departure time, past ones are
+    ordered in reverse, then by id in the same direction. With a cursor only the
+    rides after it in the order match.
+    """
+
+    cursor: RideCursorDTO | None
+    limit: int
+    now: datetime
+    period: RidesPeriod
+    role: UserRole
+    user_id: UserId
+
+
+class UserRidesQuery(Protocol):
+    """A query for lists of the user's rides."""
+
+    async def handle(self, rides_filter: UserRidesFilterDTO) -> list[RideCardDTO]:
+        """Return at most limit matching rides in the order."""
@@ -1,13 +1,36 @@
 from .book_ride import BookRideUsecase as BookRideUsecase
 from .cancel_ride import CancelRideUsecase as CancelRideUsecase
+from .cancel_ride_series import CancelRideSeriesUsecase as CancelRideSeriesUsecase
 from .create_ride import CreateRideDTO as CreateRideDTO
 from .create_ride import CreateRideReturnDTO as CreateRideReturnDTO
 from .create_ride import CreateRideUsecase as CreateRideUsecase
 from .create_ride import PriceDTO as PriceDTO
 from .create_ride import RouteDTO as RouteDTO
+from .create_ride_alert import CreateRideAlertDTO as CreateRideAlertDTO
+from .create_ride_alert import CreateRideAlertUsecase as CreateRideAlertUsecase
+from .create_ride_series import CreateRideSeriesDTO as CreateRideSeriesDTO
+from .create_ride_series import CreateRideSeriesUsecase as CreateRideSeriesUsecase
+from .create_ride_series import RideSeriesReturnDTO as RideSeriesReturnDTO
+from .delete_ride_alert import DeleteRideAlertUsecase as DeleteRideAlertUsecase
+from .export_rows import ExportDTO as ExportDTO
+from .export_rows import ExportRowsUsecase as ExportRowsUsecase
 from .filter_rides import FilterParamsDTO as FilterParamsDTO
 from .filter_rides import FilterRidesUsecase as FilterRidesUsecase
 from .get_complex_ride import GetComplexRideUsecase as GetComplexRideUsecase
+from .get_ride_calendar import GetRideCalendarUsecase as GetRideCalendarUsecase
+from .import_rides import ImportBatchDTO as ImportBatchDTO
+from .import_rides import ImportRideRowDTO as ImportRideRowDTO
+from .import_rides import ImportRidesReturnDTO as ImportRidesReturnDTO
+from .import_rides import ImportRidesUsecase as ImportRidesUsecase
+from .import_rides import ImportRowErrorDTO as ImportRowErrorDTO
+from .join_waitlist import JoinWaitlistUsecase as JoinWaitlistUsecase
 from .leave_ride import LeaveRideUsecase as LeaveRideUsecase
+from .leave_waitlist import LeaveWaitlistUsecase as LeaveWaitlistUsecase
+from .list_user_rides import ListUserRidesUsecase as ListUserRidesUsecase
+from .list_user_rides import UserRidesParamsDTO as UserRidesParamsDTO
+from .search_itineraries import SearchItinerariesUsecase as SearchItinerariesUsecase
+from .suggest_cities import SuggestCitiesUsecase as SuggestCitiesUsecase
 from .update_ride import UpdateRideDTO as UpdateRideDTO
 from .update_ride import UpdateRideUsecase as UpdateRideUsecase
+from .update_ride_series import UpdateRideSeriesDTO as UpdateRideSeriesDTO
+from .update_ride_series import UpdateRideSeriesUsecase as UpdateRideSeriesUsecase
@@ -2,12 +2,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from ...constants import RIDE_COMPLEX_CACHE_KEY
+from ...constants import RIDE_COMPLEX_CACHE_KEY, RIDE_EVENTS_CHANNEL
 from ...domain.models import Passenger
+from ..events import RideEventDTO
 
 if TYPE_CHECKING:
-    from shared.application.cache import Cache
-
     from ...domain.models import PassengerId, RideId
     from ...domain.uow import RideUnitOfWork
 
@@ -15,8 +14,7 @@ if TYPE_CHECKING:
 class BookRideUsecase:
     """A usecase for ride booking."""
 
-    def __init__(self, uow: RideUnitOfWork, cache: Cache) -> None:
-        self._cache = cache
+    def __init__(self, uow: RideUnitOfWork) -> None:
         self._uow = uow
 
     async def execute(self, ride_id: RideId, passenger_id: PassengerId, seats_booked: int) -> None:
@@ -27,7 +25,6 @@ class BookRideUsecase:
             ride.add_passenger(Passenger(id=passenger_id, seats_booked=seats_booked))
 
             await self._uow.ride_repo.update(ride)
+            self._uow.outbox.delete_from_cache(RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id))
+            self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('booked', ride, passenger_id))
             self._uow.commit()
-
-        cache_key = RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id)
-        await self._cache.delete(cache_key)
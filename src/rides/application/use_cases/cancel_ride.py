@@ -4,11 +4,10 @@ from typing import TYPE_CHECKING
 
 from shared.errors import ForbiddenError
 
-from ...constants import RIDE_COMPLEX_CACHE_KEY
+from ...constants import RIDE_COMPLEX_CACHE_KEY, RIDE_EVENTS_CHANNEL, RIDE_NOTIFICATIONS_STREAM
+from ..events import RideEventDTO, RideNotificationDTO
 
 if TYPE_CHECKING:
-    from shared.application.cache import Cache
-
     from ...domain.models import OwnerId, Ride, RideId
     from ...domain.uow import RideUnitOfWork
 
@@ -16,8 +15,7 @@ if TYPE_CHECKING:
 class CancelRideUsecase:
     """A usecase for ride cancelling."""
 
-    def __init__(self, uow: RideUnitOfWork, cache: Cache) -> None:
-        self._cache = cache
+    def __init__(self, uow: RideUnitOfWork) -> None:
         self._uow = uow
 
     async def execute(self, ride_id: RideId, owner_id: OwnerId) -> Ride:
@@ -35,8 +33,11 @@ class CancelRideUsecase:
             ride.cancel()
 
             await self._uow.ride_repo.update(ride)
+            self._uow.outbox.delete_from_cache(RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id))
+            self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('cancelled', ride))
+            if ride.passengers:
+                self._uow.outbox.add_to_stream(
+                    RIDE_NOTIFICATIONS_STREAM, RideNotificationDTO.from_ride('cancelled', ride)
+                )
             self._uow.commit()
-
-        cache_key = RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id)
-        await self._cache.delete(cache_key)
         return ride
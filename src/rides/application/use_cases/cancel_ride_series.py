@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ...constants import RIDE_COMPLEX_CACHE_KEY, RIDE_EVENTS_CHANNEL, RIDE_NOTIFICATIONS_STREAM
+from ..events import RideEventDTO, RideNotificationDTO
+from .create_ride_series import RideSeriesReturnDTO
+
+if TYPE_CHECKING:
+    from ...domain.models import OwnerId, RideSeriesId
+    from ...domain.uow import RideUnitOfWork
+
+
+class CancelRideSeriesUsecase:
+    """A usecase for ride series cancelling."""
+
+    def __init__(self, uow: RideUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, series_id: RideSeriesId, owner_id: OwnerId) -> RideSeriesReturnDTO:
+        """Cancel the upcoming rides of the series at once, the ones with passengers
+        departing within an hour are kept. Return the cancelled rides.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to cancel;
+        """
+        async with self._uow:
+            rides = await self._uow.ride_repo.cancel_series(series_id, owner_id)
+
+            self._uow.outbox.delete_from_cache(*(RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride.id) for ride in rides))
+            for ride in rides:
+                self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('cancelled', ride))
+                if ride.passengers:
+                    self._uow.outbox.add_to_stream(
+                        RIDE_NOTIFICATIONS_STREAM, RideNotificationDTO.from_ride('cancelled', ride)
+                    )
+            self._uow.commit()
+        return RideSeriesReturnDTO.from_rides(series_id, rides)
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 from datetime import datetime
 
+from ...constants import BOOKABLE_RIDES_STREAM, RIDE_EVENTS_CHANNEL
 from ...domain.models import CityId, Currency, OwnerId, PriceVO, Ride, RideId, RouteVO
 from ...domain.params_spec import CreateRideParams
 from ...domain.uow import RideCityUnitOfWork
+from ..events import BookableRideDTO, RideEventDTO
 
 
 @dataclass(frozen=True, slots=True)
@@ -73,12 +75,15 @@ class CreateRideUsecase:
                 city_id_destination=ride_data.route.city_id_destination,
             ),
             seats_number=ride_data.seats_number,
+            series_id=None,
         )
         ride = Ride.create(params)
 
         async with self._uow:
             cities_data = self._uow.city_repo.list([ride.route.city_id_departure, ride.route.city_id_destination])
             await self._uow.ride_repo.create(ride)
+            self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('created', ride))
+            self._uow.outbox.add_to_stream(BOOKABLE_RIDES_STREAM, BookableRideDTO.from_ride(ride))
             self._uow.commit()
 
         departure_city = cities_data[ride.route.city_id_departure]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ...constants import MAX_USER_RIDE_ALERTS, RIDE_ALERTS_STREAM
+from ...domain.models import PriceVO, RideAlert, RouteVO
+from ...errors import RideAlertsLimitError
+from ..events import RideAlertChangeDTO
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from users import UserId
+
+    from ...domain.uow import RideAlertUnitOfWork
+    from .create_ride import PriceDTO, RouteDTO
+
+
+@dataclass(frozen=True, slots=True)
+class CreateRideAlertDTO:
+    """A DTO for a ride alert creating."""
+
+    day: date
+    max_price: PriceDTO | None
+    route: RouteDTO
+    user_id: UserId
+
+
+class CreateRideAlertUsecase:
+    """A usecase for a ride alert creating."""
+
+    def __init__(self, uow: RideAlertUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, alert_data: CreateRideAlertDTO) -> RideAlert:
+        """Create a new alert, the user is mailed of bookable rides matching it.
+
+        Raise:
+            - RideAlertsLimitError, if the user has MAX_USER_RIDE_ALERTS alerts;
+        """
+        max_price = None
+        if alert_data.max_price:
+            max_price = PriceVO(currency=alert_data.max_price.currency, value=alert_data.max_price.value)
+        route = RouteVO(
+            city_id_departure=alert_data.route.city_id_departure,
+            city_id_destination=alert_data.route.city_id_destination,
+        )
+        alert = RideAlert.create(alert_data.day, max_price, route, alert_data.user_id)
+
+        async with self._uow:
+            self._uow.city_repo.list([route.city_id_departure, route.city_id_destination])
+            if await self._uow.alert_repo.count_by_user(alert.user_id) >= MAX_USER_RIDE_ALERTS:
+                raise RideAlertsLimitError(MAX_USER_RIDE_ALERTS)
+
+            await self._uow.alert_repo.create(alert)
+            self._uow.outbox.add_to_stream(RIDE_ALERTS_STREAM, RideAlertChangeDTO.from_alert('created', alert))
+            self._uow.commit()
+
+        return alert
@@ -0,0 +1,85 @@
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import Self
+
+from shared.domain.ids import uuid7
+
+from ...constants import BOOKABLE_RIDES_STREAM, RIDE_EVENTS_CHANNEL
+from ...domain.models import PriceVO, RecurrenceVO, Ride, RideId, RideSeriesId, RouteVO
+from ...domain.params_spec import CreateRideParams
+from ...domain.uow import RideCityUnitOfWork
+from ..events import BookableRideDTO, RideEventDTO
+from .create_ride import CreateRideDTO
+
+
+@dataclass(frozen=True, slots=True)
+class CreateRideSeriesDTO:
+    """A DTO for a ride series creating, ride.departure_time is of the first ride."""
+
+    ride: CreateRideDTO
+    until: date  # the last day of departures, inclusive
+    weekdays: frozenset[int]  # ISO, 1 is Monday
+
+
+@dataclass(frozen=True, slots=True)
+class RideSeriesRideDTO:
+    """A ride of a series."""
+
+    departure_time: datetime
+    id: RideId
+
+
+@dataclass(frozen=True, slots=True)
+class RideSeriesReturnDTO:
+    """A DTO for return."""
+
+    id: RideSeriesId
+    rides: list[RideSeriesRideDTO]
+
+    @classmethod
+    def from_rides(cls, id: RideSeriesId, rides: list[Ride]) -> Self:
+        """Return the DTO of the rides of the series in the order of departure."""
+        rides = sorted(rides, key=lambda ride: ride.departure_time)
+        return cls(id=id, rides=[RideSeriesRideDTO(departure_time=r.departure_time, id=r.id) for r in rides])
+
+
+class CreateRideSeriesUsecase:
+    """A usecase for a ride series creating."""
+
+    def __init__(self, uow: RideCityUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, series_data: CreateRideSeriesDTO) -> RideSeriesReturnDTO:
+        """Create the rides of the series at once, the cities are checked once.
+
+        Raise:
+            - RideSeriesSizeError, if there are no departures or over MAX_SERIES_RIDES;
+        """
+        ride_data = series_data.ride
+        recurrence = RecurrenceVO(
+            first_departure_time=ride_data.departure_time, until=series_data.until, weekdays=series_data.weekdays
+        )
+        series_id = RideSeriesId(uuid7())
+        params = CreateRideParams(
+            departure_time=ride_data.departure_time,
+            description=ride_data.description,
+            owner_id=ride_data.owner_id,
+            price=PriceVO(currency=ride_data.price.currency, value=ride_data.price.value),
+            route=RouteVO(
+                city_id_departure=ride_data.route.city_id_departure,
+                city_id_destination=ride_data.route.city_id_destination,
+            ),
+            seats_number=ride_data.seats_number,
+            series_id=series_id,
+        )
+        rides = [Ride.create(replace(params, departure_time=time)) for time in recurrence.get_departure_times()]
+
+        async with self._uow:
+            self._uow.city_repo.list([params.route.city_id_departure, params.route.city_id_destination])
+            await self._uow.ride_repo.create_many(rides)
+            for ride in rides:
+                self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('created', ride))
+                self._uow.outbox.add_to_stream(BOOKABLE_RIDES_STREAM, BookableRideDTO.from_ride(ride))
+            self._uow.commit()
+
+        return RideSeriesReturnDTO.from_rides(series_id, rides)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ...constants import RIDE_ALERTS_STREAM
+from ..events import RideAlertChangeDTO
+
+if TYPE_CHECKING:
+    from users import UserId
+
+    from ...domain.models import RideAlertId
+    from ...domain.uow import RideAlertUnitOfWork
+
+
+class DeleteRideAlertUsecase:
+    """A usecase for a ride alert deleting."""
+
+    def __init__(self, uow: RideAlertUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, alert_id: RideAlertId, user_id: UserId) -> None:
+        """Delete the user's alert."""
+        async with self._uow:
+            alert = await self._uow.alert_repo.delete(alert_id, user_id)
+            self._uow.outbox.add_to_stream(RIDE_ALERTS_STREAM, RideAlertChangeDTO.from_alert('deleted', alert))
+            self._uow.commit()
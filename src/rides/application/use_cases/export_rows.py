@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from ...constants import EXPORT_LAG_SECS
+from ..queries.export_rows import EXPORT_COLUMNS, ExportFilterDTO
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from ..queries.export_rows import ExportRowsQuery, ExportTable
+
+
+@dataclass(frozen=True, slots=True)
+class ExportDTO:
+    """Rows of an export by chunks, until is since of the next incremental one."""
+
+    chunks: AsyncIterator[Sequence[tuple[object, ...]]]
+    columns: tuple[str, ...]
+    until: datetime
+
+
+class ExportRowsUsecase:
+    """A usecase for an analytics export of rides or passengers."""
+
+    def __init__(self, query: ExportRowsQuery) -> None:
+        self._query = query
+
+    def execute(self, table: ExportTable, since: datetime | None) -> ExportDTO:
+        """Export the rows created since the time or all of them, till EXPORT_LAG_SECS
+        ago. Rows are committed a while after their created_at, so later ones may
+        be missing yet, they're exported next time.
+        """
+        until = datetime.now(UTC) - timedelta(seconds=EXPORT_LAG_SECS)
+        if since:
+            until = max(until, since)
+
+        chunks = self._query.handle(ExportFilterDTO(since=since, table=table, until=until))
+        return ExportDTO(chunks=chunks, columns=EXPORT_COLUMNS[table], until=until)
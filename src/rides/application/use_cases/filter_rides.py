@@ -1,31 +1,70 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import UTC, datetime, time, timedelta
 from typing import TYPE_CHECKING
 
+from ..queries.filter_rides import PriceDTO, RidesFilterDTO
+
 if TYPE_CHECKING:
     from datetime import date
 
-    from ...domain.models import CityId
-    from ..queries.filter_rides import FilteredRidesDTO, FilterRidesQuery
+    from ...domain.models import CityId, Currency
+    from ...domain.repositories import CityRepository
+    from ..queries.filter_rides import FilteredRidesDTO, FilterRidesQuery, RidesSorting
 
 
 @dataclass(frozen=True, slots=True)
 class FilterParamsDTO:
-    """Params."""
+    """Params. Times of the day are in UTC."""
 
     city_id_departure: CityId
     city_id_destination: CityId
     departure_date: date
     min_seats_available: int
+    departure_time_from: time | None = None
+    departure_time_to: time | None = None  # exclusive
+    max_price_currency: Currency | None = None
+    max_price_value: int | None = None
+    radius_km: int | None = None  # search from and to nearby cities as well
+    sort_by: RidesSorting = 'departure_time'
 
 
 class FilterRidesUsecase:
     """A usecase for rides filtering."""
 
-    def __init__(self, query: FilterRidesQuery) -> None:
+    def __init__(self, query: FilterRidesQuery, city_repo: CityRepository) -> None:
+        self._city_repo = city_repo
         self._query = query
 
     async def execute(self, params: FilterParamsDTO) -> list[FilteredRidesDTO]:
-        """Return rides based on filtering params."""
-        return await self._query.handle(params)
+        """Return rides based on filtering params. With a radius, rides of all routes
+        between cities nearby the departure and the destination ones are returned.
+        """
+        if params.radius_km:
+            city_ids_departure = self._city_repo.list_nearby_ids(params.city_id_departure, params.radius_km)
+            city_ids_destination = self._city_repo.list_nearby_ids(params.city_id_destination, params.radius_km)
+        else:
+            city_ids_departure, city_ids_destination = [params.city_id_departure], [params.city_id_destination]
+
+        day_start = datetime.combine(params.departure_date, time(0, 0, tzinfo=UTC))
+        departure_time_from, departure_time_to = day_start, day_start + timedelta(days=1)
+        if params.departure_time_from is not None:
+            departure_time_from = datetime.combine(params.departure_date, params.departure_time_from, tzinfo=UTC)
+        if params.departure_time_to is not None:
+            departure_time_to = datetime.combine(params.departure_date, params.departure_time_to, tzinfo=UTC)
+
+        max_price = None
+        if params.max_price_currency is not None and params.max_price_value is not None:
+            max_price = PriceDTO(currency=params.max_price_currency, value=params.max_price_value)
+
+        rides_filter = RidesFilterDTO(
+            city_ids_departure=tuple(city_ids_departure),
+            city_ids_destination=tuple(city_ids_destination),
+            departure_time_from=departure_time_from,
+            departure_time_to=departure_time_to,
+            max_price=max_price,
+            min_seats_available=params.min_seats_available,
+            sort_by=params.sort_by,
+        )
+        return await self._query.handle(rides_filter)
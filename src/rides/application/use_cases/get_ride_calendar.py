@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from ..queries.ride_calendar import CalendarDayDTO
+
+if TYPE_CHECKING:
+    from ..queries.ride_calendar import CalendarFilterDTO, RideCalendarQuery
+
+
+class GetRideCalendarUsecase:
+    """A usecase for route calendars."""
+
+    def __init__(self, query: RideCalendarQuery) -> None:
+        self._query = query
+
+    async def execute(self, params: CalendarFilterDTO) -> list[CalendarDayDTO]:
+        """Return every day of the range, days without rides have zero counts."""
+        days = {day.date: day for day in await self._query.handle(params)}
+
+        calendar = []
+        for offset in range((params.date_to - params.date_from).days + 1):
+            date = params.date_from + timedelta(days=offset)
+            calendar.append(
+                days.get(date) or CalendarDayDTO(date=date, max_seats_available=0, min_prices=(), rides_count=0)
+            )
+        return calendar
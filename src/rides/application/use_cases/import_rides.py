@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from shared.errors import ProjectError
+
+from ...constants import BOOKABLE_RIDES_STREAM, MAX_IMPORT_ERRORS, RIDE_EVENTS_CHANNEL
+from ...domain.models import OwnerId, PriceVO, Ride, RouteVO
+from ...domain.params_spec import CreateRideParams
+from ...domain.uow import RideCityUnitOfWork
+from ..events import BookableRideDTO, RideEventDTO
+from .create_ride import PriceDTO, RouteDTO
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRideRowDTO:
+    """A parsed row of an import, line is its number in the input."""
+
+    departure_time: datetime
+    description: str | None
+    line: int
+    price: PriceDTO
+    route: RouteDTO
+    seats_number: int
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRowErrorDTO:
+    """A rejected row of an import."""
+
+    detail: str
+    line: int
+
+
+@dataclass(frozen=True, slots=True)
+class ImportBatchDTO:
+    """A batch of an import: the parsed rows and the rows rejected by parsing."""
+
+    errors: list[ImportRowErrorDTO]
+    rows: list[ImportRideRowDTO]
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRidesReturnDTO:
+    """A DTO for return. Only the first MAX_IMPORT_ERRORS errors are listed, all the
+    rejected rows are counted.
+    """
+
+    errors: list[ImportRowErrorDTO]
+    rides_imported: int
+    rows_rejected: int
+
+
+class ImportRidesUsecase:
+    """A usecase for a ride importing."""
+
+    def __init__(self, uow: RideCityUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, owner_id: OwnerId, batches: AsyncIterable[ImportBatchDTO]) -> ImportRidesReturnDTO:
+        """Create the owner's rides of the valid rows, report the others.
+
+        Rows are checked by the rules of a ride creating in a thread, a batch is
+        created at once in its own transaction, so the rides of the previous batches
+        are kept if a batch fails.
+        """
+        errors: list[ImportRowErrorDTO] = []
+        rides_imported = rows_rejected = 0
+        async for batch in batches:
+            rides, rides_errors = await asyncio.to_thread(self._create_rides, owner_id, batch.rows)
+            batch_errors = sorted([*batch.errors, *rides_errors], key=lambda e: e.line)
+            errors.extend(batch_errors[: MAX_IMPORT_ERRORS - len(errors)])
+            rows_rejected += len(batch_errors)
+            if not rides:
+                continue
+
+            async with self._uow:
+                await self._uow.ride_repo.create_many(rides)
+                for ride in rides:
+                    self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('created', ride))
+                    self._uow.outbox.add_to_stream(BOOKABLE_RIDES_STREAM, BookableRideDTO.from_ride(ride))
+                self._uow.commit()
+            rides_imported += len(rides)
+
+        return ImportRidesReturnDTO(errors=errors, rides_imported=rides_imported, rows_rejected=rows_rejected)
+
+    def _create_rides(
+        self, owner_id: OwnerId, rows: list[ImportRideRowDTO]
+    ) -> tuple[list[Ride], list[ImportRowErrorDTO]]:
+        rides: list[Ride] = []
+        errors: list[ImportRowErrorDTO] = []
+        city_repo = self._uow.city_repo
+        for row in rows:
+            try:
+                route = RouteVO(
+                    city_id_departure=row.route.city_id_departure, city_id_destination=row.route.city_id_destination
+                )
+                city_repo.list([route.city_id_departure, route.city_id_destination])
+                params = CreateRideParams(
+                    departure_time=row.departure_time,
+                    description=row.description,
+                    owner_id=owner_id,
+                    price=PriceVO(currency=row.price.currency, value=row.price.value),
+                    route=route,
+                    seats_number=row.seats_number,
+                    series_id=None,
+                )
+                rides.append(Ride.create(params))
+            except ProjectError as err:
+                errors.append(ImportRowErrorDTO(detail=err.detail or 'Invalid row', line=row.line))
+            except ValueError as err:
+                errors.append(ImportRowErrorDTO(detail=str(err), line=row.line))
+
+        return rides, errors
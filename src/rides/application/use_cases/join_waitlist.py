@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ...domain.models import WaitlistEntry
+
+if TYPE_CHECKING:
+    from ...domain.models import PassengerId, RideId
+    from ...domain.uow import RideUnitOfWork
+
+
+class JoinWaitlistUsecase:
+    """A usecase for joining the waitlist of a full ride."""
+
+    def __init__(self, uow: RideUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, ride_id: RideId, passenger_id: PassengerId, seats_requested: int) -> None:
+        """Join the waitlist, the user is booked once the seats are freed."""
+        async with self._uow:
+            ride = await self._uow.ride_repo.get_if_active(ride_id)
+
+            ride.join_waitlist(WaitlistEntry(id=passenger_id, seats_requested=seats_requested))
+
+            await self._uow.ride_repo.update(ride)
+            self._uow.commit()
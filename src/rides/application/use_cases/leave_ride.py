@@ -2,11 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from ...constants import RIDE_COMPLEX_CACHE_KEY
+from ...constants import BOOKABLE_RIDES_STREAM, RIDE_COMPLEX_CACHE_KEY, RIDE_EVENTS_CHANNEL, RIDE_NOTIFICATIONS_STREAM
+from ..events import BookableRideDTO, RideEventDTO, RideNotificationDTO
 
 if TYPE_CHECKING:
-    from shared.application.cache import Cache
-
     from ...domain.models import PassengerId, RideId
     from ...domain.uow import RideUnitOfWork
 
@@ -14,19 +13,29 @@ if TYPE_CHECKING:
 class LeaveRideUsecase:
     """A usecase for ride leaving by a passenger."""
 
-    def __init__(self, uow: RideUnitOfWork, cache: Cache) -> None:
-        self._cache = cache
+    def __init__(self, uow: RideUnitOfWork) -> None:
         self._uow = uow
 
     async def execute(self, ride_id: RideId, passenger_id: PassengerId) -> None:
-        """Leave the ride."""
+        """Leave the ride. The freed seats are booked by waitlisted users, the rest is
+        matched against alerts if the ride was full.
+        """
         async with self._uow:
             ride = await self._uow.ride_repo.get_if_active(ride_id)
 
+            was_full = not ride.seats_available
             ride.remove_passenger(passenger_id)
+            promoted = ride.promote_waitlisted()
 
             await self._uow.ride_repo.update(ride)
+            self._uow.outbox.delete_from_cache(RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id))
+            self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('left', ride, passenger_id))
+            for p in promoted:
+                self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('booked', ride, p.id))
+            if promoted:
+                self._uow.outbox.add_to_stream(
+                    RIDE_NOTIFICATIONS_STREAM, RideNotificationDTO.from_ride('promoted', ride, passengers=promoted)
+                )
+            if was_full and ride.seats_available:
+                self._uow.outbox.add_to_stream(BOOKABLE_RIDES_STREAM, BookableRideDTO.from_ride(ride))
             self._uow.commit()
-
-        cache_key = RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id)
-        await self._cache.delete(cache_key)
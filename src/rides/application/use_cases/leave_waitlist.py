@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...domain.models import PassengerId, RideId
+    from ...domain.uow import RideUnitOfWork
+
+
+class LeaveWaitlistUsecase:
+    """A usecase for leaving the waitlist of a ride."""
+
+    def __init__(self, uow: RideUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, ride_id: RideId, passenger_id: PassengerId) -> None:
+        """Leave the waitlist."""
+        async with self._uow:
+            ride = await self._uow.ride_repo.get_if_active(ride_id)
+
+            ride.leave_waitlist(passenger_id)
+
+            await self._uow.ride_repo.update(ride)
+            self._uow.commit()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from ..queries.user_rides import RideCursorDTO, UserRidesFilterDTO
+
+if TYPE_CHECKING:
+    from users import UserId
+
+    from ..queries.user_rides import RideCardDTO, RidesPeriod, UserRidesQuery, UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class UserRidesParamsDTO:
+    """Params of a page."""
+
+    cursor: RideCursorDTO | None  # of the last ride of the previous page
+    limit: int
+    period: RidesPeriod
+    role: UserRole
+    user_id: UserId
+
+
+@dataclass(frozen=True, slots=True)
+class UserRidesPageDTO:
+    """A page of rides, next_cursor is None for the last one."""
+
+    next_cursor: RideCursorDTO | None
+    results: list[RideCardDTO]
+
+
+class ListUserRidesUsecase:
+    """A usecase for listing rides the user owns or has booked."""
+
+    def __init__(self, query: UserRidesQuery) -> None:
+        self._query = query
+
+    async def execute(self, params: UserRidesParamsDTO) -> UserRidesPageDTO:
+        """Return a page of the rides. A ride more than the limit is queried to know
+        if the page is the last one.
+        """
+        rides_filter = UserRidesFilterDTO(
+            cursor=params.cursor,
+            limit=params.limit + 1,
+            now=datetime.now(UTC),
+            period=params.period,
+            role=params.role,
+            user_id=params.user_id,
+        )
+        rides = await self._query.handle(rides_filter)
+
+        next_cursor = None
+        if len(rides) > params.limit:
+            rides = rides[: params.limit]
+            next_cursor = RideCursorDTO(departure_time=rides[-1].departure_time, id=rides[-1].id)
+
+        return UserRidesPageDTO(next_cursor=next_cursor, results=rides)
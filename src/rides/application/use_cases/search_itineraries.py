@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..queries.search_itineraries import ItinerariesFilterDTO, ItineraryDTO, SearchItinerariesQuery
+
+
+class SearchItinerariesUsecase:
+    """A usecase for multi-leg route search."""
+
+    def __init__(self, query: SearchItinerariesQuery) -> None:
+        self._query = query
+
+    async def execute(self, params: ItinerariesFilterDTO) -> list[ItineraryDTO]:
+        """Return the best itineraries between the cities, direct rides included."""
+        return await self._query.handle(params)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..queries.suggest_cities import SuggestCitiesQuery, SuggestedCityDTO
+
+
+class SuggestCitiesUsecase:
+    """A usecase for cities autocomplete."""
+
+    def __init__(self, query: SuggestCitiesQuery) -> None:
+        self._query = query
+
+    async def execute(self, text: str, limit: int) -> list[SuggestedCityDTO]:
+        """Return cities matching the typed text, the most popular first."""
+        return await self._query.handle(text, limit)
@@ -5,15 +5,14 @@ from typing import TYPE_CHECKING
 
 from shared.errors import ForbiddenError
 
-from ...constants import RIDE_COMPLEX_CACHE_KEY
+from ...constants import BOOKABLE_RIDES_STREAM, RIDE_COMPLEX_CACHE_KEY, RIDE_EVENTS_CHANNEL, RIDE_NOTIFICATIONS_STREAM
 from ...domain.models import PriceVO, Ride, RideId
+from ..events import BookableRideDTO, RideEventDTO, RideNotificationDTO
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
     from datetime import datetime
 
-    from shared.application.cache import Cache
-
     from ...domain.models import Currency, OwnerId
     from ...domain.uow import RideUnitOfWork
 
@@ -41,12 +40,13 @@ class UpdateRideDTO:
 class UpdateRideUsecase:
     """A usecase for ride update."""
 
-    def __init__(self, uow: RideUnitOfWork, cache: Cache) -> None:
-        self._cache = cache
+    def __init__(self, uow: RideUnitOfWork) -> None:
         self._uow = uow
 
     async def execute(self, ride_id: RideId, owner_id: OwnerId, ride_data: UpdateRideDTO) -> Ride:
-        """Update the ride if possible.
+        """Update the ride if possible. Seats freed by the seats number increase are
+        booked by waitlisted users, the rest is matched against alerts if the ride was
+        full.
 
         Raise:
             - ForbiddenError, if the user isn't an owner;
@@ -57,6 +57,7 @@ class UpdateRideUsecase:
             if owner_id != ride.owner_id:
                 raise ForbiddenError
 
+            was_full = not ride.seats_available
             for field in ride_data.fields_to_update:
                 if field == 'price' and ride_data.price:
                     data_to_update = PriceVO(currency=ride_data.price.currency, value=ride_data.price.value)
@@ -65,9 +66,24 @@ class UpdateRideUsecase:
 
                 setattr(ride, field, data_to_update)
 
+            passengers = list(ride.passengers)  # the promoted ones are notified of the promotion only
+            promoted = ride.promote_waitlisted()
+
             await self._uow.ride_repo.update(ride)
+            self._uow.outbox.delete_from_cache(RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id))
+            self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('updated', ride))
+            for p in promoted:
+                self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('booked', ride, p.id))
+            if passengers:
+                self._uow.outbox.add_to_stream(
+                    RIDE_NOTIFICATIONS_STREAM,
+                    RideNotificationDTO.from_ride('updated', ride, ride_data.fields_to_update, passengers),
+                )
+            if promoted:
+                self._uow.outbox.add_to_stream(
+                    RIDE_NOTIFICATIONS_STREAM, RideNotificationDTO.from_ride('promoted', ride, passengers=promoted)
+                )
+            if was_full and ride.seats_available:
+                self._uow.outbox.add_to_stream(BOOKABLE_RIDES_STREAM, BookableRideDTO.from_ride(ride))
             self._uow.commit()
-
-        cache_key = RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id)
-        await self._cache.delete(cache_key)
         return ride
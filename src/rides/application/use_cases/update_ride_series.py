@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ...constants import RIDE_COMPLEX_CACHE_KEY, RIDE_EVENTS_CHANNEL
+from ...domain.models import PriceVO
+from ...domain.params_spec import UpdateRideSeriesParams
+from ..events import RideEventDTO
+from .create_ride_series import RideSeriesReturnDTO
+
+if TYPE_CHECKING:
+    from ...domain.models import OwnerId, RideSeriesId
+    from ...domain.uow import RideUnitOfWork
+    from .create_ride import PriceDTO
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateRideSeriesDTO:
+    """A DTO for ride series update."""
+
+    fields_to_update: tuple[str, ...]
+
+    description: str | None = None
+    price: PriceDTO | None = None
+    seats_number: int | None = None
+
+
+class UpdateRideSeriesUsecase:
+    """A usecase for ride series update."""
+
+    def __init__(self, uow: RideUnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(
+        self, series_id: RideSeriesId, owner_id: OwnerId, series_data: UpdateRideSeriesDTO
+    ) -> RideSeriesReturnDTO:
+        """Update the upcoming rides of the series without passengers at once, the
+        ones with passengers are kept as they can't be changed. Return the updated
+        rides.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to update;
+        """
+        price = series_data.price
+        params = UpdateRideSeriesParams(
+            description=series_data.description,
+            fields_to_update=series_data.fields_to_update,
+            price=PriceVO(currency=price.currency, value=price.value) if price else None,
+            seats_number=series_data.seats_number,
+        )
+
+        async with self._uow:
+            rides = await self._uow.ride_repo.update_series(series_id, owner_id, params)
+
+            self._uow.outbox.delete_from_cache(*(RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride.id) for ride in rides))
+            for ride in rides:
+                self._uow.outbox.publish(RIDE_EVENTS_CHANNEL, RideEventDTO.from_ride('updated', ride))
+            self._uow.commit()
+        return RideSeriesReturnDTO.from_rides(series_id, rides)
@@ -1,2 +1,25 @@
 RIDE_COMPLEX_CACHE_KEY = 'rides:{ride_id}:complex'
+RIDE_EVENTS_CHANNEL = 'rides:events'  # of RideEventDTO
+RIDE_NOTIFICATIONS_STREAM = 'rides:notifications'  # of RideNotificationDTO, passengers are mailed
+RIDE_ALERTS_STREAM = 'rides:alerts'  # of RideAlertChangeDTO, workers keep their indexes of alerts by it
+BOOKABLE_RIDES_STREAM = 'rides:bookable'  # of BookableRideDTO, matched against alerts
 MAX_VEHICLE_SEATS = 7
+MAX_WAITLIST_PASSENGERS = 20  # per ride, the waitlist is loaded with the ride for every booking
+MAX_DEPARTURE_DAYS = 365  # rides are published up to it ahead, their partitions exist
+MAX_SERIES_RIDES = 60  # per series, they're inserted with one statement
+MAX_CITY_SUGGESTIONS = 20
+MAX_NEARBY_CITIES = 8  # per departure and destination, so up to 64 routes are searched
+MAX_SEARCH_RADIUS_KM = 50
+AVG_RIDE_SPEED_KMH = 70  # arrival time of a ride is estimated by the distance
+ROAD_DISTANCE_FACTOR = 1.3  # road distance per great-circle one
+MAX_ITINERARIES = 20
+MAX_ITINERARY_LEGS = 3
+MIN_TRANSFER_MINUTES = 15
+MAX_CALENDAR_DAYS = 62
+MAX_EVENTS_RIDES = 50  # per server-sent events connection
+EVENTS_HEARTBEAT_SECS = 15  # idle connections get a comment, so proxies keep them
+MAX_USER_RIDE_ALERTS = 20
+MAX_USER_RIDES_PAGE = 50
+IMPORT_BATCH_SIZE = 2000  # rides per transaction of an import, its route-days are locked till the commit
+MAX_IMPORT_ERRORS = 1000  # listed per import, the rest are only counted
+EXPORT_LAG_SECS = 60  # exports end that long ago, transactions of the rows created earlier have committed
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from enum import StrEnum
 from typing import TYPE_CHECKING, NewType
-from uuid import UUID, uuid4
+from uuid import UUID
 
+from shared.domain.ids import uuid7
 from shared.domain.models import Entity
 from users import UserId as UserId
 
 from .. import errors as domain_errs
-from ..constants import MAX_VEHICLE_SEATS
+from ..constants import MAX_DEPARTURE_DAYS, MAX_SERIES_RIDES, MAX_VEHICLE_SEATS, MAX_WAITLIST_PASSENGERS
 
 if TYPE_CHECKING:
     from typing import Self
@@ -19,7 +20,9 @@ if TYPE_CHECKING:
 
 CityId = NewType('CityId', UUID)
 OwnerId = NewType('OwnerId', UserId)
+RideAlertId = NewType('RideAlertId', UUID)
 RideId = NewType('RideId', UUID)
+RideSeriesId = NewType('RideSeriesId', UUID)
 PassengerId = NewType('PassengerId', UserId)
 
 
@@ -29,6 +32,9 @@ class City:
 
     id: CityId
     name: str
+    latitude: float | None = None
+    longitude: float | None = None
+    popularity: int = 0  # rank of suggestions
 
 
 @dataclass(frozen=True, slots=True)
@@ -43,6 +49,18 @@ class Passenger:
             raise domain_errs.SeatsBookedError
 
 
+@dataclass(frozen=True, slots=True)
+class WaitlistEntry:
+    """A user waiting for seats of a full ride."""
+
+    id: PassengerId
+    seats_requested: int
+
+    def __post_init__(self) -> None:
+        if self.seats_requested <= 0:
+            raise domain_errs.SeatsBookedError
+
+
 class Currency(StrEnum):
     """Available currencies."""
 
@@ -83,6 +101,44 @@ class RouteVO:
             raise ValueError(msg)
 
 
+@dataclass(frozen=True, slots=True)
+class RecurrenceVO:
+    """Departures of a ride series.
+
+    Rides depart at the time of the first departure on the weekdays (ISO, 1 is
+    Monday) from its day till the day until inclusive, with its UTC offset.
+    """
+
+    first_departure_time: datetime
+    until: date
+    weekdays: frozenset[int]
+
+    def __post_init__(self) -> None:
+        if not self.weekdays or not self.weekdays <= set(range(1, 8)):
+            msg = 'Weekdays must be from 1 to 7'
+            raise ValueError(msg)
+
+    def get_departure_times(self) -> list[datetime]:
+        """Return the departure times in order.
+
+        Raise:
+            - RideSeriesSizeError, if there are no departures or over MAX_SERIES_RIDES;
+        """
+        departure_times: list[datetime] = []
+        for offset in range((self.until - self.first_departure_time.date()).days + 1):
+            departure_time = self.first_departure_time + timedelta(days=offset)
+            if departure_time.isoweekday() not in self.weekdays:
+                continue
+
+            if len(departure_times) == MAX_SERIES_RIDES:
+                raise domain_errs.RideSeriesSizeError(max_rides=MAX_SERIES_RIDES)
+            departure_times.append(departure_time)
+
+        if not departure_times:
+            raise domain_errs.RideSeriesSizeError(max_rides=MAX_SERIES_RIDES)
+        return departure_times
+
+
 class Ride(Entity):
     """A ride.
 
@@ -100,8 +156,12 @@ class Ride(Entity):
         '_price',
         '_route',
         '_seats_number',
+        '_series_id',
+        '_waitlist',
     )
 
+    _changed_markers = ('is_cancelled', 'passengers_added', 'passengers_removed', 'waitlist_added', 'waitlist_removed')
+
     def __init__(
         self,
         *,
@@ -114,6 +174,8 @@ class Ride(Entity):
         price: PriceVO,
         route: RouteVO,
         seats_number: int,
+        series_id: RideSeriesId | None,
+        waitlist: list[WaitlistEntry],
         _for_creating: bool = False,
     ) -> None:
         self._description = description
@@ -122,6 +184,8 @@ class Ride(Entity):
         self._owner_id = owner_id
         self._passengers = passengers
         self._route = route
+        self._series_id = series_id
+        self._waitlist = waitlist  # in the order of joining
 
         if not _for_creating:  # i.e. just initializing, validation not required
             self._departure_time = departure_time
@@ -138,11 +202,12 @@ class Ride(Entity):
     def create(cls, params: CreateRideParams) -> Self:
         """Create a new ride.
 
-        For new rides passengers are always empty.
+        For new rides passengers and waitlist are always empty.
         """
-        id = RideId(uuid4())
+        id = RideId(uuid7())
         is_cancelled = False
         passengers: list[Passenger] = []
+        waitlist: list[WaitlistEntry] = []
 
         return cls(
             departure_time=params.departure_time,
@@ -154,6 +219,8 @@ class Ride(Entity):
             price=params.price,
             route=params.route,
             seats_number=params.seats_number,
+            series_id=params.series_id,
+            waitlist=waitlist,
             _for_creating=True,
         )
 
@@ -172,9 +239,13 @@ class Ride(Entity):
         if self._passengers:
             raise domain_errs.DisallowedToChangeError
 
-        if value < datetime.now(UTC) + timedelta(hours=1):
+        now = datetime.now(UTC)
+        if value < now + timedelta(hours=1):
             msg = 'Departure time has to be at least an hour later than the current time'
             raise ValueError(msg)
+        if value > now + timedelta(days=MAX_DEPARTURE_DAYS):
+            msg = f'Departure time has to be within {MAX_DEPARTURE_DAYS} days'
+            raise ValueError(msg)
 
         self._departure_time = value
 
@@ -271,8 +342,18 @@ class Ride(Entity):
 
         self._seats_number = value
 
+    @property
+    def series_id(self) -> RideSeriesId | None:
+        """Return series_id, rides of a series are changed at once."""
+        return self._series_id
+
+    @property
+    def waitlist(self) -> list[WaitlistEntry]:
+        """Return waitlist."""
+        return self._waitlist
+
     def add_passenger(self, passenger: Passenger) -> None:
-        """Add the passenger to the ride."""
+        """Add the passenger to the ride. A waitlisted user leaves the waitlist."""
         if passenger.seats_booked > self.seats_available:
             raise domain_errs.RideIsFullError
 
@@ -285,7 +366,13 @@ class Ride(Entity):
 
         self._passengers.append(passenger)
 
-        self._changed_fields.add('passengers_added')
+        self._mark_changed('passengers_added')
+
+        for idx, entry in enumerate(self._waitlist):
+            if entry.id == passenger.id:
+                del self._waitlist[idx]
+                self._mark_changed('waitlist_removed')
+                break
 
     def cancel(self) -> None:
         """Cancel the ride."""
@@ -293,7 +380,69 @@ class Ride(Entity):
             raise domain_errs.RideCantBeCancelledError
 
         self._is_cancelled = True
-        self._changed_fields.add('is_cancelled')
+        self._mark_changed('is_cancelled')
+
+    def join_waitlist(self, entry: WaitlistEntry) -> None:
+        """Add the user to the end of the waitlist of the ride."""
+        if entry.seats_requested <= self.seats_available:
+            raise domain_errs.RideIsntFullError
+
+        if entry.seats_requested > self.seats_number:
+            raise domain_errs.WaitlistSeatsError
+
+        if self.owner_id == entry.id:
+            raise domain_errs.OwnerCantBePassengerError
+
+        for p in self._passengers:
+            if p.id == entry.id:
+                raise domain_errs.UserAlreadyIsPassengerError
+
+        for e in self._waitlist:
+            if e.id == entry.id:
+                raise domain_errs.UserAlreadyIsWaitlistedError
+
+        if len(self._waitlist) >= MAX_WAITLIST_PASSENGERS:
+            raise domain_errs.WaitlistIsFullError
+
+        self._waitlist.append(entry)
+
+        self._mark_changed('waitlist_added')
+
+    def leave_waitlist(self, id: PassengerId) -> None:
+        """Remove the user from the waitlist of the ride."""
+        for idx, e in enumerate(self._waitlist):
+            if e.id == id:
+                del self._waitlist[idx]
+                break
+        else:
+            raise domain_errs.UserIsntWaitlistedError
+
+        self._mark_changed('waitlist_removed')
+
+    def promote_waitlisted(self) -> list[Passenger]:
+        """Turn waitlisted users into passengers while seats are available. Return the
+        new passengers.
+
+        Users are promoted in the order of joining, the ones requesting more seats
+        than available are skipped, so they don't hold up the smaller requests.
+        """
+        promoted: list[Passenger] = []
+        seats_available = self.seats_available
+        waitlist: list[WaitlistEntry] = []
+        for entry in self._waitlist:
+            if entry.seats_requested <= seats_available:
+                promoted.append(Passenger(id=entry.id, seats_booked=entry.seats_requested))
+                seats_available -= entry.seats_requested
+            else:
+                waitlist.append(entry)
+
+        if promoted:
+            self._passengers.extend(promoted)
+            self._waitlist[:] = waitlist
+            self._mark_changed('passengers_added')
+            self._mark_changed('waitlist_removed')
+
+        return promoted
 
     def remove_passenger(self, id: PassengerId) -> None:
         """Remove the passenger from the ride."""
@@ -304,4 +453,22 @@ class Ride(Entity):
         else:
             raise domain_errs.UserIsntPassengerError
 
-        self._changed_fields.add('passengers_removed')
+        self._mark_changed('passengers_removed')
+
+
+@dataclass(frozen=True, slots=True)
+class RideAlert:
+    """A subscription of a user to rides of the route departing on the day, which
+    have seats available, optionally up to the max price.
+    """
+
+    day: date  # of departure in UTC
+    id: RideAlertId
+    max_price: PriceVO | None
+    route: RouteVO
+    user_id: UserId
+
+    @classmethod
+    def create(cls, day: date, max_price: PriceVO | None, route: RouteVO, user_id: UserId) -> Self:
+        """Create a new alert."""
+        return cls(day=day, id=RideAlertId(uuid7()), max_price=max_price, route=route, user_id=user_id)
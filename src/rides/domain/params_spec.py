@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from datetime import datetime
 
-    from .models import OwnerId, PriceVO, RouteVO
+    from .models import OwnerId, PriceVO, RideSeriesId, RouteVO
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,3 +19,15 @@ class CreateRideParams:
     price: PriceVO
     route: RouteVO
     seats_number: int
+    series_id: RideSeriesId | None
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateRideSeriesParams:
+    """Params for ride series update, only the fields to update are set."""
+
+    fields_to_update: tuple[str, ...]
+
+    description: str | None = None
+    price: PriceVO | None = None
+    seats_number: int | None = None
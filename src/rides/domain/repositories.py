@@ -3,9 +3,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Protocol
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
 
-    from .models import City, CityId, Ride, RideId
+    from users import UserId
+
+    from .models import City, CityId, OwnerId, Ride, RideAlert, RideAlertId, RideId, RideSeriesId
+    from .params_spec import UpdateRideSeriesParams
 
 
 class RideRepository(Protocol):
@@ -14,6 +17,18 @@ class RideRepository(Protocol):
     async def create(self, ride: Ride) -> None:
         """Create a new ride."""
 
+    async def create_many(self, rides: Sequence[Ride]) -> None:
+        """Create new rides at once."""
+
+    async def cancel_series(self, id: RideSeriesId, owner_id: OwnerId) -> list[Ride]:
+        """Cancel active rides of the owner's series at once, except the ones
+        Ride.cancel rejects. Return them cancelled, with passengers and without
+        waitlists.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to cancel;
+        """
+
     async def get_if_active(self, id: RideId) -> Ride:
         """Obtain the ride for the following update if it's active.
 
@@ -24,10 +39,41 @@ class RideRepository(Protocol):
     async def update(self, ride: Ride) -> None:
         """Save the ride changes."""
 
+    async def update_series(self, id: RideSeriesId, owner_id: OwnerId, params: UpdateRideSeriesParams) -> list[Ride]:
+        """Update active rides of the owner's series without passengers at once, the
+        ones with passengers can't be changed, see the Ride setters. Return them
+        updated.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to update;
+        """
+
+
+class RideAlertRepository(Protocol):
+    """A ride alert repository."""
+
+    async def count_by_user(self, user_id: UserId) -> int:
+        """Return the number of the user's alerts of today and later days."""
+
+    async def create(self, alert: RideAlert) -> None:
+        """Create a new alert."""
+
+    async def delete(self, id: RideAlertId, user_id: UserId) -> RideAlert:
+        """Delete the user's alert, return it.
+
+        Raise:
+            - RideAlertNotFoundError, if the user has no such alert;
+        """
+
 
 class CityRepository(Protocol):
     """A city repository."""
 
+    def list_nearby_ids(self, id: CityId, radius_km: float) -> list[CityId]:
+        """Return ids of the city and cities within the radius, the nearest first.
+        Only the city's id is returned if it has no coordinates or wasn't found.
+        """
+
     def list(self, ids: Iterable[CityId]) -> dict[CityId, City]:
         """Return cities mapping.
 
@@ -5,12 +5,15 @@ from typing import TYPE_CHECKING, Protocol
 if TYPE_CHECKING:
     from typing import Self
 
-    from .repositories import CityRepository, RideRepository
+    from shared.application.outbox import Outbox
+
+    from .repositories import CityRepository, RideAlertRepository, RideRepository
 
 
 class RideUnitOfWork(Protocol):
     """Unit of work for rides."""
 
+    outbox: Outbox
     ride_repo: RideRepository
 
     async def __aenter__(self) -> Self: ...
@@ -25,6 +28,7 @@ class RideCityUnitOfWork(Protocol):
     """Unit of work for rides with cities."""
 
     city_repo: CityRepository
+    outbox: Outbox
     ride_repo: RideRepository
 
     async def __aenter__(self) -> Self: ...
@@ -33,3 +37,18 @@ class RideCityUnitOfWork(Protocol):
 
     def commit(self) -> None:
         """Commit changes."""
+
+
+class RideAlertUnitOfWork(Protocol):
+    """Unit of work for ride alerts."""
+
+    alert_repo: RideAlertRepository
+    city_repo: CityRepository
+    outbox: Outbox
+
+    async def __aenter__(self) -> Self: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...  # type: ignore[no-untyped-def]  # noqa: ANN001
+
+    def commit(self) -> None:
+        """Commit changes."""
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from shared.errors import ProjectError
 
 
@@ -80,3 +82,85 @@ class SeatsBookedError(ProjectError):
 
     code = None
     detail = 'Seats must be >= 1'
+
+
+class UserAlreadyIsWaitlistedError(ProjectError):
+    """Can't join the waitlist twice."""
+
+    code = 11
+    detail = 'User is already in the waitlist of this ride'
+
+
+class UserIsntWaitlistedError(ProjectError):
+    """Can't leave the waitlist that isn't joined."""
+
+    code = 12
+    detail = "User isn't in the waitlist"
+
+
+class RideIsntFullError(ProjectError):
+    """The seats can be booked right away."""
+
+    code = 13
+    detail = 'The ride has enough seats available, book it instead'
+
+
+class WaitlistIsFullError(ProjectError):
+    """Too many users are waiting for seats."""
+
+    code = 14
+    detail = 'The waitlist of the ride is full'
+
+
+class WaitlistSeatsError(ProjectError):
+    """More seats requested than the ride has."""
+
+    code = None
+    detail = 'The seats requested must be less or equal to the seats number of the ride'
+
+
+class RideAlertNotFoundError(ProjectError):
+    """No alert of the user was found."""
+
+    code = 15
+    detail = "The alert doesn't exist"
+
+
+class RideAlertsLimitError(ProjectError):
+    """Too many alerts of a user."""
+
+    code = 16
+
+    def __init__(self, max_alerts: int) -> None:
+        self.detail = f'A user can have at most {max_alerts} alerts'
+
+        super().__init__()
+
+
+class RideSeriesSizeError(ProjectError):
+    """The recurrence yields no rides or too many."""
+
+    code = 17
+
+    def __init__(self, max_rides: int) -> None:
+        self.detail = f'A series must have from 1 to {max_rides} rides'
+
+        super().__init__()
+
+
+class RideSeriesNotFoundError(ProjectError):
+    """No rides of the owner's series can be changed."""
+
+    code = 18
+    detail = "The series doesn't exist or has no upcoming rides to change"
+
+
+class ImportHeaderError(ProjectError):
+    """The CSV header of an import can't be read or lacks columns."""
+
+    code = 19
+
+    def __init__(self, columns: Iterable[str]) -> None:
+        self.detail = f'The CSV header must have the columns: {", ".join(columns)}'
+
+        super().__init__()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from dacite import from_dict
+
+from shared.errors import NotFoundError
+from users import get_in_memory_users_data
+
+from ...application.queries.complex_ride import ComplexRideDTO
+from ...constants import RIDE_COMPLEX_CACHE_KEY
+from .cached_sqlaclhemy_complex_ride import CachedPassenger, CachedPrice, CachedRide, CachedRoute
+
+if TYPE_CHECKING:
+    from shared.application.cache import Cache
+    from users import UserInMemoryStorage
+
+    from ...domain.models import RideId
+    from ...domain.repositories import CityRepository
+    from ..repositories.ride_in_memory import RideInMemoryStorage
+
+
+class CachedInMemoryComplexRideQuery:
+    """A query for full ride presentation. Rides and users are stored in memory.
+
+    Caching is kept, so the cost of (de)serialization is the same as with SQLAlchemy.
+    """
+
+    RIDE_CACHE_TIMEOUT = 60 * 60 * 24 * 2  # 2 days
+
+    def __init__(
+        self, storage: RideInMemoryStorage, cache: Cache, city_repo: CityRepository, user_storage: UserInMemoryStorage
+    ) -> None:
+        self._cache = cache
+        self._city_repo = city_repo
+        self._storage = storage
+        self._user_storage = user_storage
+
+    async def handle(self, ride_id: RideId) -> ComplexRideDTO:
+        """Handle the query.
+
+        Raise:
+            - shared.errors.NotFoundError, if the ride wasn't found;
+        """
+        ride = await self._get_ride(ride_id)
+        ride_dict = ride.model_dump()
+
+        cities_data = self._city_repo.list([ride.route.city_id_departure, ride.route.city_id_destination])
+        ride_dict['route']['city_name_departure'] = cities_data[ride.route.city_id_departure].name
+        ride_dict['route']['city_name_destination'] = cities_data[ride.route.city_id_destination].name
+
+        passengers_data = get_in_memory_users_data([p.id for p in ride.passengers], self._user_storage)
+        for p in ride_dict['passengers']:
+            p.update(passengers_data[p['id']])
+
+        return from_dict(ComplexRideDTO, ride_dict)
+
+    async def _get_ride(self, ride_id: RideId) -> CachedRide:
+        """Get the ride from cache or the storage."""
+        cache_key = RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id)
+        if cached_data := await self._cache.get(cache_key):
+            return CachedRide.model_validate_json(cached_data)
+
+        ride = self._storage.rides.get(ride_id)
+
+        if not ride:
+            raise NotFoundError
+
+        cached_ride = CachedRide(
+            created_at=ride.created_at,
+            departure_time=ride.departure_time,
+            description=ride.description,
+            id=ride.id,
+            is_cancelled=ride.is_cancelled,
+            owner_id=ride.owner_id,
+            passengers=[CachedPassenger(id=p.id, seats_booked=p.seats_booked) for p in ride.passengers],
+            price=CachedPrice(currency=ride.price.currency, value=ride.price.value),
+            route=CachedRoute(city_id_departure=ride.city_id_departure, city_id_destination=ride.city_id_destination),
+            seats_available=ride.seats_available,
+            seats_number=ride.seats_number,
+        )
+        await self._cache.set(cache_key, cached_ride.model_dump_json(), self.RIDE_CACHE_TIMEOUT)
+        return cached_ride
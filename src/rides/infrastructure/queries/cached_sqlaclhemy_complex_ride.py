@@ -2,6 +2,7 @@ from datetime import datetime
 
 from dacite import from_dict
 from pydantic import BaseModel
+from redis.asyncio import Redis
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
@@ -59,10 +60,11 @@ class CachedSQLAlchemyComplexRideQuery:
 
     RIDE_CACHE_TIMEOUT = 60 * 60 * 24 * 2  # 2 days
 
-    def __init__(self, db_session: AsyncSession, cache: Cache, city_repo: CityRepository) -> None:
+    def __init__(self, db_session: AsyncSession, cache: Cache, city_repo: CityRepository, redis_con: Redis) -> None:
         self._cache = cache
         self._city_repo = city_repo
         self._db_session = db_session
+        self._redis_con = redis_con  # for users data
 
     async def handle(self, ride_id: RideId) -> ComplexRideDTO:
         """Handle the query.
@@ -77,7 +79,7 @@ class CachedSQLAlchemyComplexRideQuery:
         ride_dict['route']['city_name_departure'] = cities_data[ride.route.city_id_departure].name
         ride_dict['route']['city_name_destination'] = cities_data[ride.route.city_id_destination].name
 
-        passengers_data = await get_users_data([p.id for p in ride.passengers], self._db_session)
+        passengers_data = await get_users_data([p.id for p in ride.passengers], self._db_session, self._redis_con)
         for p in ride_dict['passengers']:
             p.update(passengers_data[p['id']])
 
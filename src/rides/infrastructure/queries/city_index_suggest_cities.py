@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ...application.queries.suggest_cities import SuggestedCityDTO
+
+if TYPE_CHECKING:
+    from ..repositories.city_index import CityIndex
+
+
+class CityIndexSuggestCitiesQuery:
+    """A query for cities autocomplete based on the prefix index of CityIndex."""
+
+    def __init__(self, index: CityIndex) -> None:
+        self._index = index
+
+    async def handle(self, text: str, limit: int) -> list[SuggestedCityDTO]:
+        """Handle the query."""
+        return [SuggestedCityDTO(id=city.id, name=city.name) for city in self._index.suggest(text, limit)]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from itertools import batched
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+    from datetime import datetime
+
+    from ...application.queries.export_rows import ExportFilterDTO
+    from ..repositories.ride_in_memory import RideInMemoryModel, RideInMemoryStorage
+
+
+class InMemoryExportRowsQuery:
+    """A query for analytics exports over a snapshot of the stored rides."""
+
+    CHUNK_SIZE = 10_000
+
+    def __init__(self, storage: RideInMemoryStorage) -> None:
+        self._storage = storage
+
+    async def handle(self, export_filter: ExportFilterDTO) -> AsyncIterator[Sequence[tuple[object, ...]]]:
+        """Handle the query."""
+        rides = list(self._storage.rides.values())  # the storage may change between the chunks
+        get_rows = self._get_passengers_rows if export_filter.table == 'passengers' else self._get_rides_rows
+        for chunk in batched(get_rows(rides, export_filter), self.CHUNK_SIZE, strict=False):
+            yield chunk
+
+    @staticmethod
+    def _get_rides_rows(rides: list[RideInMemoryModel], export_filter: ExportFilterDTO) -> Iterator[tuple[object, ...]]:
+        for ride in rides:
+            if _is_exported(ride.created_at, export_filter):
+                yield (
+                    ride.city_id_departure,
+                    ride.city_id_destination,
+                    ride.created_at,
+                    ride.departure_time,
+                    ride.description,
+                    ride.id,
+                    ride.is_cancelled,
+                    ride.owner_id,
+                    ride.price.currency,
+                    ride.price.value,
+                    ride.seats_available,
+                    ride.seats_number,
+                    ride.series_id,
+                )
+
+    @staticmethod
+    def _get_passengers_rows(
+        rides: list[RideInMemoryModel], export_filter: ExportFilterDTO
+    ) -> Iterator[tuple[object, ...]]:
+        for ride in rides:
+            for passenger in ride.passengers:
+                created_at = ride.passengers_created_at[passenger.id]
+                if _is_exported(created_at, export_filter):
+                    yield created_at, passenger.id, ride.departure_time, ride.id, passenger.seats_booked
+
+
+def _is_exported(created_at: datetime, export_filter: ExportFilterDTO) -> bool:
+    since = export_filter.since
+    return (since is None or created_at >= since) and created_at < export_filter.until
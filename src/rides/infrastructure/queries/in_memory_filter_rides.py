@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from heapq import merge
+from typing import TYPE_CHECKING
+
+from ...application.queries.filter_rides import FilteredRidesDTO, PriceDTO
+from ..repositories.ride_in_memory import MIN_RIDE_ID
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from datetime import datetime
+
+    from ...application.queries.filter_rides import RidesFilterDTO
+    from ...domain.models import CityId, RideId
+    from ..repositories.ride_in_memory import RideInMemoryStorage
+
+
+class InMemoryFilterRidesQuery:
+    """A query for rides filtering. Rides of routes are merged by departure time."""
+
+    def __init__(self, storage: RideInMemoryStorage) -> None:
+        self._storage = storage
+
+    async def handle(self, rides_filter: RidesFilterDTO) -> list[FilteredRidesDTO]:
+        """Handle the query."""
+        routes = [
+            (departure, destination)
+            for departure in rides_filter.city_ids_departure
+            for destination in rides_filter.city_ids_destination
+            if departure != destination
+        ]
+        rides = [ride for _, ride in merge(*(self._filter_route(route, rides_filter) for route in routes))]
+
+        if rides_filter.sort_by == 'price':
+            rides.sort(key=lambda ride: (ride.price.currency, ride.price.value))  # stable, by departure time then
+        return rides
+
+    def _filter_route(
+        self, route: tuple[CityId, CityId], rides_filter: RidesFilterDTO
+    ) -> Iterator[tuple[tuple[datetime, RideId], FilteredRidesDTO]]:
+        """Yield rides of the route by departure time."""
+        index = self._storage.route_index.get(route, [])
+        rides = self._storage.rides
+        max_price = rides_filter.max_price
+
+        for idx in range(bisect_left(index, (rides_filter.departure_time_from, MIN_RIDE_ID)), len(index)):
+            departure_time, id = index[idx]
+            if departure_time >= rides_filter.departure_time_to:
+                break
+
+            ride = rides[id]
+            if ride.is_cancelled or ride.seats_available < rides_filter.min_seats_available:
+                continue
+            if max_price and (ride.price.currency != max_price.currency or ride.price.value > max_price.value):
+                continue
+
+            yield (
+                index[idx],
+                FilteredRidesDTO(
+                    city_id_departure=route[0],
+                    city_id_destination=route[1],
+                    departure_time=departure_time,
+                    id=id,
+                    price=PriceDTO(currency=ride.price.currency, value=ride.price.value),
+                    seats_available=ride.seats_available,
+                    seats_number=ride.seats_number,
+                ),
+            )
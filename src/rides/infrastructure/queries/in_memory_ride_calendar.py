@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from ...application.queries.filter_rides import PriceDTO
+from ...application.queries.ride_calendar import CalendarDayDTO
+
+if TYPE_CHECKING:
+    from ...application.queries.ride_calendar import CalendarFilterDTO
+    from ..repositories.ride_in_memory import RideInMemoryStorage
+
+
+class InMemoryRideCalendarQuery:
+    """A query for route calendars over route-days of the in-memory storage."""
+
+    def __init__(self, storage: RideInMemoryStorage) -> None:
+        self._storage = storage
+
+    async def handle(self, calendar_filter: CalendarFilterDTO) -> list[CalendarDayDTO]:
+        """Handle the query."""
+        route_days = self._storage.route_days.get(
+            (calendar_filter.city_id_departure, calendar_filter.city_id_destination), {}
+        )
+
+        calendar = []
+        for offset in range((calendar_filter.date_to - calendar_filter.date_from).days + 1):
+            date = calendar_filter.date_from + timedelta(days=offset)
+            if not (currencies := route_days.get(date)):
+                continue
+
+            calendar.append(
+                CalendarDayDTO(
+                    date=date,
+                    max_seats_available=max(day.max_seats_available for day in currencies.values()),
+                    min_prices=tuple(
+                        PriceDTO(currency=currency, value=currencies[currency].min_price_value)
+                        for currency in sorted(currencies)
+                    ),
+                    rides_count=sum(day.rides_count for day in currencies.values()),
+                )
+            )
+        return calendar
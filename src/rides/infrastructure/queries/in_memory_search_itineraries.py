@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .ride_connections import Connection, ConnectionsDay, estimate_arrival_time, get_day_bounds
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from ...application.queries.search_itineraries import ItinerariesFilterDTO, ItineraryDTO
+    from ..repositories.city_index import CityIndex
+    from ..repositories.ride_in_memory import RideInMemoryStorage
+    from .ride_connections import ConnectionsDays
+
+
+class InMemorySearchItinerariesQuery:
+    """A query for multi-leg itineraries over connections of the in-memory rides."""
+
+    def __init__(self, storage: RideInMemoryStorage, city_index: CityIndex, days: ConnectionsDays) -> None:
+        self._city_index = city_index
+        self._days = days
+        self._storage = storage
+
+    async def handle(self, itineraries_filter: ItinerariesFilterDTO) -> list[ItineraryDTO]:
+        """Handle the query."""
+        day = itineraries_filter.departure_date
+        if (connections := self._days.get(day)) is None:
+            connections = ConnectionsDay(self._list_connections(day))
+            self._days.set(day, connections)
+
+        return connections.search(itineraries_filter)
+
+    def _list_connections(self, day: date) -> list[Connection]:
+        """Return active rides with available seats departing on the day."""
+        from_, to = get_day_bounds(day)
+        connections = []
+        for ride in self._storage.rides.values():
+            if not from_ <= ride.departure_time < to or ride.is_cancelled or not ride.seats_available:
+                continue
+
+            arrival_time = estimate_arrival_time(
+                self._city_index, ride.city_id_departure, ride.city_id_destination, ride.departure_time
+            )
+            if arrival_time is not None:
+                connections.append(
+                    Connection(
+                        arrival_time=arrival_time,
+                        city_id_departure=ride.city_id_departure,
+                        city_id_destination=ride.city_id_destination,
+                        currency=ride.price.currency,
+                        departure_time=ride.departure_time,
+                        id=ride.id,
+                        price=ride.price.value,
+                        seats_available=ride.seats_available,
+                    )
+                )
+        return connections
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+from ...application.queries.filter_rides import PriceDTO
+from ...application.queries.user_rides import RideCardDTO
+from ...domain.models import OwnerId, PassengerId
+from ..repositories.ride_in_memory import MAX_RIDE_ID
+
+if TYPE_CHECKING:
+    from ...application.queries.user_rides import UserRidesFilterDTO
+    from ..repositories.ride_in_memory import RideInMemoryStorage
+
+
+class InMemoryUserRidesQuery:
+    """A query for lists of the user's rides over the owner and passenger indexes."""
+
+    def __init__(self, storage: RideInMemoryStorage) -> None:
+        self._storage = storage
+
+    async def handle(self, rides_filter: UserRidesFilterDTO) -> list[RideCardDTO]:
+        """Handle the query."""
+        if rides_filter.role == 'owner':
+            index = self._storage.owner_index.get(OwnerId(rides_filter.user_id), [])
+        else:
+            index = self._storage.passenger_index.get(PassengerId(rides_filter.user_id), [])
+
+        cursor = rides_filter.cursor
+        now_pos = bisect_right(index, (rides_filter.now, MAX_RIDE_ID))
+        if rides_filter.period == 'upcoming':
+            start = max(now_pos, bisect_right(index, (cursor.departure_time, cursor.id))) if cursor else now_pos
+            entries = index[start : start + rides_filter.limit]
+        else:
+            end = min(now_pos, bisect_left(index, (cursor.departure_time, cursor.id))) if cursor else now_pos
+            entries = index[max(end - rides_filter.limit, 0) : end][::-1]
+
+        cards = []
+        for _, id in entries:
+            ride = self._storage.rides[id]
+            seats_booked = None
+            if rides_filter.role == 'passenger':
+                seats_booked = next(p.seats_booked for p in ride.passengers if p.id == rides_filter.user_id)
+
+            cards.append(
+                RideCardDTO(
+                    city_id_departure=ride.city_id_departure,
+                    city_id_destination=ride.city_id_destination,
+                    departure_time=ride.departure_time,
+                    id=ride.id,
+                    is_cancelled=ride.is_cancelled,
+                    price=PriceDTO(currency=ride.price.currency, value=ride.price.value),
+                    seats_available=ride.seats_available,
+                    seats_booked=seats_booked,
+                    seats_number=ride.seats_number,
+                )
+            )
+        return cards
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, NamedTuple
+
+from ...application.queries.filter_rides import PriceDTO
+from ...application.queries.search_itineraries import ItineraryDTO, ItineraryLegDTO
+from ...constants import AVG_RIDE_SPEED_KMH, MAX_ITINERARY_LEGS, MIN_TRANSFER_MINUTES, ROAD_DISTANCE_FACTOR
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date
+
+    from ...application.queries.search_itineraries import ItinerariesFilterDTO
+    from ...domain.models import CityId, Currency, RideId
+    from ..repositories.city_index import CityIndex
+
+
+@dataclass(frozen=True, slots=True)
+class Connection:
+    """A ride as an edge of the time-expanded graph."""
+
+    arrival_time: datetime
+    city_id_departure: CityId
+    city_id_destination: CityId
+    currency: Currency
+    departure_time: datetime
+    id: RideId
+    price: int
+    seats_available: int
+
+
+# Keys of the departure and destination cities, numbers of the cities and the currency,
+# arrival and departure timestamps, price, seats available
+type _Row = tuple[int, int, int, int, int, float, float, int, int]
+
+
+class _Label(NamedTuple):
+    """A journey from the departure city, legs are linked by parents."""
+
+    arrival: float
+    price: int
+    legs: int
+    connection: int
+    parent: _Label | None
+
+
+def estimate_arrival_time(
+    city_index: CityIndex, city_id_departure: CityId, city_id_destination: CityId, departure_time: datetime
+) -> datetime | None:
+    """Return the arrival time by the distance between the cities to the minute,
+    None if it's unknown.
+    """
+    distance_km = city_index.get_distance_km(city_id_departure, city_id_destination)
+    if distance_km is None:
+        return None
+    return departure_time + timedelta(minutes=round(distance_km * ROAD_DISTANCE_FACTOR / AVG_RIDE_SPEED_KMH * 60))
+
+
+class ConnectionsDay:
+    """Rides departing on a day, searched for itineraries with the Connection Scan
+    Algorithm.
+
+    Connections are sorted by departure time and kept in parallel arrays, cities
+    and currencies are numbered. Per day the first connection of every city and
+    the cities with connections to every city are precomputed: a search starts at
+    the first connection of the departure city and walks the latter back from the
+    destination city for the minimum number of legs from every city to it.
+
+    A scan keeps labels of reached cities: Pareto sets of journeys by arrival
+    time, price and the number of legs, per currency, since prices of different
+    ones aren't comparable. A connection extends the labels of its departure city
+    arriving at least MIN_TRANSFER_MINUTES earlier. Labels which can't reach the
+    destination city within MAX_ITINERARY_LEGS or are dominated by found
+    itineraries are dropped.
+    """
+
+    __slots__ = ('_city_numbers', '_connections', '_currency_count', '_first_by_city', '_rows', '_sources')
+
+    def __init__(self, connections: Iterable[Connection]) -> None:
+        self._connections = sorted(connections, key=lambda c: (c.departure_time, c.id))
+        self._city_numbers: dict[CityId, int] = {}
+        currency_numbers: dict[Currency, int] = {}
+        for c in self._connections:
+            self._city_numbers.setdefault(c.city_id_departure, len(self._city_numbers))
+            self._city_numbers.setdefault(c.city_id_destination, len(self._city_numbers))
+            currency_numbers.setdefault(c.currency, len(currency_numbers))
+
+        cities, self._currency_count = self._city_numbers, len(currency_numbers)
+        self._rows = [
+            self._to_row(c, cities[c.city_id_departure], cities[c.city_id_destination], currency_numbers[c.currency])
+            for c in self._connections
+        ]
+
+        self._first_by_city: dict[int, int] = {}
+        self._sources: list[set[int]] = [set() for _ in cities]
+        for idx, (_, _, departure, destination, *_) in enumerate(self._rows):
+            self._first_by_city.setdefault(departure, idx)
+            self._sources[destination].add(departure)
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def search(self, itineraries_filter: ItinerariesFilterDTO) -> list[ItineraryDTO]:
+        """Return the best itineraries ordered by arrival time, price and transfers."""
+        origin = self._city_numbers.get(itineraries_filter.city_id_departure)
+        target = self._city_numbers.get(itineraries_filter.city_id_destination)
+        if origin is None or target is None or origin == target or (start := self._first_by_city.get(origin)) is None:
+            return []
+
+        max_legs = self._get_max_legs(target)
+        min_seats, currencies = itineraries_filter.min_seats_available, self._currency_count
+        slack = MIN_TRANSFER_MINUTES * 60
+        bags: list[list[_Label] | None] = [None] * (len(self._city_numbers) * currencies)
+        max_legs[origin] = 0  # journeys back to the departure city are useless
+
+        for idx in range(start, len(self._rows)):
+            departure_key, destination_key, departure, destination, currency, arrival, departure_time, price, seats = (
+                self._rows[idx]
+            )
+            if seats < min_seats or not (legs_limit := max_legs[destination]):
+                continue
+
+            if departure == origin:
+                candidates = [_Label(arrival, price, 1, idx, None)]
+            elif bag := bags[departure_key]:
+                latest = departure_time - slack
+                candidates = [
+                    _Label(arrival, label.price + price, label.legs + 1, idx, label)
+                    for label in bag
+                    if label.arrival <= latest and label.legs < legs_limit
+                ]
+            else:
+                continue
+
+            found = bags[target * currencies + currency]
+            for candidate in candidates:
+                if destination == target or not found or not self._dominates(found, candidate):
+                    if (destination_bag := bags[destination_key]) is None:
+                        destination_bag = bags[destination_key] = []
+                    self._insert(destination_bag, candidate)
+
+        labels = [label for currency in range(currencies) for label in bags[target * currencies + currency] or ()]
+        labels.sort(key=lambda label: (label.arrival, label.price, label.legs))
+        return [self._to_itinerary(label) for label in labels[: itineraries_filter.limit]]
+
+    def _get_max_legs(self, target: int) -> list[int]:
+        """Return the max number of legs of a journey to every city to reach the
+        target one within MAX_ITINERARY_LEGS, 0 if it can't, regardless of time.
+        """
+        max_legs, frontier = [0] * len(self._city_numbers), {target}
+        max_legs[target] = MAX_ITINERARY_LEGS
+        for legs_left in range(1, MAX_ITINERARY_LEGS):
+            frontier = {source for city in frontier for source in self._sources[city] if not max_legs[source]}
+            for source in frontier:
+                max_legs[source] = MAX_ITINERARY_LEGS - legs_left
+        return max_legs
+
+    def _to_row(self, c: Connection, departure: int, destination: int, currency: int) -> _Row:
+        """Return the connection data for the scan. Labels are stored by keys of the
+        city and the currency.
+        """
+        return (
+            departure * self._currency_count + currency,
+            destination * self._currency_count + currency,
+            departure,
+            destination,
+            currency,
+            c.arrival_time.timestamp(),
+            c.departure_time.timestamp(),
+            c.price,
+            c.seats_available,
+        )
+
+    @staticmethod
+    def _dominates(labels: Iterable[_Label], candidate: _Label) -> bool:
+        return any(
+            label.arrival <= candidate.arrival and label.price <= candidate.price and label.legs <= candidate.legs
+            for label in labels
+        )
+
+    @classmethod
+    def _insert(cls, bag: list[_Label], candidate: _Label) -> None:
+        """Add the label unless it's dominated, dropping the ones it dominates."""
+        if cls._dominates(bag, candidate):
+            return
+        bag[:] = [label for label in bag if not cls._dominates((candidate,), label)]
+        bag.append(candidate)
+
+    def _to_itinerary(self, label: _Label) -> ItineraryDTO:
+        legs: list[ItineraryLegDTO] = []
+        current: _Label | None = label
+        while current is not None:
+            c = self._connections[current.connection]
+            legs.append(
+                ItineraryLegDTO(
+                    arrival_time=c.arrival_time,
+                    city_id_departure=c.city_id_departure,
+                    city_id_destination=c.city_id_destination,
+                    departure_time=c.departure_time,
+                    id=c.id,
+                    price=PriceDTO(currency=c.currency, value=c.price),
+                    seats_available=c.seats_available,
+                )
+            )
+            current = current.parent
+
+        legs.reverse()
+        return ItineraryDTO(
+            arrival_time=legs[-1].arrival_time,
+            departure_time=legs[0].departure_time,
+            legs=tuple(legs),
+            price=PriceDTO(currency=legs[0].price.currency, value=label.price),
+            transfers=len(legs) - 1,
+        )
+
+
+class ConnectionsDays:
+    """Recently built ConnectionsDay of dates, shared by requests.
+
+    A day is rebuilt once it's older than the TTL, so bookings and new rides are
+    seen with that delay, the booking itself checks seats anyway.
+    """
+
+    def __init__(self, ttl_secs: float, max_days: int = 32) -> None:
+        self._days: OrderedDict[date, tuple[float, ConnectionsDay]] = OrderedDict()
+        self._max_days = max_days
+        self._ttl_secs = ttl_secs
+
+    def get(self, day: date) -> ConnectionsDay | None:
+        """Return connections of the date, None if they're missing or expired."""
+        if (entry := self._days.get(day)) is None or entry[0] < time.monotonic():
+            return None
+        self._days.move_to_end(day)
+        return entry[1]
+
+    def set(self, day: date, connections: ConnectionsDay) -> None:
+        """Store connections of the date, the least recently used dates are evicted."""
+        self._days[day] = (time.monotonic() + self._ttl_secs, connections)
+        self._days.move_to_end(day)
+        while len(self._days) > self._max_days:
+            self._days.popitem(last=False)
+
+
+def get_day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Return the start and the end of the day in UTC."""
+    from_ = datetime.combine(day, datetime.min.time(), tzinfo=UTC)
+    return from_, from_ + timedelta(days=1)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from ...application.queries.export_rows import EXPORT_COLUMNS
+from ..repositories.ride_sqlalchemy import PassengerSQLAlchemyModel, RideSQLAlchemyModel
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from ...application.queries.export_rows import ExportFilterDTO, ExportTable
+
+MODELS: dict[ExportTable, type[PassengerSQLAlchemyModel | RideSQLAlchemyModel]] = {
+    'passengers': PassengerSQLAlchemyModel,
+    'rides': RideSQLAlchemyModel,
+}
+
+
+class SQLAlchemyExportRowsQuery:
+    """A query for analytics exports of rides and passengers.
+
+    Rows are read by a server-side cursor, PARTITION_SIZE rows at a time, so memory
+    doesn't grow with the table. The range of created_at is found by its BRIN
+    indexes, so incremental exports read the recent blocks only. The query has a
+    session of its own, since it's streamed after the request's dependencies exit.
+    """
+
+    PARTITION_SIZE = 10_000
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+
+    async def handle(self, export_filter: ExportFilterDTO) -> AsyncIterator[Sequence[tuple[object, ...]]]:
+        """Handle the query."""
+        model = MODELS[export_filter.table]
+        q = (
+            select(*(getattr(model, column) for column in EXPORT_COLUMNS[export_filter.table]))
+            .where(model.created_at < export_filter.until)
+            .execution_options(yield_per=self.PARTITION_SIZE)
+        )
+        if export_filter.since:
+            q = q.where(model.created_at >= export_filter.since)
+
+        async with self._session_factory() as session:
+            async for partition in (await session.stream(q)).partitions():
+                yield [tuple(row) for row in partition]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime, time, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import select
 
@@ -9,23 +8,46 @@ from ...application.queries.filter_rides import FilteredRidesDTO, PriceDTO
 from ..repositories.ride_sqlalchemy import RideSQLAlchemyModel as Model
 
 if TYPE_CHECKING:
+    from sqlalchemy import Select
     from sqlalchemy.ext.asyncio import AsyncSession
 
-    from ...application.use_cases.filter_rides import FilterParamsDTO
+    from ...application.queries.filter_rides import RidesFilterDTO
 
 
 class SQLAlchemyFilterRidesQuery:
-    """A query for rides filtering."""
+    """A query for rides filtering.
+
+    All routes are queried with one statement. Every filter variant is an index-only
+    scan of ix_ride_active_route_departure: the IN lists of both cities and the
+    departure time range are its keys, the other columns are included.
+    """
 
     def __init__(self, db_session: AsyncSession) -> None:
         self._db_session = db_session
 
-    async def handle(self, params: FilterParamsDTO) -> list[FilteredRidesDTO]:
+    async def handle(self, rides_filter: RidesFilterDTO) -> list[FilteredRidesDTO]:
         """Handle the query."""
-        from_ = datetime.combine(params.departure_date, time(0, 0, tzinfo=UTC))
-        to = from_ + timedelta(days=1)
+        rides = (await self._db_session.execute(self.get_statement(rides_filter))).all()
+
+        return [
+            FilteredRidesDTO(
+                city_id_departure=city_from,
+                city_id_destination=city_to,
+                departure_time=time,
+                id=id,
+                price=PriceDTO(currency=p_cur, value=p_val),
+                seats_available=seats_av,
+                seats_number=seats_num,
+            )
+            for city_from, city_to, time, id, p_cur, p_val, seats_av, seats_num in rides
+        ]
 
+    @staticmethod
+    def get_statement(rides_filter: RidesFilterDTO) -> Select[Any]:
+        """Return the statement of the filter, it's explained by benchmarks as well."""
         q = select(
+            Model.city_id_departure,
+            Model.city_id_destination,
             Model.departure_time,
             Model.id,
             Model.price_currency,
@@ -33,22 +55,17 @@ class SQLAlchemyFilterRidesQuery:
             Model.seats_available,
             Model.seats_number,
         ).where(
-            Model.city_id_departure == params.city_id_departure,
-            Model.city_id_destination == params.city_id_destination,
-            Model.departure_time >= from_,
-            Model.departure_time < to,
+            Model.city_id_departure.in_(rides_filter.city_ids_departure),
+            Model.city_id_destination.in_(rides_filter.city_ids_destination),
+            Model.departure_time >= rides_filter.departure_time_from,
+            Model.departure_time < rides_filter.departure_time_to,
             Model.is_cancelled == False,
-            Model.seats_available >= params.min_seats_available,
+            Model.seats_available >= rides_filter.min_seats_available,
         )
-        rides = (await self._db_session.execute(q)).all()
 
-        return [
-            FilteredRidesDTO(
-                departure_time=time,
-                id=id,
-                price=PriceDTO(currency=p_cur, value=p_val),
-                seats_available=seats_av,
-                seats_number=seats_num,
-            )
-            for time, id, p_cur, p_val, seats_av, seats_num in rides
-        ]
+        if max_price := rides_filter.max_price:
+            q = q.where(Model.price_currency == max_price.currency, Model.price_value <= max_price.value)
+
+        if rides_filter.sort_by == 'price':
+            return q.order_by(Model.price_currency, Model.price_value, Model.departure_time, Model.id)
+        return q.order_by(Model.departure_time, Model.id)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from itertools import groupby
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from ...application.queries.filter_rides import PriceDTO
+from ...application.queries.ride_calendar import CalendarDayDTO
+from ..repositories.ride_sqlalchemy import RouteDaySQLAlchemyModel as Model
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from ...application.queries.ride_calendar import CalendarFilterDTO
+
+
+class SQLAlchemyRideCalendarQuery:
+    """A query for route calendars.
+
+    Rows of route-days are read by the primary key range, rides aren't aggregated.
+    """
+
+    def __init__(self, db_session: AsyncSession) -> None:
+        self._db_session = db_session
+
+    async def handle(self, calendar_filter: CalendarFilterDTO) -> list[CalendarDayDTO]:
+        """Handle the query."""
+        q = (
+            select(Model.day, Model.max_seats_available, Model.min_price_value, Model.price_currency, Model.rides_count)
+            .where(
+                Model.city_id_departure == calendar_filter.city_id_departure,
+                Model.city_id_destination == calendar_filter.city_id_destination,
+                Model.day >= calendar_filter.date_from,
+                Model.day <= calendar_filter.date_to,
+            )
+            .order_by(Model.day, Model.price_currency)
+        )
+        route_days = (await self._db_session.execute(q)).all()
+
+        calendar = []
+        for date, rows in groupby(route_days, key=itemgetter(0)):
+            currencies = list(rows)
+            calendar.append(
+                CalendarDayDTO(
+                    date=date,
+                    max_seats_available=max(seats_av for _, seats_av, _, _, _ in currencies),
+                    min_prices=tuple(PriceDTO(currency=p_cur, value=p_val) for _, _, p_val, p_cur, _ in currencies),
+                    rides_count=sum(count for *_, count in currencies),
+                )
+            )
+        return calendar
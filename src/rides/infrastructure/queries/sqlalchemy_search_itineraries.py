@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from ..repositories.ride_sqlalchemy import RideSQLAlchemyModel as Model
+from .ride_connections import Connection, ConnectionsDay, estimate_arrival_time, get_day_bounds
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from ...application.queries.search_itineraries import ItinerariesFilterDTO, ItineraryDTO
+    from ..repositories.city_index import CityIndex
+    from .ride_connections import ConnectionsDays
+
+
+class SQLAlchemySearchItinerariesQuery:
+    """A query for multi-leg itineraries.
+
+    Connections of a day are loaded with one statement by the departure time range
+    and shared by requests till they expire, see ConnectionsDays.
+    """
+
+    def __init__(self, db_session: AsyncSession, city_index: CityIndex, days: ConnectionsDays) -> None:
+        self._city_index = city_index
+        self._db_session = db_session
+        self._days = days
+
+    async def handle(self, itineraries_filter: ItinerariesFilterDTO) -> list[ItineraryDTO]:
+        """Handle the query."""
+        day = itineraries_filter.departure_date
+        if (connections := self._days.get(day)) is None:
+            connections = await asyncio.to_thread(ConnectionsDay, await self._list_connections(day))
+            self._days.set(day, connections)
+
+        return connections.search(itineraries_filter)
+
+    async def _list_connections(self, day: date) -> list[Connection]:
+        """Return active rides with available seats departing on the day."""
+        from_, to = get_day_bounds(day)
+        q = select(
+            Model.city_id_departure,
+            Model.city_id_destination,
+            Model.departure_time,
+            Model.id,
+            Model.price_currency,
+            Model.price_value,
+            Model.seats_available,
+        ).where(
+            Model.departure_time >= from_,
+            Model.departure_time < to,
+            Model.is_cancelled == False,
+            Model.seats_available > 0,
+        )
+        rides = (await self._db_session.execute(q)).all()
+
+        connections = []
+        for city_from, city_to, time, id, p_cur, p_val, seats_av in rides:
+            arrival_time = estimate_arrival_time(self._city_index, city_from, city_to, time)
+            if arrival_time is not None:
+                connections.append(
+                    Connection(
+                        arrival_time=arrival_time,
+                        city_id_departure=city_from,
+                        city_id_destination=city_to,
+                        currency=p_cur,
+                        departure_time=time,
+                        id=id,
+                        price=p_val,
+                        seats_available=seats_av,
+                    )
+                )
+        return connections
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import literal, null, select, tuple_
+
+from ...application.queries.filter_rides import PriceDTO
+from ...application.queries.user_rides import RideCardDTO
+from ..repositories.ride_sqlalchemy import PassengerSQLAlchemyModel as Passenger
+from ..repositories.ride_sqlalchemy import RideSQLAlchemyModel as Ride
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from sqlalchemy import Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute
+    from sqlalchemy.sql.elements import SQLCoreOperations
+
+    from ...application.queries.user_rides import UserRidesFilterDTO
+    from ...domain.models import RideId
+
+
+class SQLAlchemyUserRidesQuery:
+    """A query for lists of the user's rides.
+
+    A page is one statement with keyset pagination, its cost doesn't grow with the
+    page number. Rides of an owner are an index-only scan of ix_ride_owner_departure.
+    Rides of a passenger are a scan of the primary key of passengers, which leads
+    with the passenger id and the departure time, joined to rides by their primary
+    key, so the join is pruned to the partitions of the page.
+    """
+
+    def __init__(self, db_session: AsyncSession) -> None:
+        self._db_session = db_session
+
+    async def handle(self, rides_filter: UserRidesFilterDTO) -> list[RideCardDTO]:
+        """Handle the query."""
+        rides = (await self._db_session.execute(self.get_statement(rides_filter))).all()
+
+        return [
+            RideCardDTO(
+                city_id_departure=city_from,
+                city_id_destination=city_to,
+                departure_time=time,
+                id=id,
+                is_cancelled=is_cancelled,
+                price=PriceDTO(currency=p_cur, value=p_val),
+                seats_available=seats_av,
+                seats_booked=seats_booked,
+                seats_number=seats_num,
+            )
+            for city_from, city_to, time, id, is_cancelled, p_cur, p_val, seats_av, seats_booked, seats_num in rides
+        ]
+
+    @staticmethod
+    def get_statement(rides_filter: UserRidesFilterDTO) -> Select[Any]:
+        """Return the statement of the filter."""
+        departure_time: InstrumentedAttribute[datetime]
+        id: InstrumentedAttribute[RideId]
+        if rides_filter.role == 'owner':
+            departure_time, id = Ride.departure_time, Ride.id
+            q = select(*_get_card_columns(null())).where(Ride.owner_id == rides_filter.user_id)
+        else:
+            departure_time, id = Passenger.ride_departure_time, Passenger.ride_id
+            q = (
+                select(*_get_card_columns(Passenger.seats_booked))
+                .select_from(Passenger)
+                .join(Ride, (Ride.id == Passenger.ride_id) & (Ride.departure_time == Passenger.ride_departure_time))
+                .where(Passenger.id == rides_filter.user_id)
+            )
+
+        key = tuple_(departure_time, id)
+        cursor = rides_filter.cursor
+        if rides_filter.period == 'upcoming':
+            q = q.where(departure_time > rides_filter.now).order_by(departure_time, id)
+            if cursor:
+                q = q.where(key > tuple_(literal(cursor.departure_time), literal(cursor.id)))
+        else:
+            q = q.where(departure_time <= rides_filter.now).order_by(departure_time.desc(), id.desc())
+            if cursor:
+                q = q.where(key < tuple_(literal(cursor.departure_time), literal(cursor.id)))
+
+        return q.limit(rides_filter.limit)
+
+
+def _get_card_columns(seats_booked: SQLCoreOperations[Any]) -> tuple[SQLCoreOperations[Any], ...]:
+    return (
+        Ride.city_id_departure,
+        Ride.city_id_destination,
+        Ride.departure_time,
+        Ride.id,
+        Ride.is_cancelled,
+        Ride.price_currency,
+        Ride.price_value,
+        Ride.seats_available,
+        seats_booked,
+        Ride.seats_number,
+    )
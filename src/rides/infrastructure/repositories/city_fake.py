@@ -1,36 +1,28 @@
-from __future__ import annotations
-
-from typing import TYPE_CHECKING
 from uuid import UUID
 
 from ...domain.models import City, CityId
-from ...errors import CityNotFoundError
-
-if TYPE_CHECKING:
-    from collections.abc import Iterable
-
-
-class FakeCityRepository:
-    """A repository with fake cities."""
-
-    _cities = (
-        City(id=CityId(UUID('00000000-0000-0000-0000-000000000000')), name='City A'),
-        City(id=CityId(UUID('00000000-0000-0000-0000-000000000001')), name='City B'),
-        City(id=CityId(UUID('00000000-0000-0000-0000-000000000002')), name='City 17'),
-    )
-
-    def list(self, ids: Iterable[CityId]) -> dict[CityId, City]:
-        """Return cities mapping.
-
-        Raise:
-            - CityNotFoundError, if at least one of specified cities wasn't found;
-        """
-        if set(ids) - {city.id for city in self._cities}:
-            raise CityNotFoundError
 
-        data = {}
-        for id_ in ids:
-            for city in self._cities:
-                if id_ == city.id:
-                    data[id_] = city
-        return data
+# Cities of the in-memory backend, the load benchmark uses their ids by default
+FAKE_CITIES = (
+    City(
+        id=CityId(UUID('00000000-0000-0000-0000-000000000000')),
+        name='City A',
+        latitude=55.676,
+        longitude=12.568,
+        popularity=3,
+    ),
+    City(
+        id=CityId(UUID('00000000-0000-0000-0000-000000000001')),
+        name='City B',
+        latitude=55.731,
+        longitude=12.363,
+        popularity=2,
+    ),
+    City(
+        id=CityId(UUID('00000000-0000-0000-0000-000000000002')),
+        name='City 17',
+        latitude=56.157,
+        longitude=10.211,
+        popularity=1,
+    ),
+)
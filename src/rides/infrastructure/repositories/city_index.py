@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import builtins
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from ...constants import MAX_CITY_SUGGESTIONS, MAX_NEARBY_CITIES
+from ...errors import CityNotFoundError
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+    from ...domain.models import City, CityId
+
+# Letters that don't decompose to ASCII ones with NFKD
+_LETTERS = str.maketrans({'æ': 'ae', 'đ': 'd', 'ð': 'd', '\u0131': 'i', 'ł': 'l', 'ø': 'o', 'œ': 'oe', 'þ': 'th'})
+_SEPARATORS = re.compile(r'[\W_]+')
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def normalize_city_name(text: str) -> str:
+    """Return the text for matching: case and diacritic insensitive, words are
+    separated by single spaces, e.g. 'Saint-Étienne' -> 'saint etienne'.
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold().translate(_LETTERS))
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _SEPARATORS.sub(' ', stripped).strip()
+
+
+def get_distance_km(lat_1: float, lon_1: float, lat_2: float, lon_2: float) -> float:
+    """Return the great-circle distance (haversine formula)."""
+    lat_1, lon_1, lat_2, lon_2 = map(math.radians, (lat_1, lon_1, lat_2, lon_2))
+    hav = math.sin((lat_2 - lat_1) / 2) ** 2 + math.cos(lat_1) * math.cos(lat_2) * math.sin((lon_2 - lon_1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(hav))
+
+
+class CityIndex:
+    """A city repository over an immutable snapshot of cities.
+
+    The snapshot is shared by all requests and replaced as a whole on reload, so
+    lookups are O(1), don't hit the DB and see a consistent version.
+
+    Suggestions use a sorted array of normalized names and their word suffixes
+    ('frankfurt am main', 'am main', 'main'), a prefix is a range found with
+    bisect. Cities are numbered by popularity, so the best matches of a range are
+    its smallest numbers. Top matches of prefixes with big ranges (short ones)
+    are precomputed.
+
+    Nearby cities are searched in a grid of GRID_CELL_DEG cells, only the cells
+    overlapping the bounding box of the radius are checked.
+    """
+
+    __slots__ = ('_cities', '_grid', '_keys', '_ranked', '_ranks', '_top_by_prefix', 'version')
+
+    GRID_CELL_DEG = 0.5  # ~55 km of latitude
+    SCAN_LIMIT = 256  # max range size scanned per query
+
+    def __init__(self, cities: Iterable[City], version: Hashable = None) -> None:
+        self._cities: dict[CityId, City] = {city.id: city for city in cities}
+        self.version = version
+
+        self._ranked = sorted(self._cities.values(), key=lambda city: (-city.popularity, city.name))
+        entries = sorted((key, rank) for rank, city in enumerate(self._ranked) for key in self._get_keys(city.name))
+        self._keys = [key for key, _ in entries]
+        self._ranks = array('I', [rank for _, rank in entries])
+        self._top_by_prefix: dict[str, tuple[int, ...]] = {}
+        self._precompute_top(entries, 1)
+
+        grid: defaultdict[tuple[int, int], builtins.list[City]] = defaultdict(list)
+        for city in self._cities.values():
+            if city.latitude is not None and city.longitude is not None:
+                grid[self._get_cell(city.latitude, city.longitude)].append(city)
+        self._grid = dict(grid)
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def get_distance_km(self, id_1: CityId, id_2: CityId) -> float | None:
+        """Return the distance between the cities, None if any of them has no
+        coordinates or wasn't found.
+        """
+        city_1, city_2 = self._cities.get(id_1), self._cities.get(id_2)
+        if city_1 is None or city_1.latitude is None or city_1.longitude is None:
+            return None
+        if city_2 is None or city_2.latitude is None or city_2.longitude is None:
+            return None
+        return get_distance_km(city_1.latitude, city_1.longitude, city_2.latitude, city_2.longitude)
+
+    def list(self, ids: Iterable[CityId]) -> dict[CityId, City]:
+        """Return cities mapping.
+
+        Raise:
+            - CityNotFoundError, if at least one of specified cities wasn't found;
+        """
+        cities = self._cities
+        try:
+            return {id_: cities[id_] for id_ in ids}
+        except KeyError:
+            raise CityNotFoundError from None
+
+    def list_nearby_ids(self, id: CityId, radius_km: float) -> builtins.list[CityId]:
+        """Return ids of the city and cities within the radius, the nearest first, up
+        to MAX_NEARBY_CITIES. Only the city's id is returned if it has no coordinates
+        or wasn't found.
+        """
+        center = self._cities.get(id)
+        if center is None or center.latitude is None or center.longitude is None:
+            return [id]
+
+        lat, lon = center.latitude, center.longitude
+        lat_delta = radius_km / KM_PER_DEGREE
+        lon_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        min_row, min_col = self._get_cell(lat - lat_delta, lon - lon_delta)
+        max_row, max_col = self._get_cell(lat + lat_delta, lon + lon_delta)
+
+        nearby = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for city in self._grid.get((row, col), ()):
+                    distance = get_distance_km(lat, lon, city.latitude, city.longitude)  # type: ignore[arg-type]
+                    if distance <= radius_km and city.id != id:
+                        nearby.append((distance, city.id))
+
+        nearby.sort()
+        return [id, *(city_id for _, city_id in nearby[: MAX_NEARBY_CITIES - 1])]
+
+    def suggest(self, text: str, limit: int) -> builtins.list[City]:
+        """Return the most popular cities, which name or one of its words starts with
+        the text. Limit is up to MAX_CITY_SUGGESTIONS.
+        """
+        if not (prefix := normalize_city_name(text)):
+            return []
+
+        if (top := self._top_by_prefix.get(prefix)) is not None:
+            return [self._ranked[rank] for rank in top[:limit]]
+
+        keys = self._keys
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\U0010ffff', start, min(start + self.SCAN_LIMIT + 1, len(keys)))
+        return [self._ranked[rank] for rank in sorted(set(self._ranks[start:end]))[:limit]]
+
+    @classmethod
+    def _get_cell(cls, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / cls.GRID_CELL_DEG), math.floor(longitude / cls.GRID_CELL_DEG)
+
+    @staticmethod
+    def _get_keys(name: str) -> set[str]:
+        """Return the normalized name and its word suffixes."""
+        words = normalize_city_name(name).split(' ')
+        return {' '.join(words[idx:]) for idx in range(len(words))} - {''}
+
+    def _precompute_top(self, entries: builtins.list[tuple[str, int]], length: int) -> None:
+        """Store top ranks of prefixes matching more than SCAN_LIMIT entries. Only
+        entries of such prefixes are grouped by the longer ones.
+        """
+        for prefix, group in groupby(entries, key=lambda entry: entry[0][:length]):
+            group_entries = list(group)
+            if len(group_entries) <= self.SCAN_LIMIT:
+                continue
+
+            self._top_by_prefix[prefix] = tuple(sorted(set(map(itemgetter(1), group_entries)))[:MAX_CITY_SUGGESTIONS])
+            self._precompute_top([entry for entry in group_entries if len(entry[0]) > length], length + 1)
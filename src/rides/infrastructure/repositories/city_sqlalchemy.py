@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import TIMESTAMP, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.infrastructure.logging import logger
+from shared.infrastructure.sqlalchemy import Base
+
+from ...domain.models import City, CityId
+from .city_index import CityIndex
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class CitySQLAlchemyModel(Base):
+    """City model for SQLAlchemy ORM.
+
+    updated_at must be set on every change, it's a part of the cities version.
+    """
+
+    id: Mapped[CityId] = mapped_column(primary_key=True)
+    latitude: Mapped[float | None]
+    longitude: Mapped[float | None]
+    name: Mapped[str]
+    popularity: Mapped[int] = mapped_column(server_default='0')  # e.g. population or number of rides
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __tablename__ = 'cities'
+
+
+class SQLAlchemyCityIndexLoader:
+    """Keeps CityIndex of the cities table up to date.
+
+    The version of the table is the number of cities and the last updated_at, the
+    index is rebuilt only if it changes. Rows are read in partitions and the index
+    is built in a thread, so requests are served meanwhile, and then it replaces
+    the old one.
+    """
+
+    PARTITION_SIZE = 5000
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+        self.index = CityIndex(())
+
+    async def reload(self) -> bool:
+        """Rebuild the index if the cities have changed. Return if it was rebuilt."""
+        async with self._session_factory() as session:
+            count, last_updated_at = (
+                await session.execute(select(func.count(), func.max(CitySQLAlchemyModel.updated_at)))
+            ).one()
+            version = (count, last_updated_at)
+            if version == self.index.version:
+                return False
+
+            cities: list[City] = []
+            stmt = select(
+                CitySQLAlchemyModel.id,
+                CitySQLAlchemyModel.name,
+                CitySQLAlchemyModel.latitude,
+                CitySQLAlchemyModel.longitude,
+                CitySQLAlchemyModel.popularity,
+            ).execution_options(yield_per=self.PARTITION_SIZE)
+            async for partition in (await session.stream(stmt)).partitions():
+                cities.extend(
+                    City(id=id_, name=name, latitude=lat, longitude=lon, popularity=popularity)
+                    for id_, name, lat, lon, popularity in partition
+                )
+
+        self.index = await asyncio.to_thread(CityIndex, cities, version)
+        logger.info('Cities index is loaded: %s cities', len(self.index))
+        return True
+
+    async def reload_periodically(self, interval_secs: float) -> None:
+        """Reload the index every interval till cancelled. Errors are logged, the
+        current index is kept then.
+        """
+        while True:
+            await asyncio.sleep(interval_secs)
+            try:
+                await self.reload()
+            except SQLAlchemyError:
+                logger.exception('Cities index reload failed')
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from ...errors import RideAlertNotFoundError
+
+if TYPE_CHECKING:
+    from shared.infrastructure.in_memory import InMemoryTransaction
+    from users import UserId
+
+    from ...domain import models as domain_models
+    from .ride_in_memory import RideInMemoryStorage
+
+
+class InMemoryRideAlertRepository:
+    """A ride alert repository based on the in-memory storage of rides."""
+
+    def __init__(self, storage: RideInMemoryStorage, transaction: InMemoryTransaction) -> None:
+        self._storage = storage
+        self._transaction = transaction
+
+    async def count_by_user(self, user_id: UserId) -> int:
+        """Return the number of the user's alerts of today and later days."""
+        today = datetime.now(UTC).date()
+        return sum(1 for a in self._storage.alerts.values() if a.user_id == user_id and a.day >= today)
+
+    async def create(self, alert: domain_models.RideAlert) -> None:
+        """Create a new alert."""
+        self._transaction.add_change(lambda: self._storage.save_alert(alert))
+
+    async def delete(self, id: domain_models.RideAlertId, user_id: UserId) -> domain_models.RideAlert:
+        """Delete the user's alert, return it.
+
+        Raise:
+            - RideAlertNotFoundError, if the user has no such alert;
+        """
+        alert = self._storage.alerts.get(id)
+        if not alert or alert.user_id != user_id:
+            raise RideAlertNotFoundError
+
+        self._transaction.add_change(lambda: self._storage.delete_alert(id))
+        return alert
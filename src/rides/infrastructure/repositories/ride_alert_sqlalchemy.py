@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.infrastructure.sqlalchemy import Base
+
+from ...domain import models as domain_models
+from ...errors import RideAlertNotFoundError
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class RideAlertSQLAlchemyModel(Base):
+    """Ride alert model for SQLAlchemy ORM.
+
+    Alerts are matched against rides by indexes in memory of workers, see
+    RideAlertIndex, so the table is indexed for users and the cleanup only.
+    """
+
+    city_id_departure: Mapped[domain_models.CityId]
+    city_id_destination: Mapped[domain_models.CityId]
+    day: Mapped[date] = mapped_column(index=True)  # of departure in UTC
+    id: Mapped[domain_models.RideAlertId] = mapped_column(primary_key=True)
+    max_price_currency: Mapped[domain_models.Currency | None]
+    max_price_value: Mapped[int | None]
+    user_id: Mapped[domain_models.UserId] = mapped_column(index=True)
+
+    __tablename__ = 'ride_alerts'
+
+    def to_entity(self) -> domain_models.RideAlert:
+        """Return the alert entity."""
+        max_price = None
+        if self.max_price_currency is not None and self.max_price_value is not None:
+            max_price = domain_models.PriceVO(currency=self.max_price_currency, value=self.max_price_value)
+
+        return domain_models.RideAlert(
+            day=self.day,
+            id=self.id,
+            max_price=max_price,
+            route=domain_models.RouteVO(
+                city_id_departure=self.city_id_departure, city_id_destination=self.city_id_destination
+            ),
+            user_id=self.user_id,
+        )
+
+
+class SQLAlchemyRideAlertRepository:
+    """A ride alert repository based on SQLAlchemy."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def count_by_user(self, user_id: domain_models.UserId) -> int:
+        """Return the number of the user's alerts of today and later days."""
+        q = select(func.count()).where(
+            RideAlertSQLAlchemyModel.user_id == user_id, RideAlertSQLAlchemyModel.day >= datetime.now(UTC).date()
+        )
+        return await self._session.scalar(q) or 0
+
+    async def create(self, alert: domain_models.RideAlert) -> None:
+        """Create a new alert."""
+        db_alert = RideAlertSQLAlchemyModel(
+            city_id_departure=alert.route.city_id_departure,
+            city_id_destination=alert.route.city_id_destination,
+            day=alert.day,
+            id=alert.id,
+            max_price_currency=alert.max_price.currency if alert.max_price else None,
+            max_price_value=alert.max_price.value if alert.max_price else None,
+            user_id=alert.user_id,
+        )
+        self._session.add(db_alert)
+        await self._session.flush()
+
+    async def delete(self, id: domain_models.RideAlertId, user_id: domain_models.UserId) -> domain_models.RideAlert:
+        """Delete the user's alert, return it.
+
+        Raise:
+            - RideAlertNotFoundError, if the user has no such alert;
+        """
+        q = (
+            delete(RideAlertSQLAlchemyModel)
+            .where(RideAlertSQLAlchemyModel.id == id, RideAlertSQLAlchemyModel.user_id == user_id)
+            .returning(RideAlertSQLAlchemyModel)
+        )
+        db_alert = await self._session.scalar(q)
+
+        if not db_alert:
+            raise RideAlertNotFoundError
+
+        return db_alert.to_entity()
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
+from datetime import UTC, date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from shared.infrastructure.in_memory import RowLocks
+
+from ...domain import models as domain_models
+from ...errors import ActiveRideNotFoundError, RideSeriesNotFoundError
+from .ride_sqlalchemy import get_departure_day
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from shared.infrastructure.in_memory import InMemoryTransaction
+
+    from ...domain.params_spec import UpdateRideSeriesParams
+
+type RouteKey = tuple[domain_models.CityId, domain_models.CityId]
+
+MAX_RIDE_ID = domain_models.RideId(UUID(int=(1 << 128) - 1))
+MIN_RIDE_ID = domain_models.RideId(UUID(int=0))
+
+
+@dataclass(frozen=True, slots=True)
+class RideInMemoryModel:
+    """Ride model for the in-memory storage. Mirrors RideSQLAlchemyModel."""
+
+    city_id_departure: domain_models.CityId
+    city_id_destination: domain_models.CityId
+    created_at: datetime  # used for presentation
+    departure_time: datetime
+    description: str | None
+    id: domain_models.RideId
+    is_cancelled: bool
+    owner_id: domain_models.OwnerId
+    passengers: tuple[domain_models.Passenger, ...]
+    passengers_created_at: dict[domain_models.PassengerId, datetime]  # of bookings, for exports
+    price: domain_models.PriceVO
+    seats_available: int  # used for faster filtration and presentation
+    seats_number: int
+    series_id: domain_models.RideSeriesId | None
+    waitlist: tuple[domain_models.WaitlistEntry, ...]  # in the order of joining
+
+
+@dataclass(frozen=True, slots=True)
+class RouteDayInMemoryModel:
+    """Route-day model for the in-memory storage. Mirrors RouteDaySQLAlchemyModel."""
+
+    max_seats_available: int
+    min_price_value: int
+    rides_count: int
+
+
+class RideInMemoryStorage:
+    """Committed rides and ride alerts.
+
+    Rides of a route are indexed by departure time, like ix_ride_active_route_departure.
+    Route-days of saved rides are recomputed from the index. Rides of an owner and
+    rides of a passenger are indexed by departure time too, like ix_ride_owner_departure
+    and the primary key of passengers.
+    """
+
+    def __init__(self) -> None:
+        self.alerts: dict[domain_models.RideAlertId, domain_models.RideAlert] = {}
+        self.locks = RowLocks()
+        self.owner_index: dict[domain_models.OwnerId, list[tuple[datetime, domain_models.RideId]]] = {}
+        self.passenger_index: dict[domain_models.PassengerId, list[tuple[datetime, domain_models.RideId]]] = {}
+        self.rides: dict[domain_models.RideId, RideInMemoryModel] = {}
+        self.route_days: dict[RouteKey, dict[date, dict[domain_models.Currency, RouteDayInMemoryModel]]] = {}
+        self.route_index: dict[RouteKey, list[tuple[datetime, domain_models.RideId]]] = {}
+
+    def save(self, ride: RideInMemoryModel) -> Callable[[], None]:
+        """Insert or replace the ride. Return a callable undoing it."""
+        route = (ride.city_id_departure, ride.city_id_destination)
+        days = {get_departure_day(ride.departure_time)}
+        if old_ride := self.rides.get(ride.id):
+            self._unindex(old_ride)
+            days.add(get_departure_day(old_ride.departure_time))
+
+        self.rides[ride.id] = ride
+        entry = (ride.departure_time, ride.id)
+        insort(self.route_index.setdefault(route, []), entry)
+        insort(self.owner_index.setdefault(ride.owner_id, []), entry)
+        for passenger in ride.passengers:
+            insort(self.passenger_index.setdefault(passenger.id, []), entry)
+
+        for day in days:
+            self._refresh_route_day(route, day)
+
+        return lambda: self._restore(ride, old_ride)
+
+    def save_many(self, rides: Sequence[RideInMemoryModel]) -> Callable[[], None]:
+        """Insert or replace the rides. Return a callable undoing it."""
+        undos = [self.save(ride) for ride in rides]
+
+        def undo() -> None:
+            for undo_save in reversed(undos):
+                undo_save()
+
+        return undo
+
+    def save_alert(self, alert: domain_models.RideAlert) -> Callable[[], None]:
+        """Insert the alert. Return a callable undoing it."""
+        self.alerts[alert.id] = alert
+        return lambda: self._restore_alert(alert.id, None)
+
+    def delete_alert(self, id: domain_models.RideAlertId) -> Callable[[], None]:
+        """Delete the alert, if it exists. Return a callable undoing it."""
+        alert = self.alerts.pop(id, None)
+        return lambda: self._restore_alert(id, alert)
+
+    def _refresh_route_day(self, route: RouteKey, day: date) -> None:
+        index = self.route_index[route]
+        from_ = datetime.combine(day, time(0, 0, tzinfo=UTC))
+        start = bisect_left(index, (from_, MIN_RIDE_ID))
+        end = bisect_left(index, (from_ + timedelta(days=1), MIN_RIDE_ID), start)
+
+        by_currency: dict[domain_models.Currency, list[RideInMemoryModel]] = {}
+        for _, id in index[start:end]:
+            ride = self.rides[id]
+            if not ride.is_cancelled and ride.seats_available:
+                by_currency.setdefault(ride.price.currency, []).append(ride)
+
+        route_days = self.route_days.setdefault(route, {})
+        if not by_currency:
+            route_days.pop(day, None)
+            return
+
+        route_days[day] = {
+            currency: RouteDayInMemoryModel(
+                max_seats_available=max(ride.seats_available for ride in rides),
+                min_price_value=min(ride.price.value for ride in rides),
+                rides_count=len(rides),
+            )
+            for currency, rides in by_currency.items()
+        }
+
+    def _restore(self, ride: RideInMemoryModel, old_ride: RideInMemoryModel | None) -> None:
+        """Put back the ride replaced by the saved one, or delete the inserted ride."""
+        if old_ride:
+            self.save(old_ride)
+            return
+
+        self._unindex(self.rides.pop(ride.id))
+        route = (ride.city_id_departure, ride.city_id_destination)
+        self._refresh_route_day(route, get_departure_day(ride.departure_time))
+
+    def _restore_alert(self, id: domain_models.RideAlertId, alert: domain_models.RideAlert | None) -> None:
+        if alert:
+            self.alerts[id] = alert
+        else:
+            self.alerts.pop(id, None)
+
+    def _unindex(self, ride: RideInMemoryModel) -> None:
+        entry = (ride.departure_time, ride.id)
+        indexes = [self.route_index[ride.city_id_departure, ride.city_id_destination], self.owner_index[ride.owner_id]]
+        indexes.extend(self.passenger_index[passenger.id] for passenger in ride.passengers)
+        for index in indexes:
+            del index[bisect_left(index, entry)]
+
+
+class InMemoryRideRepository:
+    """A ride repository based on the in-memory storage."""
+
+    def __init__(self, storage: RideInMemoryStorage, transaction: InMemoryTransaction) -> None:
+        self._storage = storage
+        self._transaction = transaction
+
+    async def create(self, ride: domain_models.Ride) -> None:
+        """Create a new ride."""
+        stored_ride = self._to_stored(ride)
+        self._transaction.add_change(lambda: self._storage.save(stored_ride))
+
+    async def create_many(self, rides: Sequence[domain_models.Ride]) -> None:
+        """Create new rides at once."""
+        stored_rides = [self._to_stored(ride) for ride in rides]
+        self._transaction.add_change(lambda: self._storage.save_many(stored_rides))
+
+    async def get_if_active(self, id: domain_models.RideId) -> domain_models.Ride:
+        """Obtain the ride for the following update if it's active.
+        WARNING: the ride is locked until the end of the transaction.
+
+        Raise:
+            - ActiveRideNotFoundError, if ride isn't active or wasn't found at all;
+        """
+        await self._transaction.lock(self._storage.locks, id)
+
+        ride = self._storage.rides.get(id)
+        if not ride or ride.is_cancelled or ride.departure_time <= datetime.now(UTC):
+            raise ActiveRideNotFoundError
+
+        return domain_models.Ride(
+            route=domain_models.RouteVO(
+                city_id_departure=ride.city_id_departure, city_id_destination=ride.city_id_destination
+            ),
+            departure_time=ride.departure_time,
+            description=ride.description,
+            id=ride.id,
+            is_cancelled=ride.is_cancelled,
+            owner_id=ride.owner_id,
+            passengers=list(ride.passengers),
+            price=ride.price,
+            seats_number=ride.seats_number,
+            series_id=ride.series_id,
+            waitlist=list(ride.waitlist),
+        )
+
+    async def cancel_series(
+        self, id: domain_models.RideSeriesId, owner_id: domain_models.OwnerId
+    ) -> list[domain_models.Ride]:
+        """Cancel active rides of the owner's series at once, except the ones
+        Ride.cancel rejects. The rides are locked until the end of the transaction.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to cancel;
+        """
+        now = datetime.now(UTC)
+        rides = []
+        for ride in await self._lock_series(id, owner_id, now):
+            if ride.passengers and ride.departure_time < now + timedelta(hours=1):
+                continue
+            rides.append(replace(ride, is_cancelled=True))
+
+        return self._save_series(rides)
+
+    async def update_series(
+        self,
+        id: domain_models.RideSeriesId,
+        owner_id: domain_models.OwnerId,
+        params: UpdateRideSeriesParams,
+    ) -> list[domain_models.Ride]:
+        """Update active rides of the owner's series without passengers at once. The
+        rides are locked until the end of the transaction.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to update;
+        """
+        updates: dict[str, Any] = {field: getattr(params, field) for field in params.fields_to_update}
+        if params.seats_number is not None:
+            updates['seats_available'] = params.seats_number
+
+        rides = [
+            replace(ride, **updates)
+            for ride in await self._lock_series(id, owner_id, datetime.now(UTC))
+            if not ride.passengers
+        ]
+        return self._save_series(rides)
+
+    async def _lock_series(
+        self, id: domain_models.RideSeriesId, owner_id: domain_models.OwnerId, now: datetime
+    ) -> list[RideInMemoryModel]:
+        """Lock active rides of the owner's series in order and return them."""
+        index = self._storage.owner_index.get(owner_id, [])
+        rides = []
+        for _, ride_id in index[bisect_right(index, (now, MAX_RIDE_ID)) :]:
+            if self._storage.rides[ride_id].series_id != id:
+                continue
+
+            await self._transaction.lock(self._storage.locks, ride_id)
+            ride = self._storage.rides[ride_id]
+            if not ride.is_cancelled and ride.departure_time > now:
+                rides.append(ride)
+        return rides
+
+    def _save_series(self, rides: list[RideInMemoryModel]) -> list[domain_models.Ride]:
+        if not rides:
+            raise RideSeriesNotFoundError
+
+        self._transaction.add_change(lambda: self._storage.save_many(rides))
+        return [
+            domain_models.Ride(
+                route=domain_models.RouteVO(
+                    city_id_departure=ride.city_id_departure, city_id_destination=ride.city_id_destination
+                ),
+                departure_time=ride.departure_time,
+                description=ride.description,
+                id=ride.id,
+                is_cancelled=ride.is_cancelled,
+                owner_id=ride.owner_id,
+                passengers=list(ride.passengers),
+                price=ride.price,
+                seats_number=ride.seats_number,
+                series_id=ride.series_id,
+                waitlist=[],
+            )
+            for ride in rides
+        ]
+
+    @staticmethod
+    def _to_stored(ride: domain_models.Ride) -> RideInMemoryModel:
+        now = datetime.now(UTC)
+        return RideInMemoryModel(
+            city_id_departure=ride.route.city_id_departure,
+            city_id_destination=ride.route.city_id_destination,
+            created_at=now,
+            departure_time=ride.departure_time,
+            description=ride.description,
+            id=ride.id,
+            is_cancelled=ride.is_cancelled,
+            owner_id=ride.owner_id,
+            passengers=tuple(ride.passengers),
+            passengers_created_at=dict.fromkeys((p.id for p in ride.passengers), now),
+            price=ride.price,
+            seats_available=ride.seats_available,
+            seats_number=ride.seats_number,
+            series_id=ride.series_id,
+            waitlist=tuple(ride.waitlist),
+        )
+
+    async def update(self, ride: domain_models.Ride) -> None:
+        """Save the ride changes."""
+        changed_fields = ride.get_changed_fields()
+        updates: dict[str, Any] = {}
+
+        if changed_fields & {'passengers_added', 'passengers_removed'}:
+            changed_fields -= {'passengers_added', 'passengers_removed'}
+            updates['passengers'] = tuple(ride.passengers)
+            booked_at = self._storage.rides[ride.id].passengers_created_at
+            now = datetime.now(UTC)
+            updates['passengers_created_at'] = {p.id: booked_at.get(p.id, now) for p in ride.passengers}
+            updates['seats_available'] = ride.seats_available
+
+        if changed_fields & {'waitlist_added', 'waitlist_removed'}:
+            changed_fields -= {'waitlist_added', 'waitlist_removed'}
+            updates['waitlist'] = tuple(ride.waitlist)
+
+        if 'seats_number' in changed_fields:
+            updates['seats_available'] = ride.seats_available
+
+        updates.update({k: getattr(ride, k) for k in changed_fields})
+
+        self._transaction.add_change(lambda: self._storage.save(replace(self._storage.rides[ride.id], **updates)))
+
+        ride.clear_changed_fields()
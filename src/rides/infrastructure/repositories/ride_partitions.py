@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from shared.infrastructure.logging import logger
+
+from ...constants import MAX_DEPARTURE_DAYS
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# Partitioned by the departure time of rides, passengers and waitlist reference rides
+PARTITIONED_TABLES = ('rides', 'passengers', 'waitlist')
+PARTITION_NAME = re.compile(r'^(rides|passengers|waitlist)_p(\d{4})_(\d{2})$')
+ARCHIVE_SCHEMA = 'archive'
+
+
+def get_partition_name(table: str, month: date) -> str:
+    """Return the name of the monthly partition, e.g. 'rides_p2026_10'."""
+    return f'{table}_p{month:%Y_%m}'
+
+
+def add_months(month: date, months: int) -> date:
+    """Return the first day of the month shifted by the number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class SQLAlchemyRidePartitionsMaintainer:
+    """Keeps monthly partitions of the rides, passengers and waitlist tables.
+
+    Partitions exist from the current month till PARTITIONS_AHEAD_MONTHS after
+    MAX_DEPARTURE_DAYS, there is no default partition. A new partition is created
+    as a table and attached, which doesn't block queries of the parent unlike
+    CREATE TABLE ... PARTITION OF. Every step is idempotent, so a failed run is
+    completed by the next one.
+
+    Partitions of months ended archive_after_days ago are detached concurrently
+    and moved to the archive schema, tables left detached in the public schema by
+    an interrupted run are moved too, so indexes and vacuum of the tables cover
+    the recent months only. Archived tables can be dumped and dropped, their rides
+    aren't served anymore.
+
+    Instances of the app run the maintenance under an advisory lock.
+    """
+
+    LOCK_KEY = 'ride_partitions'
+    LOCK_TIMEOUT = '1s'  # queries wait for a DDL waiting for a lock at most this long
+    PARTITIONS_AHEAD_MONTHS = 2  # beyond MAX_DEPARTURE_DAYS, in case the maintenance fails
+
+    def __init__(self, engine: AsyncEngine, archive_after_days: int) -> None:
+        self._archive_after_days = archive_after_days
+        self._engine = engine
+
+    async def maintain(self) -> bool:
+        """Create the missing partitions and archive the old ones. Return False if
+        another instance is maintaining them.
+        """
+        today = datetime.now(UTC).date()
+        last_month = add_months(today + timedelta(days=MAX_DEPARTURE_DAYS), self.PARTITIONS_AHEAD_MONTHS)
+        archived_till = today - timedelta(days=self._archive_after_days)
+
+        # DETACH ... CONCURRENTLY can't be run in a transaction
+        async with self._engine.connect() as conn:
+            await conn.execution_options(isolation_level='AUTOCOMMIT')
+            lock_q = text('SELECT pg_try_advisory_lock(hashtext(:key))')
+            if not await conn.scalar(lock_q, {'key': self.LOCK_KEY}):
+                return False
+
+            try:
+                await conn.execute(text(f"SET lock_timeout = '{self.LOCK_TIMEOUT}'"))
+                partitions = await self._list_partitions(conn)
+
+                created = []
+                month = today.replace(day=1)
+                while month <= last_month:
+                    for table in PARTITIONED_TABLES:
+                        if partitions.get(get_partition_name(table, month)) is None:
+                            await self._create(conn, table, month)
+                            created.append(get_partition_name(table, month))
+                    month = add_months(month, 1)
+
+                archived = []
+                for name, detach_pending in sorted(partitions.items(), key=self._get_archive_order):
+                    match = PARTITION_NAME.match(name)
+                    if match and add_months(date(int(match[2]), int(match[3]), 1), 1) <= archived_till:
+                        await self._archive(conn, match[1], name, detach_pending=detach_pending)
+                        archived.append(name)
+
+                if created or archived:  # autovacuum skips partitioned tables
+                    await conn.execute(text('ANALYZE rides, passengers, waitlist'))
+            finally:
+                await conn.execute(text('RESET lock_timeout'))
+                await conn.execute(text('SELECT pg_advisory_unlock(hashtext(:key))'), {'key': self.LOCK_KEY})
+
+        if created or archived:
+            logger.info('Ride partitions are maintained: created %s, archived %s', created, archived)
+        return True
+
+    async def maintain_periodically(self, interval_secs: float) -> None:
+        """Maintain the partitions now and every interval till cancelled. Errors are
+        logged, partitions are created ahead, so the next run has time to retry.
+        """
+        while True:
+            try:
+                await self.maintain()
+            except SQLAlchemyError:
+                logger.exception('Ride partitions maintenance failed')
+            await asyncio.sleep(interval_secs)
+
+    @staticmethod
+    async def _list_partitions(conn: AsyncConnection) -> dict[str, bool | None]:
+        """Return names of the partitions in the public schema and if their detach is
+        pending, None if they are detached already.
+        """
+        q = text(
+            'SELECT c.relname, i.inhdetachpending FROM pg_class c LEFT JOIN pg_inherits i ON i.inhrelid = c.oid '
+            "WHERE c.relnamespace = 'public'::regnamespace AND c.relkind = 'r' AND (i.inhparent IS NULL "
+            "OR i.inhparent IN ('rides'::regclass, 'passengers'::regclass, 'waitlist'::regclass))"
+        )
+        return {name: pending for name, pending in (await conn.execute(q)).tuples() if PARTITION_NAME.match(name)}
+
+    @staticmethod
+    async def _create(conn: AsyncConnection, table: str, month: date) -> None:
+        name = get_partition_name(table, month)
+        from_ = datetime.combine(month, datetime.min.time(), tzinfo=UTC)
+        to = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=UTC)
+
+        await conn.execute(text(f'CREATE TABLE IF NOT EXISTS {name} (LIKE {table} INCLUDING DEFAULTS)'))
+        # Indexes and foreign keys of the parent are created for the partition
+        await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{from_}') TO ('{to}')"))
+
+    @staticmethod
+    async def _archive(conn: AsyncConnection, table: str, name: str, *, detach_pending: bool | None) -> None:
+        """Detach the partition and move it to the archive schema. Foreign keys of
+        the detached table are dropped, so the referenced partition can be detached.
+        """
+        if detach_pending is not None:  # None if an interrupted run detached it already
+            mode = 'FINALIZE' if detach_pending else 'CONCURRENTLY'  # pending if a concurrent detach was interrupted
+            await conn.execute(text(f'ALTER TABLE {table} DETACH PARTITION {name} {mode}'))
+
+        # Clones of a foreign key for partitions of the referenced table go with it
+        foreign_keys_q = text(
+            'SELECT conname FROM pg_constraint '
+            "WHERE conrelid = CAST(:name AS regclass) AND contype = 'f' AND conparentid = 0"
+        )
+        for constraint in (await conn.execute(foreign_keys_q, {'name': name})).scalars():
+            await conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT IF EXISTS "{constraint}"'))
+
+        await conn.execute(text(f'ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}'))
+
+    @staticmethod
+    def _get_archive_order(partition: tuple[str, bool | None]) -> tuple[str, bool]:
+        """Order partitions by month, rides ones last, the others reference them."""
+        table, _, month = partition[0].rpartition('_p')
+        return month, table == 'rides'
@@ -1,26 +1,51 @@
+from collections.abc import Iterable, Sequence
 from contextlib import suppress
-from datetime import UTC, datetime
-
-from sqlalchemy import TIMESTAMP, ForeignKey, Index, SmallInteger, delete, select, update
+from datetime import UTC, date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import (
+    TIMESTAMP,
+    ColumnElement,
+    ForeignKeyConstraint,
+    Index,
+    PrimaryKeyConstraint,
+    Row,
+    SmallInteger,
+    delete,
+    func,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.orm import InstrumentedAttribute, Mapped, mapped_column, relationship, selectinload
 
 from shared.infrastructure.sqlalchemy import Base
 
 from ...domain import models as domain_models
-from ...errors import ActiveRideNotFoundError
+from ...domain.params_spec import UpdateRideSeriesParams
+from ...errors import ActiveRideNotFoundError, RideSeriesNotFoundError
+
+if TYPE_CHECKING:
+    from psycopg import AsyncConnection
 
 
 class RideSQLAlchemyModel(Base):
-    """Ride model for SQLAlchemy ORM."""
+    """Ride model for SQLAlchemy ORM.
+
+    The table is range-partitioned by departure_time by months, see
+    SQLAlchemyRidePartitionsMaintainer. Queries should filter by it, so only the
+    partitions of the range are scanned.
+    """
 
     city_id_departure: Mapped[domain_models.CityId]
     city_id_destination: Mapped[domain_models.CityId]
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))  # used for presentation
-    departure_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    departure_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))  # the partition key
     description: Mapped[str | None]
-    id: Mapped[domain_models.RideId] = mapped_column(primary_key=True, index=True)
+    id: Mapped[domain_models.RideId]
     is_cancelled: Mapped[bool]
     owner_id: Mapped[domain_models.OwnerId]
     passengers: Mapped[list['PassengerSQLAlchemyModel']] = relationship(back_populates='ride', passive_deletes=True)
@@ -28,33 +53,137 @@ class RideSQLAlchemyModel(Base):
     price_value: Mapped[int]
     seats_available: Mapped[int] = mapped_column(SmallInteger)  # used for faster filtration and presentation
     seats_number: Mapped[int] = mapped_column(SmallInteger)
+    series_id: Mapped[domain_models.RideSeriesId | None]
+    waitlist: Mapped[list['WaitlistEntrySQLAlchemyModel']] = relationship(
+        back_populates='ride', order_by='WaitlistEntrySQLAlchemyModel.created_at', passive_deletes=True
+    )
 
     __tablename__ = 'rides'
     __table_args__ = (
-        Index('ix_ride_city_from_to_departure', 'city_id_departure', 'city_id_destination', 'departure_time'),
+        PrimaryKeyConstraint('id', 'departure_time'),  # must include the partition key
+        # Covers filtering of active rides with index-only scans
+        Index(
+            'ix_ride_active_route_departure',
+            'city_id_departure',
+            'city_id_destination',
+            'departure_time',
+            postgresql_include=('id', 'price_currency', 'price_value', 'seats_available', 'seats_number'),
+            postgresql_where=text('NOT is_cancelled'),
+        ),
+        # Covers lists of the owner's rides with index-only scans
+        Index(
+            'ix_ride_owner_departure',
+            'owner_id',
+            'departure_time',
+            'id',
+            postgresql_include=(
+                'city_id_departure',
+                'city_id_destination',
+                'is_cancelled',
+                'price_currency',
+                'price_value',
+                'seats_available',
+                'seats_number',
+            ),
+        ),
+        Index('ix_ride_series', 'series_id', postgresql_where=text('series_id IS NOT NULL')),
+        # Rows are appended as created, so export ranges are found by a small BRIN
+        Index('ix_ride_created_at', 'created_at', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (departure_time)'},
     )
 
 
 class PassengerSQLAlchemyModel(Base):
-    """Passenger model for SQLAlchemy ORM."""
+    """Passenger model for SQLAlchemy ORM.
 
-    id: Mapped[domain_models.PassengerId] = mapped_column(primary_key=True, index=True)
+    The table is partitioned as the rides one, by the departure time of the ride.
+    """
+
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())  # of booking
+    id: Mapped[domain_models.PassengerId] = mapped_column(primary_key=True)
     ride: Mapped[RideSQLAlchemyModel] = relationship(back_populates='passengers')
-    ride_id: Mapped[domain_models.RideId] = mapped_column(
-        ForeignKey('rides.id', ondelete='CASCADE'), primary_key=True, index=True
-    )
+    ride_departure_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    ride_id: Mapped[domain_models.RideId] = mapped_column(primary_key=True, index=True)
     seats_booked: Mapped[int] = mapped_column(SmallInteger)
 
     __tablename__ = 'passengers'
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ('ride_id', 'ride_departure_time'),
+            ('rides.id', 'rides.departure_time'),
+            ondelete='CASCADE',
+            onupdate='CASCADE',  # rides without passengers may change the departure time
+        ),
+        Index('ix_passenger_created_at', 'created_at', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (ride_departure_time)'},
+    )
+
+
+class WaitlistEntrySQLAlchemyModel(Base):
+    """Waitlist entry model for SQLAlchemy ORM.
+
+    The table is partitioned as the passengers one. Entries are ordered by the time
+    of joining.
+    """
+
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    id: Mapped[domain_models.PassengerId] = mapped_column(primary_key=True)
+    ride: Mapped[RideSQLAlchemyModel] = relationship(back_populates='waitlist')
+    ride_departure_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    ride_id: Mapped[domain_models.RideId] = mapped_column(primary_key=True, index=True)
+    seats_requested: Mapped[int] = mapped_column(SmallInteger)
+
+    __tablename__ = 'waitlist'
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ('ride_id', 'ride_departure_time'),
+            ('rides.id', 'rides.departure_time'),
+            ondelete='CASCADE',
+            onupdate='CASCADE',
+        ),
+        {'postgresql_partition_by': 'RANGE (ride_departure_time)'},
+    )
+
+
+class RouteDaySQLAlchemyModel(Base):
+    """Bookable rides of a route departing on a day in a currency, for calendars.
+
+    Maintained by SQLAlchemyRideRepository on every ride change.
+    """
+
+    city_id_departure: Mapped[domain_models.CityId] = mapped_column(primary_key=True)
+    city_id_destination: Mapped[domain_models.CityId] = mapped_column(primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)  # of departure in UTC
+    max_seats_available: Mapped[int] = mapped_column(SmallInteger)
+    min_price_value: Mapped[int]
+    price_currency: Mapped[domain_models.Currency] = mapped_column(primary_key=True)
+    rides_count: Mapped[int]
+
+    __tablename__ = 'ride_route_days'
+
+
+def get_departure_day(departure_time: datetime) -> date:
+    """Return the day of the departure in UTC, rides are filtered by it."""
+    return departure_time.astimezone(UTC).date()
 
 
 class SQLAlchemyRideRepository:
     """A ride repository based on SQLAlchemy.
 
+    Route-days of changed rides are recomputed in the same transaction, see
+    RouteDaySQLAlchemyModel.
+
     docs: https://www.sqlalchemy.org/
     """
 
+    COPY_MIN_RIDES = 100
+    COPY_RIDES_SQL = (
+        'COPY rides (city_id_departure, city_id_destination, created_at, departure_time, description, id, '
+        'is_cancelled, owner_id, price_currency, price_value, seats_available, seats_number, series_id) FROM STDIN'
+    )
+
     def __init__(self, session: AsyncSession) -> None:
+        self._departure_times: dict[domain_models.RideId, datetime] = {}  # as obtained for update
         self._session = session
 
     async def create(self, ride: domain_models.Ride) -> None:
@@ -73,8 +202,50 @@ class SQLAlchemyRideRepository:
             price_value=ride.price.value,
             seats_available=ride.seats_available,
             seats_number=ride.seats_number,
+            series_id=ride.series_id,
         )
         self._session.add(db_ride)
+        await self._session.flush()
+
+        await self._refresh_route_days(ride.route, {get_departure_day(ride.departure_time)})
+
+    async def create_many(self, rides: Sequence[domain_models.Ride]) -> None:
+        """Create new rides at once, new rides have no passengers.
+
+        Fewer than COPY_MIN_RIDES rides are inserted by one multi-row INSERT, more
+        are loaded by COPY, which PostgreSQL routes to the partitions, without
+        parameters per value and their limit of a statement.
+        """
+        if not rides:
+            return
+
+        created_at = datetime.now(UTC)
+        if len(rides) < self.COPY_MIN_RIDES:
+            insert_q = insert(RideSQLAlchemyModel).values(
+                [
+                    {
+                        'city_id_departure': ride.route.city_id_departure,
+                        'city_id_destination': ride.route.city_id_destination,
+                        'created_at': created_at,
+                        'departure_time': ride.departure_time,
+                        'description': ride.description,
+                        'id': ride.id,
+                        'is_cancelled': ride.is_cancelled,
+                        'owner_id': ride.owner_id,
+                        'price_currency': ride.price.currency,
+                        'price_value': ride.price.value,
+                        'seats_available': ride.seats_available,
+                        'seats_number': ride.seats_number,
+                        'series_id': ride.series_id,
+                    }
+                    for ride in rides
+                ]
+            )
+            await self._session.execute(insert_q)
+        else:
+            await self._copy_rides(rides, created_at)
+
+        await self._refresh_rides_route_days(rides)
 
     async def get_if_active(self, id: domain_models.RideId) -> domain_models.Ride:
         """Obtain the ride for the following update if it's active.
@@ -88,7 +259,7 @@ class SQLAlchemyRideRepository:
         q = (
             select(RideSQLAlchemyModel)
             .with_for_update()
-            .options(selectinload(RideSQLAlchemyModel.passengers))
+            .options(selectinload(RideSQLAlchemyModel.passengers), selectinload(RideSQLAlchemyModel.waitlist))
             .where(
                 RideSQLAlchemyModel.id == id,
                 RideSQLAlchemyModel.is_cancelled == False,
@@ -100,7 +271,9 @@ class SQLAlchemyRideRepository:
         if not ride:
             raise ActiveRideNotFoundError
 
+        self._departure_times[ride.id] = ride.departure_time
         passengers = [domain_models.Passenger(id=p.id, seats_booked=p.seats_booked) for p in ride.passengers]
+        waitlist = [domain_models.WaitlistEntry(id=e.id, seats_requested=e.seats_requested) for e in ride.waitlist]
         return domain_models.Ride(
             route=domain_models.RouteVO(
                 city_id_departure=ride.city_id_departure, city_id_destination=ride.city_id_destination
@@ -113,12 +286,16 @@ class SQLAlchemyRideRepository:
             passengers=passengers,
             price=domain_models.PriceVO(currency=ride.price_currency, value=ride.price_value),
             seats_number=ride.seats_number,
+            series_id=ride.series_id,
+            waitlist=waitlist,
         )
 
     async def update(self, ride: domain_models.Ride) -> None:
         """Save the ride changes."""
         changed_fields = ride.get_changed_fields()
-        updates = {}
+        updates: dict[str, Any] = {}
+        # The stored departure time, partitions are pruned by it
+        departure_time = self._departure_times.get(ride.id, ride.departure_time)
 
         with suppress(KeyError):
             changed_fields.remove('passengers_added')
@@ -126,10 +303,22 @@ class SQLAlchemyRideRepository:
             updates['seats_available'] = ride.seats_available
 
             insert_q = insert(PassengerSQLAlchemyModel).values(
-                [{'id': p.id, 'ride_id': ride.id, 'seats_booked': p.seats_booked} for p in ride.passengers]
+                [
+                    {
+                        'id': p.id,
+                        'ride_departure_time': departure_time,
+                        'ride_id': ride.id,
+                        'seats_booked': p.seats_booked,
+                    }
+                    for p in ride.passengers
+                ]
             )
             insert_q = insert_q.on_conflict_do_nothing(
-                index_elements=(PassengerSQLAlchemyModel.id, PassengerSQLAlchemyModel.ride_id)
+                index_elements=(
+                    PassengerSQLAlchemyModel.id,
+                    PassengerSQLAlchemyModel.ride_departure_time,
+                    PassengerSQLAlchemyModel.ride_id,
+                )
             )
             await self._session.execute(insert_q)
 
@@ -140,18 +329,306 @@ class SQLAlchemyRideRepository:
 
             passenger_ids = [p.id for p in ride.passengers]
             delete_q = delete(PassengerSQLAlchemyModel).where(
-                PassengerSQLAlchemyModel.ride_id == ride.id, PassengerSQLAlchemyModel.id.not_in(passenger_ids)
+                PassengerSQLAlchemyModel.ride_departure_time == departure_time,
+                PassengerSQLAlchemyModel.ride_id == ride.id,
+                PassengerSQLAlchemyModel.id.not_in(passenger_ids),
+            )
+            await self._session.execute(delete_q)
+
+        with suppress(KeyError):
+            changed_fields.remove('waitlist_added')
+
+            insert_q = insert(WaitlistEntrySQLAlchemyModel).values(
+                [
+                    {
+                        'created_at': func.clock_timestamp(),  # keeps the order of joins of the transaction
+                        'id': e.id,
+                        'ride_departure_time': departure_time,
+                        'ride_id': ride.id,
+                        'seats_requested': e.seats_requested,
+                    }
+                    for e in ride.waitlist
+                ]
+            )
+            insert_q = insert_q.on_conflict_do_nothing(
+                index_elements=(
+                    WaitlistEntrySQLAlchemyModel.id,
+                    WaitlistEntrySQLAlchemyModel.ride_departure_time,
+                    WaitlistEntrySQLAlchemyModel.ride_id,
+                )
+            )
+            await self._session.execute(insert_q)
+
+        with suppress(KeyError):
+            changed_fields.remove('waitlist_removed')
+
+            waitlisted_ids = [e.id for e in ride.waitlist]
+            delete_q = delete(WaitlistEntrySQLAlchemyModel).where(
+                WaitlistEntrySQLAlchemyModel.ride_departure_time == departure_time,
+                WaitlistEntrySQLAlchemyModel.ride_id == ride.id,
+                WaitlistEntrySQLAlchemyModel.id.not_in(waitlisted_ids),
             )
             await self._session.execute(delete_q)
 
         with suppress(KeyError):
             changed_fields.remove('seats_number')
 
+            updates['seats_number'] = ride.seats_number
             updates['seats_available'] = ride.seats_available
 
+        with suppress(KeyError):
+            changed_fields.remove('price')
+
+            updates['price_currency'] = ride.price.currency
+            updates['price_value'] = ride.price.value
+
         updates.update({k: getattr(ride, k) for k in changed_fields})
 
-        q = update(RideSQLAlchemyModel).where(RideSQLAlchemyModel.id == ride.id).values(**updates)
-        await self._session.execute(q)
+        if updates:  # changes of the waitlist only don't touch the ride
+            q = (
+                update(RideSQLAlchemyModel)
+                .where(RideSQLAlchemyModel.departure_time == departure_time, RideSQLAlchemyModel.id == ride.id)
+                .values(**updates)
+            )
+            await self._session.execute(q)
+
+            days = {get_departure_day(ride.departure_time), get_departure_day(departure_time)}
+            await self._refresh_route_days(ride.route, days)
+            self._departure_times[ride.id] = ride.departure_time
 
         ride.clear_changed_fields()
+
+    async def cancel_series(
+        self, id: domain_models.RideSeriesId, owner_id: domain_models.OwnerId
+    ) -> list[domain_models.Ride]:
+        """Cancel the rides with one UPDATE, rides with passengers departing within an
+        hour are skipped, see Ride.cancel. Passengers are loaded with one SELECT.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to cancel;
+        """
+        Ride, Passenger = RideSQLAlchemyModel, PassengerSQLAlchemyModel  # noqa: N806
+        now = datetime.now(UTC)
+        update_q = (
+            update(Ride)
+            .where(
+                *self._get_series_filters(id, owner_id, now),
+                (Ride.seats_available == Ride.seats_number) | (Ride.departure_time >= now + timedelta(hours=1)),
+            )
+            .values(is_cancelled=True)
+            .returning(*self._get_series_ride_columns())
+        )
+        rows = (await self._session.execute(update_q)).all()
+        if not rows:
+            raise RideSeriesNotFoundError
+
+        passengers: dict[domain_models.RideId, list[domain_models.Passenger]] = {}
+        passengers_q = select(Passenger.ride_id, Passenger.id, Passenger.seats_booked).where(
+            Passenger.ride_departure_time.in_({row.departure_time for row in rows}),  # partitions are pruned by it
+            Passenger.ride_id.in_([row.id for row in rows]),
+        )
+        for ride_id, passenger_id, seats_booked in await self._session.execute(passengers_q):
+            passengers.setdefault(ride_id, []).append(
+                domain_models.Passenger(id=passenger_id, seats_booked=seats_booked)
+            )
+
+        rides = [self._series_row_to_entity(row, passengers.get(row.id, [])) for row in rows]
+        await self._refresh_rides_route_days(rides)
+        return rides
+
+    async def update_series(
+        self,
+        id: domain_models.RideSeriesId,
+        owner_id: domain_models.OwnerId,
+        params: UpdateRideSeriesParams,
+    ) -> list[domain_models.Ride]:
+        """Update the rides without passengers with one UPDATE.
+
+        Raise:
+            - RideSeriesNotFoundError, if the owner's series has no rides to update;
+        """
+        Ride = RideSQLAlchemyModel  # noqa: N806
+        updates: dict[str, Any] = {}
+        for field in params.fields_to_update:
+            if field == 'price' and params.price:
+                updates['price_currency'] = params.price.currency
+                updates['price_value'] = params.price.value
+            elif field == 'seats_number':
+                updates['seats_number'] = updates['seats_available'] = params.seats_number
+            else:
+                updates[field] = getattr(params, field)
+
+        update_q = (
+            update(Ride)
+            .where(
+                *self._get_series_filters(id, owner_id, datetime.now(UTC)),
+                Ride.seats_available == Ride.seats_number,
+            )
+            .values(**updates)
+            .returning(*self._get_series_ride_columns())
+        )
+        rows = (await self._session.execute(update_q)).all()
+        if not rows:
+            raise RideSeriesNotFoundError
+
+        rides = [self._series_row_to_entity(row, []) for row in rows]
+        await self._refresh_rides_route_days(rides)
+        return rides
+
+    @staticmethod
+    def _get_series_filters(
+        id: domain_models.RideSeriesId, owner_id: domain_models.OwnerId, now: datetime
+    ) -> tuple[ColumnElement[bool], ...]:
+        """Return filters of active rides of the owner's series, as get_if_active."""
+        Ride = RideSQLAlchemyModel  # noqa: N806
+        return (
+            Ride.series_id == id,
+            Ride.owner_id == owner_id,
+            Ride.is_cancelled == False,
+            Ride.departure_time > now,
+        )
+
+    @staticmethod
+    def _get_series_ride_columns() -> tuple[InstrumentedAttribute[Any], ...]:
+        Ride = RideSQLAlchemyModel  # noqa: N806
+        return (
+            Ride.city_id_departure,
+            Ride.city_id_destination,
+            Ride.departure_time,
+            Ride.description,
+            Ride.id,
+            Ride.is_cancelled,
+            Ride.owner_id,
+            Ride.price_currency,
+            Ride.price_value,
+            Ride.seats_number,
+            Ride.series_id,
+        )
+
+    @staticmethod
+    def _series_row_to_entity(row: Row[Any], passengers: list[domain_models.Passenger]) -> domain_models.Ride:
+        """Return the ride of the row, waitlists of series rides aren't loaded."""
+        return domain_models.Ride(
+            route=domain_models.RouteVO(
+                city_id_departure=row.city_id_departure, city_id_destination=row.city_id_destination
+            ),
+            departure_time=row.departure_time,
+            description=row.description,
+            id=row.id,
+            is_cancelled=row.is_cancelled,
+            owner_id=row.owner_id,
+            passengers=passengers,
+            price=domain_models.PriceVO(currency=row.price_currency, value=row.price_value),
+            seats_number=row.seats_number,
+            series_id=row.series_id,
+            waitlist=[],
+        )
+
+    async def _copy_rides(self, rides: Sequence[domain_models.Ride], created_at: datetime) -> None:
+        """Load the rides by COPY on the session's connection, in its transaction."""
+        connection = await (await self._session.connection()).get_raw_connection()
+        psycopg_connection = cast('AsyncConnection[Any]', connection.driver_connection)
+        async with psycopg_connection.cursor() as cursor, cursor.copy(self.COPY_RIDES_SQL) as copy:
+            for ride in rides:
+                await copy.write_row(
+                    (
+                        ride.route.city_id_departure,
+                        ride.route.city_id_destination,
+                        created_at,
+                        ride.departure_time,
+                        ride.description,
+                        ride.id,
+                        ride.is_cancelled,
+                        ride.owner_id,
+                        ride.price.currency.name,  # labels of the enum type are the names
+                        ride.price.value,
+                        ride.seats_available,
+                        ride.seats_number,
+                        ride.series_id,
+                    )
+                )
+
+    async def _refresh_rides_route_days(self, rides: Iterable[domain_models.Ride]) -> None:
+        days_by_route: dict[domain_models.RouteVO, set[date]] = {}
+        for ride in rides:
+            days_by_route.setdefault(ride.route, set()).add(get_departure_day(ride.departure_time))
+
+        # Routes are locked in order too, rides of many routes are created at once
+        for route in sorted(days_by_route, key=lambda r: (r.city_id_departure, r.city_id_destination)):
+            await self._refresh_route_days(route, days_by_route[route])
+
+    async def _refresh_route_days(self, route: domain_models.RouteVO, days: set[date]) -> None:
+        """Recompute route-days from the rides.
+
+        A route-day is locked by an advisory lock till the end of the transaction,
+        so the rides of concurrent transactions are counted once they commit. Days
+        are locked in order by one statement to avoid deadlocks, then all of them are
+        recomputed by one DELETE and one upsert, so a series costs as a single ride.
+        """
+        Ride, RouteDay = RideSQLAlchemyModel, RouteDaySQLAlchemyModel  # noqa: N806
+
+        days_in_order = sorted(days)
+        lock_key = f'ride_route_days:{route.city_id_departure}:{route.city_id_destination}:{{}}'
+        # Target expressions are evaluated from left to right
+        locks = (func.pg_advisory_xact_lock(func.hashtextextended(lock_key.format(day), 0)) for day in days_in_order)
+        await self._session.execute(select(*locks))
+
+        departure_day = func.date(func.timezone('UTC', Ride.departure_time))
+        bookable_rides = (
+            Ride.city_id_departure == route.city_id_departure,
+            Ride.city_id_destination == route.city_id_destination,
+            Ride.departure_time >= datetime.combine(days_in_order[0], time(0, 0, tzinfo=UTC)),
+            Ride.departure_time < datetime.combine(days_in_order[-1], time(0, 0, tzinfo=UTC)) + timedelta(days=1),
+            departure_day.in_(days_in_order),
+            Ride.is_cancelled == False,
+            Ride.seats_available > 0,
+        )
+        delete_q = delete(RouteDay).where(
+            RouteDay.city_id_departure == route.city_id_departure,
+            RouteDay.city_id_destination == route.city_id_destination,
+            RouteDay.day.in_(days_in_order),
+            tuple_(RouteDay.day, RouteDay.price_currency).not_in(
+                select(departure_day, Ride.price_currency).where(*bookable_rides)
+            ),
+        )
+        await self._session.execute(delete_q)
+
+        aggregate_q = (
+            select(
+                Ride.city_id_departure,
+                Ride.city_id_destination,
+                departure_day.label('day'),
+                func.max(Ride.seats_available),
+                func.min(Ride.price_value),
+                Ride.price_currency,
+                func.count(),
+            )
+            .where(*bookable_rides)
+            .group_by(Ride.city_id_departure, Ride.city_id_destination, departure_day, Ride.price_currency)
+        )
+        insert_q = insert(RouteDay).from_select(
+            (
+                RouteDay.city_id_departure,
+                RouteDay.city_id_destination,
+                RouteDay.day,
+                RouteDay.max_seats_available,
+                RouteDay.min_price_value,
+                RouteDay.price_currency,
+                RouteDay.rides_count,
+            ),
+            aggregate_q,
+        )
+        insert_q = insert_q.on_conflict_do_update(
+            index_elements=(
+                RouteDay.city_id_departure,
+                RouteDay.city_id_destination,
+                RouteDay.day,
+                RouteDay.price_currency,
+            ),
+            set_={
+                'max_seats_available': insert_q.excluded.max_seats_available,
+                'min_price_value': insert_q.excluded.min_price_value,
+                'rides_count': insert_q.excluded.rides_count,
+            },
+        )
+        await self._session.execute(insert_q)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ..domain.models import RideAlertId
+from .repositories.ride_sqlalchemy import get_departure_day
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from datetime import date, datetime
+
+    from ..domain.models import CityId, Currency, PriceVO, RideAlert, RouteVO
+
+type AlertKey = tuple[CityId, CityId, date]  # route and day of departure
+
+MIN_ALERT_ID = RideAlertId(UUID(int=0))
+
+
+class RideAlertIndex:
+    """Inverted index of alerts by route and day of departure.
+
+    Alerts of a route-day are grouped by the currency of their max price, alerts
+    without it are grouped under None. Groups with a price are sorted by it, so
+    the alerts matching a price are a tail found by a binary search. Matching a
+    ride costs the number of the matching alerts then, whatever the total number.
+    """
+
+    def __init__(self) -> None:
+        self._alerts: dict[RideAlertId, RideAlert] = {}
+        self._buckets: dict[AlertKey, dict[Currency | None, list[tuple[int, RideAlertId]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def add(self, alert: RideAlert) -> None:
+        """Add the alert, if it isn't added."""
+        if alert.id in self._alerts:
+            return
+
+        self._alerts[alert.id] = alert
+        bucket = self._buckets.setdefault(self._get_key(alert), {})
+        currency = alert.max_price.currency if alert.max_price else None
+        insort(bucket.setdefault(currency, []), self._get_entry(alert))
+
+    def remove(self, id: RideAlertId) -> None:
+        """Remove the alert, if it's added."""
+        if not (alert := self._alerts.pop(id, None)):
+            return
+
+        key = self._get_key(alert)
+        bucket = self._buckets[key]
+        currency = alert.max_price.currency if alert.max_price else None
+        entries = bucket[currency]
+        del entries[bisect_left(entries, self._get_entry(alert))]
+
+        if not entries:
+            del bucket[currency]
+            if not bucket:
+                del self._buckets[key]
+
+    def match(self, route: RouteVO, departure_time: datetime, price: PriceVO) -> Iterator[RideAlert]:
+        """Yield the alerts of the ride."""
+        key = (route.city_id_departure, route.city_id_destination, get_departure_day(departure_time))
+        if not (bucket := self._buckets.get(key)):
+            return
+
+        for _, id in bucket.get(None, ()):
+            yield self._alerts[id]
+
+        entries = bucket.get(price.currency, [])
+        for _, id in entries[bisect_left(entries, (price.value, MIN_ALERT_ID)) :]:
+            yield self._alerts[id]
+
+    def remove_before(self, day: date) -> int:
+        """Remove alerts of the days before the day. Return their number."""
+        keys = [key for key in self._buckets if key[2] < day]
+        ids = [id for key in keys for entries in self._buckets[key].values() for _, id in entries]
+        for key in keys:
+            del self._buckets[key]
+        for id in ids:
+            del self._alerts[id]
+        return len(ids)
+
+    @staticmethod
+    def _get_key(alert: RideAlert) -> AlertKey:
+        return alert.route.city_id_departure, alert.route.city_id_destination, alert.day
+
+    @staticmethod
+    def _get_entry(alert: RideAlert) -> tuple[int, RideAlertId]:
+        return alert.max_price.value if alert.max_price else 0, alert.id
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from html import escape
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import orjson
+from sqlalchemy import delete, select
+
+from shared.infrastructure.logging import logger
+from shared.infrastructure.redis_stream import RedisStreamGroup, get_consumer_name
+from users import MailDTO, UserId, enqueue_mails, get_users_emails
+
+from ..application.events import BookableRideDTO
+from ..constants import BOOKABLE_RIDES_STREAM, RIDE_ALERTS_STREAM
+from ..domain.models import CityId, Currency, OwnerId, PriceVO, RideAlert, RideAlertId, RideId, RouteVO
+from .repositories.ride_alert_sqlalchemy import RideAlertSQLAlchemyModel
+from .ride_alert_index import RideAlertIndex
+from .ride_notifications import get_city_names
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from shared.infrastructure.redis_stream import StreamEntry
+
+    from ..application.events import RideAlertChangeType
+
+SUBJECT = 'A ride for your alert'
+TEMPLATE = (
+    '<!DOCTYPE html><head><meta charset="UTF-8"><title>{subject}</title></head>'
+    '<body><p>The ride from {departure} to {destination} on {departure_time:%Y-%m-%d %H:%M} UTC '
+    'has {seats_available} seats available for {price}.</p></body></html>'
+)
+
+
+def decode_bookable_ride(event: str) -> BookableRideDTO:
+    """Return the ride of the stream entry.
+
+    Raise:
+        - KeyError, TypeError or ValueError, if the entry is invalid;
+    """
+    data = orjson.loads(event)
+    return BookableRideDTO(
+        city_id_departure=CityId(UUID(data['city_id_departure'])),
+        city_id_destination=CityId(UUID(data['city_id_destination'])),
+        departure_time=datetime.fromisoformat(data['departure_time']),
+        id=RideId(UUID(data['id'])),
+        owner_id=OwnerId(UserId(UUID(data['owner_id']))),
+        price=PriceVO(currency=Currency(data['price']['currency']), value=data['price']['value']),
+        seats_available=data['seats_available'],
+    )
+
+
+def decode_alert_change(event: str) -> tuple[RideAlertChangeType, RideAlert]:
+    """Return the type of the change and the alert of the stream entry.
+
+    Raise:
+        - KeyError, TypeError or ValueError, if the entry is invalid;
+    """
+    data = orjson.loads(event)
+    if data['type'] not in {'created', 'deleted'}:
+        msg = f'Unknown alert change type {data["type"]!r}'
+        raise ValueError(msg)
+
+    max_price = data['max_price']
+    alert = RideAlert(
+        day=date.fromisoformat(data['day']),
+        id=RideAlertId(UUID(data['id'])),
+        max_price=PriceVO(currency=Currency(max_price['currency']), value=max_price['value']) if max_price else None,
+        route=RouteVO(
+            city_id_departure=CityId(UUID(data['city_id_departure'])),
+            city_id_destination=CityId(UUID(data['city_id_destination'])),
+        ),
+        user_id=UserId(UUID(data['user_id'])),
+    )
+    return data['type'], alert
+
+
+def render_alert(ride: BookableRideDTO, city_names: dict[CityId, str]) -> str:
+    """Return the HTML content of the mail, same for all users of the ride."""
+    currency = ride.price.currency.split('_')[0]
+    return TEMPLATE.format(
+        departure=escape(city_names.get(ride.city_id_departure, 'the departure city')),
+        departure_time=ride.departure_time,
+        destination=escape(city_names.get(ride.city_id_destination, 'the destination city')),
+        price=f'{ride.price.value / 100:.2f} {currency}',
+        seats_available=ride.seats_available,
+        subject=SUBJECT,
+    )
+
+
+class RedisRideAlertsWorker:
+    """Mails users of alerts matching rides which became bookable.
+
+    The worker keeps all alerts of today and later days in RideAlertIndex. It's
+    loaded from the DB on start, then kept up to date by RIDE_ALERTS_STREAM, which
+    every worker reads entirely. Changes are applied before every batch of
+    BOOKABLE_RIDES_STREAM, the batches are shared by the workers via a consumer
+    group. So matching costs the matching alerts only and doesn't query the DB.
+
+    Once a day alerts of the past days are removed, and changes older than
+    CHANGES_RETENTION are trimmed, a restarted worker loads the index anew.
+    """
+
+    BATCH_SIZE = 100
+    CHANGES_BATCH_SIZE = 1000
+    CHANGES_RETENTION = timedelta(days=1)
+    ERROR_PAUSE_SECS = 1.0
+    GROUP = 'ride_alerts'
+    LOAD_PARTITION_SIZE = 10_000
+
+    def __init__(self, redis_con: Redis, session_factory: async_sessionmaker[AsyncSession], email_from: str) -> None:
+        self._changes_id = '0-0'  # of the last applied change
+        self._cleaned_up_on = date.min
+        self._email_from = email_from
+        self._group = RedisStreamGroup(redis_con, BOOKABLE_RIDES_STREAM, self.GROUP)
+        self._index = RideAlertIndex()
+        self._redis_con = redis_con
+        self._session_factory = session_factory
+
+    async def run(self) -> None:
+        """Load the index and match rides till cancelled. Errors, e.g. of Redis or
+        the DB, are logged and the load or the batch is retried after a pause.
+        """
+        while True:
+            try:
+                await self._group.create()
+                await self._load()
+                break
+            except Exception:  # noqa: BLE001  # other workers share the process
+                logger.exception('Ride alerts index loading failed')
+                await asyncio.sleep(self.ERROR_PAUSE_SECS)
+
+        consumer = get_consumer_name()
+        while True:
+            try:
+                await self._clean_up()
+                await self._apply_changes()
+                entries = await self._group.read(consumer, self.BATCH_SIZE)
+                if entries:
+                    await self._alert(entries)
+            except Exception:  # noqa: BLE001  # other workers share the process
+                logger.exception('Ride alerts failed')
+                await asyncio.sleep(self.ERROR_PAUSE_SECS)
+
+    async def _load(self) -> None:
+        """Load the alerts anew. Changes are applied from the last one before the
+        load, applying a change twice is harmless.
+        """
+        self._index = RideAlertIndex()
+        if last_changes := await self._redis_con.xrevrange(RIDE_ALERTS_STREAM, count=1):
+            self._changes_id = last_changes[0][0]
+
+        Alert = RideAlertSQLAlchemyModel  # noqa: N806
+        q = (
+            select(
+                Alert.city_id_departure,
+                Alert.city_id_destination,
+                Alert.day,
+                Alert.id,
+                Alert.max_price_currency,
+                Alert.max_price_value,
+                Alert.user_id,
+            )
+            .where(Alert.day >= datetime.now(UTC).date())
+            .execution_options(yield_per=self.LOAD_PARTITION_SIZE)
+        )
+        async with self._session_factory() as session:
+            async for partition in (await session.stream(q)).partitions():
+                for departure, destination, day, id_, currency, value, user_id in partition:
+                    self._index.add(
+                        RideAlert(
+                            day=day,
+                            id=id_,
+                            max_price=PriceVO(currency=currency, value=value) if currency is not None else None,
+                            route=RouteVO(city_id_departure=departure, city_id_destination=destination),
+                            user_id=user_id,
+                        )
+                    )
+
+        logger.info('Ride alerts index is loaded: %s alerts', len(self._index))
+
+    async def _clean_up(self) -> None:
+        """Remove the alerts of the past days and trim the old changes once a day."""
+        today = datetime.now(UTC).date()
+        if self._cleaned_up_on == today:
+            return
+
+        removed = self._index.remove_before(today)
+        async with self._session_factory() as session:
+            await session.execute(delete(RideAlertSQLAlchemyModel).where(RideAlertSQLAlchemyModel.day < today))
+            await session.commit()
+
+        min_id = int((datetime.now(UTC) - self.CHANGES_RETENTION).timestamp() * 1000)
+        await self._redis_con.xtrim(RIDE_ALERTS_STREAM, minid=min_id, approximate=True)
+
+        self._cleaned_up_on = today
+        logger.info('Ride alerts of the past days are removed: %s', removed)
+
+    async def _apply_changes(self) -> None:
+        """Apply the changes of alerts made since the last applied one. Invalid
+        changes are logged and skipped.
+        """
+        while True:
+            streams = await self._redis_con.xread({RIDE_ALERTS_STREAM: self._changes_id}, count=self.CHANGES_BATCH_SIZE)
+            if not streams:
+                return
+
+            entries = streams[0][1]
+            for entry_id, fields in entries:
+                try:
+                    change_type, alert = decode_alert_change(fields['event'])
+                except (KeyError, TypeError, ValueError):
+                    logger.exception('Ride alert change %s is invalid, it is skipped', entry_id)
+                    continue
+
+                if change_type == 'created':
+                    self._index.add(alert)
+                else:
+                    self._index.remove(alert.id)
+            self._changes_id = entries[-1][0]
+
+            if len(entries) < self.CHANGES_BATCH_SIZE:
+                return
+
+    async def _alert(self, entries: list[StreamEntry]) -> None:
+        """Enqueue mails of the alerts matching the rides, then acknowledge them.
+        Invalid entries are logged and acknowledged, so they aren't redelivered.
+        """
+        matches: list[tuple[BookableRideDTO, set[UserId]]] = []
+        for entry_id, fields in entries:
+            try:
+                ride = decode_bookable_ride(fields['event'])
+            except (KeyError, TypeError, ValueError):
+                logger.exception('Bookable ride %s is invalid, it is skipped', entry_id)
+                continue
+
+            route = RouteVO(city_id_departure=ride.city_id_departure, city_id_destination=ride.city_id_destination)
+            user_ids = {
+                alert.user_id
+                for alert in self._index.match(route, ride.departure_time, ride.price)
+                if alert.user_id != ride.owner_id
+            }
+            if user_ids:
+                matches.append((ride, user_ids))
+
+        if matches:
+            user_ids_to_mail: list[UserId] = list({id_ for _, ids in matches for id_ in ids})
+            city_ids = {id_ for ride, _ in matches for id_ in (ride.city_id_departure, ride.city_id_destination)}
+
+            async with self._session_factory() as session:
+                emails = await get_users_emails(user_ids_to_mail, session, self._redis_con)
+                city_names = await get_city_names(session, city_ids)
+
+            await enqueue_mails(self._build_mails(matches, emails, city_names), self._redis_con)
+
+        async with self._redis_con.pipeline(transaction=False) as pipe:
+            self._group.ack(pipe, *(entry_id for entry_id, _ in entries))
+            await pipe.execute()
+
+    def _build_mails(
+        self,
+        matches: Iterable[tuple[BookableRideDTO, set[UserId]]],
+        emails: dict[UserId, str],
+        city_names: dict[CityId, str],
+    ) -> list[MailDTO]:
+        mails: list[MailDTO] = []
+        for ride, user_ids in matches:
+            content = render_alert(ride, city_names)
+            mails.extend(
+                MailDTO(content=content, email_from=self._email_from, email_to=emails[id_], subject=SUBJECT)
+                for id_ in user_ids
+                if id_ in emails  # deleted users are skipped
+            )
+        return mails
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING
+
+import orjson
+from redis.exceptions import RedisError
+
+from shared.infrastructure.logging import logger
+
+from ..constants import RIDE_EVENTS_CHANNEL
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from redis.asyncio import Redis
+
+    from ..domain.models import RideId
+
+
+class RideEventsSubscription:
+    """Events of rides for a connection. Only the latest event of every ride is kept
+    till it's taken, so the memory is bounded by the number of the rides.
+    """
+
+    __slots__ = ('_events', '_ready', 'ride_ids')
+
+    def __init__(self, ride_ids: frozenset[str]) -> None:
+        self._events: dict[str, bytes] = {}
+        self._ready = asyncio.Event()
+        self.ride_ids = ride_ids
+
+    def put(self, ride_id: str, frame: bytes) -> None:
+        """Replace the pending event of the ride."""
+        self._events[ride_id] = frame
+        self._ready.set()
+
+    async def get(self, timeout_secs: float) -> list[bytes]:
+        """Wait for events at most timeout_secs. Return their SSE frames, nothing
+        on timeout.
+        """
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self._ready.wait(), timeout_secs)
+
+        frames = list(self._events.values())
+        self._events.clear()
+        self._ready.clear()
+        return frames
+
+
+class RideEventsHub:
+    """Fans events of RIDE_EVENTS_CHANNEL out to subscriptions of the process.
+
+    The process holds one Redis subscription to the channel, see listen(). An event
+    is decoded and turned into an SSE frame once, whatever the number of its
+    subscribers.
+    """
+
+    RECONNECT_PAUSE_SECS = 1.0
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, set[RideEventsSubscription]] = {}
+
+    @contextmanager
+    def subscribe(self, ride_ids: Iterable[RideId]) -> Iterator[RideEventsSubscription]:
+        """Subscribe to events of the rides till the context exits."""
+        subscription = RideEventsSubscription(frozenset(str(id_) for id_ in ride_ids))
+        for id_ in subscription.ride_ids:
+            self._subscriptions.setdefault(id_, set()).add(subscription)
+
+        try:
+            yield subscription
+        finally:
+            for id_ in subscription.ride_ids:
+                subscriptions = self._subscriptions[id_]
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[id_]
+
+    def dispatch(self, channel: str, message: str | bytes) -> None:
+        """Pass the published event to subscriptions of its ride."""
+        if channel != RIDE_EVENTS_CHANNEL:
+            return
+
+        event = orjson.loads(message)
+        if not (subscriptions := self._subscriptions.get(event['id'])):
+            return
+
+        data = message if isinstance(message, bytes) else message.encode()
+        frame = b'event: %s\ndata: %s\n\n' % (event['type'].encode(), data)
+        for subscription in subscriptions:
+            subscription.put(event['id'], frame)
+
+    async def listen(self, redis_con: Redis) -> None:
+        """Dispatch events published to Redis till cancelled. The subscription is
+        renewed after errors, events published meanwhile are missed. Invalid events
+        are logged and skipped.
+        """
+        while True:
+            try:
+                async with redis_con.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(RIDE_EVENTS_CHANNEL)
+                    async for message in pubsub.listen():
+                        try:
+                            self.dispatch(message['channel'], message['data'])
+                        except (AttributeError, KeyError, TypeError, ValueError):
+                            logger.exception('Ride event %r is invalid, it is skipped', message.get('data'))
+            except RedisError:
+                logger.exception('Ride events subscription failed')
+                await asyncio.sleep(self.RECONNECT_PAUSE_SECS)
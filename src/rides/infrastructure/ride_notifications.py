@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from html import escape
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import orjson
+from sqlalchemy import select
+
+from shared.infrastructure.logging import logger
+from shared.infrastructure.redis_stream import RedisStreamGroup, get_consumer_name
+from users import MailDTO, UserId, enqueue_mails, get_users_emails
+
+from ..application.events import RideNotificationDTO
+from ..constants import RIDE_NOTIFICATIONS_STREAM
+from ..domain.models import CityId, PassengerId, RideId
+from .repositories.city_sqlalchemy import CitySQLAlchemyModel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from shared.infrastructure.redis_stream import StreamEntry
+
+SUBJECTS = {
+    'cancelled': 'Your ride is cancelled',
+    'promoted': 'Your ride is booked',
+    'updated': 'Your ride is changed',
+}
+CHANGES = {
+    'cancelled': 'is cancelled by the driver',
+    'promoted': 'had seats freed, you are booked from the waitlist',
+    'updated': 'is changed by the driver: {fields}',
+}
+TEMPLATE = (
+    '<!DOCTYPE html><head><meta charset="UTF-8"><title>{subject}</title></head>'
+    '<body><p>The ride from {departure} to {destination} on {departure_time:%Y-%m-%d %H:%M} UTC {change}.</p>'
+    '</body></html>'
+)
+
+
+def decode_notification(event: str) -> RideNotificationDTO:
+    """Return the notification of the stream entry.
+
+    Raise:
+        - KeyError, TypeError or ValueError, if the entry is invalid;
+    """
+    data = orjson.loads(event)
+    if data['type'] not in SUBJECTS:
+        msg = f'Unknown notification type {data["type"]!r}'
+        raise ValueError(msg)
+
+    return RideNotificationDTO(
+        city_id_departure=CityId(UUID(data['city_id_departure'])),
+        city_id_destination=CityId(UUID(data['city_id_destination'])),
+        departure_time=datetime.fromisoformat(data['departure_time']),
+        fields_updated=tuple(data['fields_updated']),
+        id=RideId(UUID(data['id'])),
+        passenger_ids=tuple(PassengerId(UserId(UUID(id_))) for id_ in data['passenger_ids']),
+        type=data['type'],
+    )
+
+
+async def get_city_names(session: AsyncSession, ids: Iterable[CityId]) -> dict[CityId, str]:
+    """Return names of the cities for mails."""
+    q = select(CitySQLAlchemyModel.id, CitySQLAlchemyModel.name).where(CitySQLAlchemyModel.id.in_(ids))
+    return dict((await session.execute(q)).tuples().all())
+
+
+def render_notification(notification: RideNotificationDTO, city_names: dict[CityId, str]) -> tuple[str, str]:
+    """Return the subject and the HTML content of the mail, same for all passengers."""
+    subject = SUBJECTS[notification.type]
+    change = CHANGES[notification.type].format(fields=', '.join(notification.fields_updated).replace('_', ' '))
+    content = TEMPLATE.format(
+        change=change,
+        departure=escape(city_names.get(notification.city_id_departure, 'the departure city')),
+        departure_time=notification.departure_time,
+        destination=escape(city_names.get(notification.city_id_destination, 'the destination city')),
+        subject=subject,
+    )
+    return subject, content
+
+
+class RedisRideNotificationsWorker:
+    """Mails passengers of cancelled and changed rides, and the ones promoted from
+    waitlists.
+
+    Notifications are read from RIDE_NOTIFICATIONS_STREAM by batches. Emails of all
+    passengers of a batch are looked up at once, the mail of every ride is rendered
+    once, and the mails are handed to the mail queue in one round trip. So an owner
+    cancelling many rides costs their requests an outbox row per ride only.
+    """
+
+    BATCH_SIZE = 100
+    ERROR_PAUSE_SECS = 1.0
+    GROUP = 'ride_notifiers'
+
+    def __init__(self, redis_con: Redis, session_factory: async_sessionmaker[AsyncSession], email_from: str) -> None:
+        self._email_from = email_from
+        self._group = RedisStreamGroup(redis_con, RIDE_NOTIFICATIONS_STREAM, self.GROUP)
+        self._redis_con = redis_con
+        self._session_factory = session_factory
+
+    async def run(self) -> None:
+        """Notify passengers till cancelled. Errors, e.g. of Redis or the DB, are
+        logged and the batch is retried after a pause.
+        """
+        await self._group.create()
+        consumer = get_consumer_name()
+        while True:
+            try:
+                entries = await self._group.read(consumer, self.BATCH_SIZE)
+                if entries:
+                    await self._notify(entries)
+            except Exception:  # noqa: BLE001  # other workers share the process
+                logger.exception('Ride notifications failed')
+                await asyncio.sleep(self.ERROR_PAUSE_SECS)
+
+    async def _notify(self, entries: list[StreamEntry]) -> None:
+        """Enqueue mails of the notifications, then acknowledge them. Invalid entries
+        are logged and acknowledged, so they aren't redelivered.
+        """
+        notifications = []
+        for entry_id, fields in entries:
+            try:
+                notifications.append(decode_notification(fields['event']))
+            except (KeyError, TypeError, ValueError):
+                logger.exception('Ride notification %s is invalid, it is skipped', entry_id)
+
+        if notifications:
+            await self._enqueue_mails(notifications)
+
+        async with self._redis_con.pipeline(transaction=False) as pipe:
+            self._group.ack(pipe, *(entry_id for entry_id, _ in entries))
+            await pipe.execute()
+
+    async def _enqueue_mails(self, notifications: list[RideNotificationDTO]) -> None:
+        passenger_ids: list[UserId] = list({id_ for n in notifications for id_ in n.passenger_ids})
+        city_ids = {id_ for n in notifications for id_ in (n.city_id_departure, n.city_id_destination)}
+
+        async with self._session_factory() as session:
+            emails = await get_users_emails(passenger_ids, session, self._redis_con)
+            city_names = await get_city_names(session, city_ids)
+
+        await enqueue_mails(self._build_mails(notifications, emails, city_names), self._redis_con)
+
+    def _build_mails(
+        self, notifications: Iterable[RideNotificationDTO], emails: dict[UserId, str], city_names: dict[CityId, str]
+    ) -> list[MailDTO]:
+        mails: list[MailDTO] = []
+        for notification in notifications:
+            subject, content = render_notification(notification, city_names)
+            mails.extend(
+                MailDTO(content=content, email_from=self._email_from, email_to=emails[id_], subject=subject)
+                for id_ in notification.passenger_ids
+                if id_ in emails  # deleted users are skipped
+            )
+        return mails
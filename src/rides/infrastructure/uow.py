@@ -2,27 +2,41 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .repositories.city_fake import FakeCityRepository
+from shared.infrastructure.in_memory import InMemoryTransaction
+from shared.infrastructure.in_memory_outbox import InMemoryOutbox
+from shared.infrastructure.outbox_sqlalchemy import SQLAlchemyOutbox
+
+from .repositories.ride_alert_in_memory import InMemoryRideAlertRepository
+from .repositories.ride_alert_sqlalchemy import SQLAlchemyRideAlertRepository
+from .repositories.ride_in_memory import InMemoryRideRepository
 from .repositories.ride_sqlalchemy import SQLAlchemyRideRepository
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from typing import Self
 
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-    from ..domain.repositories import CityRepository, RideRepository
+    from shared.application.cache import Cache
+    from shared.application.outbox import Outbox
+    from shared.infrastructure.outbox_sqlalchemy import SQLAlchemyOutboxRelay
+
+    from ..domain.repositories import CityRepository, RideAlertRepository, RideRepository
+    from .repositories.ride_in_memory import RideInMemoryStorage
 
 
 class RideSQLAlchemyUnitOfWork:
-    """Unit of work for rides."""
+    """Unit of work for rides. The outbox relay is woken up after the commit."""
 
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], outbox_relay: SQLAlchemyOutboxRelay) -> None:
+        self._outbox_relay = outbox_relay
         self._session_factory = session_factory
         self._to_commit = False
 
     async def __aenter__(self) -> Self:
         self._session = self._session_factory()
         self._session.begin()
+        self.outbox: Outbox = SQLAlchemyOutbox(self._session)
         self.ride_repo: RideRepository = SQLAlchemyRideRepository(self._session)
         return self
 
@@ -32,6 +46,7 @@ class RideSQLAlchemyUnitOfWork:
                 await self._session.rollback()
             else:
                 await self._session.commit()
+                self._outbox_relay.wake()
         finally:
             await self._session.aclose()
 
@@ -40,17 +55,26 @@ class RideSQLAlchemyUnitOfWork:
         self._to_commit = True
 
 
-class RideSQLAlchemyCityFakeUnitOfWork:
-    """Unit of work for rides with cities."""
+class RideSQLAlchemyCityUnitOfWork:
+    """Unit of work for rides with cities. The outbox relay is woken up after the
+    commit.
+    """
 
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        city_repo: CityRepository,
+        outbox_relay: SQLAlchemyOutboxRelay,
+    ) -> None:
+        self._outbox_relay = outbox_relay
         self._session_factory = session_factory
         self._to_commit = False
+        self.city_repo = city_repo
 
     async def __aenter__(self) -> Self:
         self._session = self._session_factory()
         self._session.begin()
-        self.city_repo: CityRepository = FakeCityRepository()
+        self.outbox: Outbox = SQLAlchemyOutbox(self._session)
         self.ride_repo: RideRepository = SQLAlchemyRideRepository(self._session)
         return self
 
@@ -60,9 +84,153 @@ class RideSQLAlchemyCityFakeUnitOfWork:
                 await self._session.rollback()
             else:
                 await self._session.commit()
+                self._outbox_relay.wake()
+        finally:
+            await self._session.aclose()
+
+    def commit(self) -> None:
+        """Commit changes."""
+        self._to_commit = True
+
+
+class RideAlertSQLAlchemyUnitOfWork:
+    """Unit of work for ride alerts. The outbox relay is woken up after the commit."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        city_repo: CityRepository,
+        outbox_relay: SQLAlchemyOutboxRelay,
+    ) -> None:
+        self._outbox_relay = outbox_relay
+        self._session_factory = session_factory
+        self._to_commit = False
+        self.city_repo = city_repo
+
+    async def __aenter__(self) -> Self:
+        self._session = self._session_factory()
+        self._session.begin()
+        self.alert_repo: RideAlertRepository = SQLAlchemyRideAlertRepository(self._session)
+        self.outbox: Outbox = SQLAlchemyOutbox(self._session)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore[no-untyped-def]  # noqa: ANN001
+        try:
+            if exc_type or not self._to_commit:
+                await self._session.rollback()
+            else:
+                await self._session.commit()
+                self._outbox_relay.wake()
         finally:
             await self._session.aclose()
 
     def commit(self) -> None:
         """Commit changes."""
         self._to_commit = True
+
+
+class RideInMemoryUnitOfWork:
+    """Unit of work for rides stored in memory. The outbox is delivered after the
+    commit, published events are passed to the subscriber.
+    """
+
+    def __init__(self, storage: RideInMemoryStorage, cache: Cache, subscriber: Callable[[str, bytes], None]) -> None:
+        self._cache = cache
+        self._subscriber = subscriber
+        self._storage = storage
+        self._to_commit = False
+
+    async def __aenter__(self) -> Self:
+        self._transaction = InMemoryTransaction()
+        self._outbox = InMemoryOutbox(self._cache, self._subscriber)
+        self.outbox: Outbox = self._outbox
+        self.ride_repo: RideRepository = InMemoryRideRepository(self._storage, self._transaction)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore[no-untyped-def]  # noqa: ANN001
+        try:
+            if not exc_type and self._to_commit:
+                self._transaction.commit()
+                await self._outbox.deliver()
+        finally:
+            self._transaction.close()
+
+    def commit(self) -> None:
+        """Commit changes."""
+        self._to_commit = True
+
+
+class RideInMemoryCityUnitOfWork:
+    """Unit of work for rides stored in memory with cities. The outbox is delivered
+    after the commit, published events are passed to the subscriber.
+    """
+
+    def __init__(
+        self,
+        storage: RideInMemoryStorage,
+        city_repo: CityRepository,
+        cache: Cache,
+        subscriber: Callable[[str, bytes], None],
+    ) -> None:
+        self._cache = cache
+        self._subscriber = subscriber
+        self._storage = storage
+        self._to_commit = False
+        self.city_repo = city_repo
+
+    async def __aenter__(self) -> Self:
+        self._transaction = InMemoryTransaction()
+        self._outbox = InMemoryOutbox(self._cache, self._subscriber)
+        self.outbox: Outbox = self._outbox
+        self.ride_repo: RideRepository = InMemoryRideRepository(self._storage, self._transaction)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore[no-untyped-def]  # noqa: ANN001
+        try:
+            if not exc_type and self._to_commit:
+                self._transaction.commit()
+                await self._outbox.deliver()
+        finally:
+            self._transaction.close()
+
+    def commit(self) -> None:
+        """Commit changes."""
+        self._to_commit = True
+
+
+class RideAlertInMemoryUnitOfWork:
+    """Unit of work for ride alerts stored in memory. The outbox is delivered after
+    the commit, published events are passed to the subscriber.
+    """
+
+    def __init__(
+        self,
+        storage: RideInMemoryStorage,
+        city_repo: CityRepository,
+        cache: Cache,
+        subscriber: Callable[[str, bytes], None],
+    ) -> None:
+        self._cache = cache
+        self._subscriber = subscriber
+        self._storage = storage
+        self._to_commit = False
+        self.city_repo = city_repo
+
+    async def __aenter__(self) -> Self:
+        self._transaction = InMemoryTransaction()
+        self._outbox = InMemoryOutbox(self._cache, self._subscriber)
+        self.alert_repo: RideAlertRepository = InMemoryRideAlertRepository(self._storage, self._transaction)
+        self.outbox: Outbox = self._outbox
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore[no-untyped-def]  # noqa: ANN001
+        try:
+            if not exc_type and self._to_commit:
+                self._transaction.commit()
+                await self._outbox.deliver()
+        finally:
+            self._transaction.close()
+
+    def commit(self) -> None:
+        """Commit changes."""
+        self._to_commit = True
@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from shared.presentation.serialization import JSONBytesResponse, json_response
+
+from ...application import use_cases as uc
+from . import schemas
+from .dependencies import SuggestCitiesQueryDep
+
+router = APIRouter()
+
+
+@router.get('/suggest', response_model=dict)
+async def suggest_cities(
+    params: Annotated[schemas.SuggestCitiesParams, Query()], query_handler: SuggestCitiesQueryDep
+) -> JSONBytesResponse:
+    """Suggest cities by the typed text, the most popular first."""
+    suggest_cities_uc = uc.SuggestCitiesUsecase(query_handler)
+    cities = await suggest_cities_uc.execute(params.q, params.limit)
+
+    return json_response({'results': cities})
@@ -0,0 +1,37 @@
+"""Opaque cursors of keyset pagination: base64url of the departure time and id."""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from uuid import UUID
+
+from ...application.queries.user_rides import RideCursorDTO
+from ...domain.models import RideId
+
+
+def encode_cursor(cursor: RideCursorDTO | None) -> str | None:
+    """Return the cursor as a URL-safe string."""
+    if cursor is None:
+        return None
+
+    raw = f'{cursor.departure_time.isoformat()}|{cursor.id.hex}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(value: str) -> RideCursorDTO:
+    """Return the cursor of the string.
+
+    Raise:
+     - ValueError, if the string isn't an encoded cursor.
+    """
+    try:
+        departure_time, id = urlsafe_b64decode(value.encode()).decode().split('|')
+        cursor = RideCursorDTO(departure_time=datetime.fromisoformat(departure_time), id=RideId(UUID(id)))
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        msg = 'Invalid cursor'
+        raise ValueError(msg) from None
+
+    if cursor.departure_time.tzinfo is None:
+        msg = 'Invalid cursor'
+        raise ValueError(msg)
+    return cursor
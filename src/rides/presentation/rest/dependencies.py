@@ -0,0 +1,170 @@
+"""Storage-dependent objects of the routes, selected by STORAGE_BACKEND."""
+
+from collections.abc import AsyncGenerator
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from shared.infrastructure.config import get_settings
+from shared.presentation.cache import CacheDep
+
+from ...application.queries.complex_ride import ComplexRideQuery
+from ...application.queries.export_rows import ExportRowsQuery
+from ...application.queries.filter_rides import FilterRidesQuery
+from ...application.queries.ride_calendar import RideCalendarQuery
+from ...application.queries.search_itineraries import SearchItinerariesQuery
+from ...application.queries.suggest_cities import SuggestCitiesQuery
+from ...application.queries.user_rides import UserRidesQuery
+from ...domain.repositories import CityRepository
+from ...domain.uow import RideAlertUnitOfWork, RideCityUnitOfWork, RideUnitOfWork
+from ...infrastructure.queries.cached_in_memory_complex_ride import CachedInMemoryComplexRideQuery
+from ...infrastructure.queries.cached_sqlaclhemy_complex_ride import CachedSQLAlchemyComplexRideQuery
+from ...infrastructure.queries.city_index_suggest_cities import CityIndexSuggestCitiesQuery
+from ...infrastructure.queries.in_memory_export_rows import InMemoryExportRowsQuery
+from ...infrastructure.queries.in_memory_filter_rides import InMemoryFilterRidesQuery
+from ...infrastructure.queries.in_memory_ride_calendar import InMemoryRideCalendarQuery
+from ...infrastructure.queries.in_memory_search_itineraries import InMemorySearchItinerariesQuery
+from ...infrastructure.queries.in_memory_user_rides import InMemoryUserRidesQuery
+from ...infrastructure.queries.sqlalchemy_export_rows import SQLAlchemyExportRowsQuery
+from ...infrastructure.queries.sqlalchemy_filter_rides import SQLAlchemyFilterRidesQuery
+from ...infrastructure.queries.sqlalchemy_ride_calendar import SQLAlchemyRideCalendarQuery
+from ...infrastructure.queries.sqlalchemy_search_itineraries import SQLAlchemySearchItinerariesQuery
+from ...infrastructure.queries.sqlalchemy_user_rides import SQLAlchemyUserRidesQuery
+from ...infrastructure.repositories.city_index import CityIndex
+from ...infrastructure.ride_events_hub import RideEventsHub
+from ...infrastructure.uow import (
+    RideAlertInMemoryUnitOfWork,
+    RideAlertSQLAlchemyUnitOfWork,
+    RideInMemoryCityUnitOfWork,
+    RideInMemoryUnitOfWork,
+    RideSQLAlchemyCityUnitOfWork,
+    RideSQLAlchemyUnitOfWork,
+)
+
+
+def get_city_index(request: Request) -> CityIndex:
+    """Return the current city index. It's immutable, so it's shared by requests."""
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return request.app.state.city_index  # type: ignore[no-any-return]
+    return request.app.state.city_index_loader.index  # type: ignore[no-any-return]
+
+
+async def get_city_repo(request: Request) -> CityRepository:
+    """Return the city repository."""
+    return get_city_index(request)
+
+
+async def get_ride_uow(request: Request) -> RideUnitOfWork:
+    """Return unit of work for rides."""
+    state = request.app.state
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return RideInMemoryUnitOfWork(state.ride_storage, state.in_memory_cache, state.ride_events_hub.dispatch)
+    return RideSQLAlchemyUnitOfWork(state.db_sessionmaker, state.outbox_relay)
+
+
+async def get_ride_city_uow(request: Request) -> RideCityUnitOfWork:
+    """Return unit of work for rides with cities."""
+    state = request.app.state
+    city_repo = get_city_index(request)
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return RideInMemoryCityUnitOfWork(
+            state.ride_storage, city_repo, state.in_memory_cache, state.ride_events_hub.dispatch
+        )
+    return RideSQLAlchemyCityUnitOfWork(state.db_sessionmaker, city_repo, state.outbox_relay)
+
+
+async def get_ride_alert_uow(request: Request) -> RideAlertUnitOfWork:
+    """Return unit of work for ride alerts."""
+    state = request.app.state
+    city_repo = get_city_index(request)
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return RideAlertInMemoryUnitOfWork(
+            state.ride_storage, city_repo, state.in_memory_cache, state.ride_events_hub.dispatch
+        )
+    return RideAlertSQLAlchemyUnitOfWork(state.db_sessionmaker, city_repo, state.outbox_relay)
+
+
+async def get_filter_rides_query(request: Request) -> AsyncGenerator[FilterRidesQuery]:
+    """Yield a query for rides filtering. The DB session is closed afterwards."""
+    if get_settings().STORAGE_BACKEND == 'memory':
+        yield InMemoryFilterRidesQuery(request.app.state.ride_storage)
+        return
+
+    async with request.app.state.db_sessionmaker() as db_session:
+        yield SQLAlchemyFilterRidesQuery(db_session)
+
+
+async def get_complex_ride_query(request: Request, cache: CacheDep) -> AsyncGenerator[ComplexRideQuery]:
+    """Yield a query for full ride presentation. The DB session is closed afterwards."""
+    state = request.app.state
+    city_repo = get_city_index(request)
+    if get_settings().STORAGE_BACKEND == 'memory':
+        yield CachedInMemoryComplexRideQuery(state.ride_storage, cache, city_repo, state.user_storage)
+        return
+
+    async with state.db_sessionmaker() as db_session:
+        yield CachedSQLAlchemyComplexRideQuery(db_session, cache, city_repo, state.redis)
+
+
+async def get_ride_calendar_query(request: Request) -> AsyncGenerator[RideCalendarQuery]:
+    """Yield a query for route calendars. The DB session is closed afterwards."""
+    if get_settings().STORAGE_BACKEND == 'memory':
+        yield InMemoryRideCalendarQuery(request.app.state.ride_storage)
+        return
+
+    async with request.app.state.db_sessionmaker() as db_session:
+        yield SQLAlchemyRideCalendarQuery(db_session)
+
+
+async def get_search_itineraries_query(request: Request) -> AsyncGenerator[SearchItinerariesQuery]:
+    """Yield a query for multi-leg itineraries. The DB session is closed afterwards."""
+    state = request.app.state
+    city_index = get_city_index(request)
+    if get_settings().STORAGE_BACKEND == 'memory':
+        yield InMemorySearchItinerariesQuery(state.ride_storage, city_index, state.ride_connections_days)
+        return
+
+    async with state.db_sessionmaker() as db_session:
+        yield SQLAlchemySearchItinerariesQuery(db_session, city_index, state.ride_connections_days)
+
+
+async def get_user_rides_query(request: Request) -> AsyncGenerator[UserRidesQuery]:
+    """Yield a query for the user's rides. The DB session is closed afterwards."""
+    if get_settings().STORAGE_BACKEND == 'memory':
+        yield InMemoryUserRidesQuery(request.app.state.ride_storage)
+        return
+
+    async with request.app.state.db_sessionmaker() as db_session:
+        yield SQLAlchemyUserRidesQuery(db_session)
+
+
+async def get_export_rows_query(request: Request) -> ExportRowsQuery:
+    """Return a query for analytics exports, it opens a DB session of its own."""
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return InMemoryExportRowsQuery(request.app.state.ride_storage)
+
+    return SQLAlchemyExportRowsQuery(request.app.state.db_sessionmaker)
+
+
+async def get_ride_events_hub(request: Request) -> RideEventsHub:
+    """Return the hub of ride events of the process."""
+    return request.app.state.ride_events_hub  # type: ignore[no-any-return]
+
+
+async def get_suggest_cities_query(request: Request) -> SuggestCitiesQuery:
+    """Return a query for cities autocomplete."""
+    return CityIndexSuggestCitiesQuery(get_city_index(request))
+
+
+CityRepoDep = Annotated[CityRepository, Depends(get_city_repo)]
+ComplexRideQueryDep = Annotated[ComplexRideQuery, Depends(get_complex_ride_query)]
+ExportRowsQueryDep = Annotated[ExportRowsQuery, Depends(get_export_rows_query)]
+FilterRidesQueryDep = Annotated[FilterRidesQuery, Depends(get_filter_rides_query)]
+RideAlertUoWDep = Annotated[RideAlertUnitOfWork, Depends(get_ride_alert_uow)]
+RideCalendarQueryDep = Annotated[RideCalendarQuery, Depends(get_ride_calendar_query)]
+RideEventsHubDep = Annotated[RideEventsHub, Depends(get_ride_events_hub)]
+RideCityUoWDep = Annotated[RideCityUnitOfWork, Depends(get_ride_city_uow)]
+RideUoWDep = Annotated[RideUnitOfWork, Depends(get_ride_uow)]
+SearchItinerariesQueryDep = Annotated[SearchItinerariesQuery, Depends(get_search_itineraries_query)]
+SuggestCitiesQueryDep = Annotated[SuggestCitiesQuery, Depends(get_suggest_cities_query)]
+UserRidesQueryDep = Annotated[UserRidesQuery, Depends(get_user_rides_query)]
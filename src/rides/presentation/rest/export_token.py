@@ -0,0 +1,20 @@
+from secrets import compare_digest
+from typing import Annotated
+
+from fastapi import Depends, status
+from fastapi.security import APIKeyHeader
+
+from shared.infrastructure.config import get_settings
+from shared.presentation.errors import APIError
+
+export_token_header = APIKeyHeader(name='X-Export-Token', auto_error=False)
+
+
+def check_export_token(token: Annotated[str | None, Depends(export_token_header)]) -> None:
+    """Allow analytics exports with EXPORT_TOKEN only, compared in constant time."""
+    expected = get_settings().EXPORT_TOKEN
+    if not (expected and token and compare_digest(token.encode(), expected.encode())):
+        raise APIError(status.HTTP_403_FORBIDDEN, None, 'Invalid export token')
+
+
+ExportTokenDep = Annotated[None, Depends(check_export_token)]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ...constants import EVENTS_HEARTBEAT_SECS
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+    from ...domain.models import RideId
+    from ...infrastructure.ride_events_hub import RideEventsHub
+
+RETRY_FRAME = b'retry: 5000\n\n'  # clients reconnect in 5 secs
+HEARTBEAT_FRAME = b': heartbeat\n\n'
+
+
+async def stream_ride_events(hub: RideEventsHub, ride_ids: Iterable[RideId]) -> AsyncIterator[bytes]:
+    """Yield server-sent events of the rides till the client disconnects. Events of
+    a ride that came while the connection was busy are merged into the latest one.
+    """
+    with hub.subscribe(ride_ids) as subscription:
+        yield RETRY_FRAME
+        while True:
+            frames = await subscription.get(EVENTS_HEARTBEAT_SECS)
+            yield b''.join(frames) if frames else HEARTBEAT_FRAME
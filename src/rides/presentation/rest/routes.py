@@ -1,50 +1,129 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from auth import UserBearerAuthDep
 from shared import errors as shared_errs
-from shared.infrastructure.redis import common as common_redis
-from shared.infrastructure.redis_cache import RedisCache
-from shared.infrastructure.sqlalchemy import sessionmaker as db_sessionmaker
+from shared.presentation.compression import precompressed_response
+from shared.presentation.errors import APIError
 from shared.presentation.idempotency_header import IdempotencyDep
+from shared.presentation.serialization import JSONBytesResponse, json_response
 
 from ...application import use_cases as uc
-from ...domain.models import OwnerId, PassengerId, Ride, RideId
-from ...errors import ActiveRideNotFoundError
-from ...infrastructure.queries.cached_sqlaclhemy_complex_ride import CachedSQLAlchemyComplexRideQuery, ComplexRideDTO
-from ...infrastructure.queries.sqlalchemy_filter_rides import SQLAlchemyFilterRidesQuery
-from ...infrastructure.repositories.city_fake import FakeCityRepository
-from ...infrastructure.uow import RideSQLAlchemyCityFakeUnitOfWork, RideSQLAlchemyUnitOfWork
+from ...application.queries.complex_ride import ComplexRideDTO
+from ...application.queries.ride_calendar import CalendarFilterDTO
+from ...application.queries.search_itineraries import ItinerariesFilterDTO
+from ...constants import RIDE_COMPLEX_CACHE_KEY
+from ...domain.models import OwnerId, PassengerId, RideAlertId, RideId, RideSeriesId
+from ...errors import ActiveRideNotFoundError, RideAlertNotFoundError, RideSeriesNotFoundError
+from ..ride_export import encode_csv
+from ..ride_import import ImportFormat, read_import_batches
 from . import schemas
+from .dependencies import (
+    CityRepoDep,
+    ComplexRideQueryDep,
+    ExportRowsQueryDep,
+    FilterRidesQueryDep,
+    RideAlertUoWDep,
+    RideCalendarQueryDep,
+    RideCityUoWDep,
+    RideEventsHubDep,
+    RideUoWDep,
+    SearchItinerariesQueryDep,
+)
+from .export_token import ExportTokenDep
+from .ride_events import stream_ride_events
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+IMPORT_FORMATS: dict[str, ImportFormat] = {'text/csv': 'csv', NDJSON_MEDIA_TYPE: 'ndjson'}
 
 router = APIRouter()
 
 
-@router.get('')
-async def filter_rides(params: Annotated[schemas.FilterRidesParams, Query()]) -> dict:  # type: ignore[type-arg]
-    """Filter rides by cities, date and available seats."""
-    params_dto = uc.FilterParamsDTO(
-        city_id_departure=params.city_id_departure,
-        city_id_destination=params.city_id_destination,
-        departure_date=params.departure_date,
-        min_seats_available=params.min_seats_available,
+@router.get('', response_model=dict)
+async def filter_rides(
+    params: Annotated[schemas.FilterRidesParams, Query()], query_handler: FilterRidesQueryDep, city_repo: CityRepoDep
+) -> JSONBytesResponse:
+    """Filter rides by cities, date, time window, max price and available seats."""
+    params_dto = uc.FilterParamsDTO(**params.model_dump())
+
+    filter_rides_uc = uc.FilterRidesUsecase(query_handler, city_repo)
+    rides = await filter_rides_uc.execute(params_dto)
+
+    return json_response({'results': rides})
+
+
+@router.get('/calendar', response_model=dict)
+async def get_ride_calendar(
+    params: Annotated[schemas.RideCalendarParams, Query()], query_handler: RideCalendarQueryDep
+) -> JSONBytesResponse:
+    """Get rides count, min prices and max seats available per day of the route."""
+    get_calendar_uc = uc.GetRideCalendarUsecase(query_handler)
+    calendar = await get_calendar_uc.execute(CalendarFilterDTO(**params.model_dump()))
+
+    return json_response({'results': calendar})
+
+
+@router.get(
+    '/events',
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {'content': {'text/event-stream': {}}, 'description': 'Server-sent events'}},
+)
+async def stream_events(
+    params: Annotated[schemas.RideEventsParams, Query()], hub: RideEventsHubDep
+) -> StreamingResponse:
+    """Stream seats availability and cancellation of the rides as server-sent events.
+    An event is named by the change (booked, left, updated, cancelled), its data is
+    the ride's state.
+    """
+    return StreamingResponse(
+        stream_ride_events(hub, params.ride_ids),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {'content': {'text/csv': {}}, 'description': 'CSV with a header'}},
+)
+async def export_rows(
+    params: Annotated[schemas.ExportParams, Query()], token: ExportTokenDep, query_handler: ExportRowsQueryDep
+) -> StreamingResponse:
+    """Export rides or passengers created since the time for analytics, as CSV
+    streamed by chunks. X-Export-Until is since of the next incremental export.
+    """
+    export_rows_uc = uc.ExportRowsUsecase(query_handler)
+    export = export_rows_uc.execute(params.table, params.since)
+
+    return StreamingResponse(
+        encode_csv(export.columns, export.chunks),
+        media_type='text/csv',
+        headers={
+            'Content-Disposition': f'attachment; filename="{params.table}.csv"',
+            'X-Export-Until': export.until.isoformat(),
+        },
     )
 
-    async with db_sessionmaker() as db_session:
-        query_handler = SQLAlchemyFilterRidesQuery(db_session)
-        filter_rides_uc = uc.FilterRidesUsecase(query_handler)
-        rides = await filter_rides_uc.execute(params_dto)
 
-    return {'results': rides}
+@router.get('/itineraries', response_model=dict)
+async def search_itineraries(
+    params: Annotated[schemas.SearchItinerariesParams, Query()], query_handler: SearchItinerariesQueryDep
+) -> JSONBytesResponse:
+    """Search itineraries between cities, with transfers if direct rides are missing."""
+    search_itineraries_uc = uc.SearchItinerariesUsecase(query_handler)
+    itineraries = await search_itineraries_uc.execute(ItinerariesFilterDTO(**params.model_dump()))
 
+    return json_response({'results': itineraries})
 
-@router.post('', status_code=status.HTTP_201_CREATED)
+
+@router.post('', status_code=status.HTTP_201_CREATED, response_model=uc.CreateRideReturnDTO)
 async def create_ride(
-    body: schemas.CreateRideRequest, user_id: UserBearerAuthDep, idempotency: IdempotencyDep
-) -> uc.CreateRideReturnDTO:
+    body: schemas.CreateRideRequest, user_id: UserBearerAuthDep, idempotency: IdempotencyDep, uow: RideCityUoWDep
+) -> JSONBytesResponse:
     """Create a new ride."""
-    uow = RideSQLAlchemyCityFakeUnitOfWork(db_sessionmaker)
     create_ride_uc = uc.CreateRideUsecase(uow)
 
     price = uc.PriceDTO(**body.price.model_dump())
@@ -53,91 +132,261 @@ async def create_ride(
         owner_id=OwnerId(user_id), price=price, route=route, **body.model_dump(exclude={'price', 'route'})
     )
     try:
-        return await create_ride_uc.execute(ride_data)
+        ride = await create_ride_uc.execute(ride_data)
+    except shared_errs.ProjectError as err:
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+
+    return json_response(ride, status_code=status.HTTP_201_CREATED)
+
+
+@router.post('/alerts', status_code=status.HTTP_201_CREATED, response_model=schemas.RideAlertResponse)
+async def create_ride_alert(
+    body: schemas.CreateRideAlertRequest, user_id: UserBearerAuthDep, idempotency: IdempotencyDep, uow: RideAlertUoWDep
+) -> JSONBytesResponse:
+    """Create an alert, the user is mailed of rides of the route and day with seats."""
+    create_alert_uc = uc.CreateRideAlertUsecase(uow)
+
+    max_price = uc.PriceDTO(**body.max_price.model_dump()) if body.max_price else None
+    route = uc.RouteDTO(**body.route.model_dump())
+    alert_data = uc.CreateRideAlertDTO(day=body.day, max_price=max_price, route=route, user_id=user_id)
+    try:
+        alert = await create_alert_uc.execute(alert_data)
+    except shared_errs.ProjectError as err:
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+
+    return json_response(alert, schemas.RideAlertResponse, status_code=status.HTTP_201_CREATED)
+
+
+@router.delete('/alerts/{alert_id}', status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+async def delete_ride_alert(alert_id: RideAlertId, user_id: UserBearerAuthDep, uow: RideAlertUoWDep) -> None:
+    """Delete the alert."""
+    delete_alert_uc = uc.DeleteRideAlertUsecase(uow)
+
+    try:
+        await delete_alert_uc.execute(alert_id, user_id)
+    except RideAlertNotFoundError as err:
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+
+
+@router.post('/series', status_code=status.HTTP_201_CREATED, response_model=uc.RideSeriesReturnDTO)
+async def create_ride_series(
+    body: schemas.CreateRideSeriesRequest, user_id: UserBearerAuthDep, idempotency: IdempotencyDep, uow: RideCityUoWDep
+) -> JSONBytesResponse:
+    """Create rides departing on the weekdays at once."""
+    create_series_uc = uc.CreateRideSeriesUsecase(uow)
+
+    price = uc.PriceDTO(**body.price.model_dump())
+    route = uc.RouteDTO(**body.route.model_dump())
+    ride_data = uc.CreateRideDTO(
+        owner_id=OwnerId(user_id),
+        price=price,
+        route=route,
+        **body.model_dump(exclude={'price', 'route', 'until', 'weekdays'}),
+    )
+    series_data = uc.CreateRideSeriesDTO(ride=ride_data, until=body.until, weekdays=frozenset(body.weekdays))
+    try:
+        series = await create_series_uc.execute(series_data)
+    except shared_errs.ProjectError as err:
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+
+    return json_response(series, status_code=status.HTTP_201_CREATED)
+
+
+@router.patch('/series/{series_id}', response_model=uc.RideSeriesReturnDTO)
+async def update_ride_series(
+    series_id: RideSeriesId,
+    body: schemas.UpdateRideSeriesRequest,
+    user_id: UserBearerAuthDep,
+    idempotency: IdempotencyDep,
+    uow: RideUoWDep,
+) -> JSONBytesResponse:
+    """Update the upcoming rides of the series without passengers, return them."""
+    update_series_uc = uc.UpdateRideSeriesUsecase(uow)
+
+    body_dict = body.model_dump(exclude_unset=True)
+    if body.price:
+        body_dict['price'] = uc.PriceDTO(**body.price.model_dump())
+    series_data = uc.UpdateRideSeriesDTO(fields_to_update=tuple(body_dict.keys()), **body_dict)
+    try:
+        series = await update_series_uc.execute(series_id, OwnerId(user_id), series_data)
+    except RideSeriesNotFoundError as err:
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+
+    return json_response(series)
+
+
+@router.post('/series/{series_id}/cancel', response_model=uc.RideSeriesReturnDTO)
+async def cancel_ride_series(series_id: RideSeriesId, user_id: UserBearerAuthDep, uow: RideUoWDep) -> JSONBytesResponse:
+    """Cancel the upcoming rides of the series, return them."""
+    cancel_series_uc = uc.CancelRideSeriesUsecase(uow)
+
+    try:
+        series = await cancel_series_uc.execute(series_id, OwnerId(user_id))
+    except RideSeriesNotFoundError as err:
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+
+    return json_response(series)
+
+
+@router.post(
+    '/import',
+    response_model=uc.ImportRidesReturnDTO,
+    openapi_extra={
+        'requestBody': {
+            'content': {'text/csv': {'schema': {'type': 'string'}}, NDJSON_MEDIA_TYPE: {'schema': {'type': 'string'}}},
+            'description': f'CSV with a header or NDJSON, fields: {", ".join(schemas.ImportRideRow.model_fields)}',
+            'required': True,
+        }
+    },
+)
+async def import_rides(
+    request: Request, user_id: UserBearerAuthDep, idempotency: IdempotencyDep, uow: RideCityUoWDep
+) -> JSONBytesResponse:
+    """Create the user's rides of a streamed CSV or NDJSON, report rejected rows by
+    their lines. Batches of valid rows are created as they're read.
+    """
+    media_type = request.headers.get('content-type', '').split(';')[0].strip()
+    if media_type not in IMPORT_FORMATS:
+        raise APIError(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, None, f'Content type must be {" or ".join(IMPORT_FORMATS)}'
+        )
+
+    import_rides_uc = uc.ImportRidesUsecase(uow)
+    try:
+        report = await import_rides_uc.execute(
+            OwnerId(user_id), read_import_batches(request.stream(), IMPORT_FORMATS[media_type])
+        )
     except shared_errs.ProjectError as err:
-        raise shared_errs.APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
 
+    return json_response(report)
 
-@router.get('/{ride_id}')
-async def get_complex_ride(ride_id: RideId) -> ComplexRideDTO:
+
+@router.get('/{ride_id}', response_model=ComplexRideDTO)
+async def get_complex_ride(ride_id: RideId, query_handler: ComplexRideQueryDep, request: Request) -> JSONBytesResponse:
     """Get full ride data along with passengers and cities data."""
-    cache = RedisCache(common_redis)
-    city_repo = FakeCityRepository()
-    async with db_sessionmaker() as db_session:
-        query_handler = CachedSQLAlchemyComplexRideQuery(db_session, cache, city_repo)
-        get_ride_uc = uc.GetComplexRideUsecase(query_handler)
+    get_ride_uc = uc.GetComplexRideUsecase(query_handler)
 
-        try:
-            return await get_ride_uc.execute(ride_id)
-        except shared_errs.NotFoundError as err:
-            raise shared_errs.APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+    try:
+        ride = await get_ride_uc.execute(ride_id)
+    except shared_errs.NotFoundError as err:
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+
+    # The fields which may change, the others are set on the ride creating
+    version = (
+        ride.departure_time,
+        ride.description,
+        ride.is_cancelled,
+        tuple(ride.passengers),
+        ride.price,
+        ride.route,
+        ride.seats_available,
+        ride.seats_number,
+    )
+    return await precompressed_response(request, ride, RIDE_COMPLEX_CACHE_KEY.format(ride_id=ride_id), version)
 
 
 @router.patch('/{ride_id}', response_model=schemas.UpdateRideResponse)
 async def update_ride(
-    ride_id: RideId, body: schemas.UpdateRideRequest, user_id: UserBearerAuthDep, idempotency: IdempotencyDep
-) -> Ride:
+    ride_id: RideId,
+    body: schemas.UpdateRideRequest,
+    user_id: UserBearerAuthDep,
+    idempotency: IdempotencyDep,
+    uow: RideUoWDep,
+) -> JSONBytesResponse:
     """Update the ride."""
-    uow = RideSQLAlchemyUnitOfWork(db_sessionmaker)
-    cache = RedisCache(common_redis)
-    update_ride_uc = uc.UpdateRideUsecase(uow, cache)
+    update_ride_uc = uc.UpdateRideUsecase(uow)
 
     body_dict = body.model_dump(exclude_unset=True)
     ride_data = uc.UpdateRideDTO(fields_to_update=tuple(body_dict.keys()), **body_dict)
     try:
-        return await update_ride_uc.execute(ride_id, OwnerId(user_id), ride_data)
+        ride = await update_ride_uc.execute(ride_id, OwnerId(user_id), ride_data)
     except ActiveRideNotFoundError as err:
-        raise shared_errs.APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
     except shared_errs.ForbiddenError as err:
-        raise shared_errs.APIError(status.HTTP_403_FORBIDDEN, err.code, err.detail) from None
+        raise APIError(status.HTTP_403_FORBIDDEN, err.code, err.detail) from None
     except shared_errs.ProjectError as err:
-        raise shared_errs.APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+
+    return json_response(ride, schemas.UpdateRideResponse)
 
 
 @router.post('/{ride_id}/book', status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 async def book_ride(
-    ride_id: RideId, body: schemas.BookRideRequest, user_id: UserBearerAuthDep, idempotency: IdempotencyDep
+    ride_id: RideId,
+    body: schemas.BookRideRequest,
+    user_id: UserBearerAuthDep,
+    idempotency: IdempotencyDep,
+    uow: RideUoWDep,
 ) -> None:
     """Book the ride."""
-    uow = RideSQLAlchemyUnitOfWork(db_sessionmaker)
-    cache = RedisCache(common_redis)
-    book_ride_uc = uc.BookRideUsecase(uow, cache)
+    book_ride_uc = uc.BookRideUsecase(uow)
 
     try:
         await book_ride_uc.execute(ride_id, PassengerId(user_id), body.seats_booked)
     except ActiveRideNotFoundError as err:
-        raise shared_errs.APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
     except shared_errs.ProjectError as err:
-        raise shared_errs.APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
 
 
 @router.post('/{ride_id}/cancel', status_code=status.HTTP_204_NO_CONTENT, response_model=None)
-async def cancel_ride(ride_id: RideId, user_id: UserBearerAuthDep) -> None:
+async def cancel_ride(ride_id: RideId, user_id: UserBearerAuthDep, uow: RideUoWDep) -> None:
     """Cancel the ride."""
-    uow = RideSQLAlchemyUnitOfWork(db_sessionmaker)
-    cache = RedisCache(common_redis)
-    cancel_ride_uc = uc.CancelRideUsecase(uow, cache)
+    cancel_ride_uc = uc.CancelRideUsecase(uow)
 
     try:
         await cancel_ride_uc.execute(ride_id, OwnerId(user_id))
     except ActiveRideNotFoundError as err:
-        raise shared_errs.APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
     except shared_errs.ForbiddenError as err:
-        raise shared_errs.APIError(status.HTTP_403_FORBIDDEN, err.code, err.detail) from None
+        raise APIError(status.HTTP_403_FORBIDDEN, err.code, err.detail) from None
     except shared_errs.ProjectError as err:
-        raise shared_errs.APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
 
 
 @router.post('/{ride_id}/leave', status_code=status.HTTP_204_NO_CONTENT, response_model=None)
-async def leave_ride(ride_id: RideId, user_id: UserBearerAuthDep, idempotency: IdempotencyDep) -> None:
+async def leave_ride(ride_id: RideId, user_id: UserBearerAuthDep, idempotency: IdempotencyDep, uow: RideUoWDep) -> None:
     """Leave the ride."""
-    uow = RideSQLAlchemyUnitOfWork(db_sessionmaker)
-    cache = RedisCache(common_redis)
-    leave_ride_uc = uc.LeaveRideUsecase(uow, cache)
+    leave_ride_uc = uc.LeaveRideUsecase(uow)
 
     try:
         await leave_ride_uc.execute(ride_id, PassengerId(user_id))
     except ActiveRideNotFoundError as err:
-        raise shared_errs.APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+    except shared_errs.ProjectError as err:
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+
+
+@router.post('/{ride_id}/waitlist', status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+async def join_waitlist(
+    ride_id: RideId,
+    body: schemas.JoinWaitlistRequest,
+    user_id: UserBearerAuthDep,
+    idempotency: IdempotencyDep,
+    uow: RideUoWDep,
+) -> None:
+    """Join the waitlist of the full ride, the seats are booked once freed."""
+    join_waitlist_uc = uc.JoinWaitlistUsecase(uow)
+
+    try:
+        await join_waitlist_uc.execute(ride_id, PassengerId(user_id), body.seats_requested)
+    except ActiveRideNotFoundError as err:
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
+    except shared_errs.ProjectError as err:
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+
+
+@router.delete('/{ride_id}/waitlist', status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+async def leave_waitlist(
+    ride_id: RideId, user_id: UserBearerAuthDep, idempotency: IdempotencyDep, uow: RideUoWDep
+) -> None:
+    """Leave the waitlist of the ride."""
+    leave_waitlist_uc = uc.LeaveWaitlistUsecase(uow)
+
+    try:
+        await leave_waitlist_uc.execute(ride_id, PassengerId(user_id))
+    except ActiveRideNotFoundError as err:
+        raise APIError(status.HTTP_404_NOT_FOUND, err.code, err.detail) from None
     except shared_errs.ProjectError as err:
-        raise shared_errs.APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
+        raise APIError(status.HTTP_400_BAD_REQUEST, err.code, err.detail) from None
@@ -1,10 +1,20 @@
-from datetime import UTC, datetime, timedelta
-from typing import Annotated, Self
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Annotated, Literal, Self
 
 from pydantic import AwareDatetime, BaseModel, Field, FutureDate, field_validator, model_validator
 
-from ...constants import MAX_VEHICLE_SEATS
-from ...domain.models import CityId, Currency
+from ...constants import (
+    MAX_CALENDAR_DAYS,
+    MAX_CITY_SUGGESTIONS,
+    MAX_DEPARTURE_DAYS,
+    MAX_EVENTS_RIDES,
+    MAX_ITINERARIES,
+    MAX_SEARCH_RADIUS_KM,
+    MAX_USER_RIDES_PAGE,
+    MAX_VEHICLE_SEATS,
+)
+from ...domain.models import CityId, Currency, RideAlertId, RideId
+from .cursors import decode_cursor
 
 
 class PriceBaseSchema(BaseModel):
@@ -52,13 +62,58 @@ class CreateRideRequest(BaseModel):
     @field_validator('departure_time', mode='after')
     @classmethod
     def check_departure_time(cls, value: datetime) -> datetime:
-        """Departure time must be at least an hour later."""
-        if value < datetime.now(UTC) + timedelta(hours=1):
+        """Departure time must be at least an hour later, within MAX_DEPARTURE_DAYS."""
+        now = datetime.now(UTC)
+        if value < now + timedelta(hours=1):
             msg = 'Departure time must be at least an hour later than the current time'
             raise ValueError(msg)
+        if value > now + timedelta(days=MAX_DEPARTURE_DAYS):
+            msg = f'Departure time must be within {MAX_DEPARTURE_DAYS} days'
+            raise ValueError(msg)
         return value
 
 
+class CreateRideSeriesRequest(CreateRideRequest):
+    """Create ride series request schema.
+
+    departure_time is of the first ride, the rides depart at its time with its UTC
+    offset on the weekdays (ISO, 1 is Monday) till the day until inclusive.
+    """
+
+    until: date
+    weekdays: Annotated[set[Annotated[int, Field(ge=1, le=7)]], Field(min_length=1)]
+
+    @model_validator(mode='after')
+    def check_until(self) -> Self:
+        """Check the last day is from the first one till MAX_DEPARTURE_DAYS."""
+        last_departure_time = datetime.combine(self.until, self.departure_time.timetz())
+        max_departure_time = datetime.now(UTC) + timedelta(days=MAX_DEPARTURE_DAYS)
+        if self.until < self.departure_time.date() or last_departure_time > max_departure_time:
+            msg = f'until must be from the day of departure_time till {MAX_DEPARTURE_DAYS} days later'
+            raise ValueError(msg)
+        return self
+
+
+class ImportRideRow(BaseModel):
+    """A row of a ride import, the fields are CSV columns or NDJSON keys. Departure
+    time and prices are checked as on a ride creating.
+    """
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_time: AwareDatetime
+    description: Annotated[str | None, Field(max_length=500)] = None
+    price_currency: Currency
+    price_value: Annotated[int, Field(gt=0, lt=10_000_000)]
+    seats_number: Annotated[int, Field(ge=1, le=MAX_VEHICLE_SEATS)]
+
+    @field_validator('description', mode='before')
+    @classmethod
+    def empty_to_none(cls, value: object) -> object:
+        """Treat an empty CSV value as no description."""
+        return None if value == '' else value
+
+
 class UpdateRideRequest(BaseModel):
     """Update user request schema."""
 
@@ -70,10 +125,14 @@ class UpdateRideRequest(BaseModel):
     @field_validator('departure_time', mode='after')
     @classmethod
     def check_departure_time(cls, value: datetime) -> datetime:
-        """Departure time must be at least an hour later."""
-        if value < datetime.now(UTC) + timedelta(hours=1):
+        """Departure time must be at least an hour later, within MAX_DEPARTURE_DAYS."""
+        now = datetime.now(UTC)
+        if value < now + timedelta(hours=1):
             msg = 'Departure time must be at least an hour later than the current time'
             raise ValueError(msg)
+        if value > now + timedelta(days=MAX_DEPARTURE_DAYS):
+            msg = f'Departure time must be within {MAX_DEPARTURE_DAYS} days'
+            raise ValueError(msg)
         return value
 
     @model_validator(mode='after')
@@ -94,16 +153,159 @@ class UpdateRideResponse(BaseModel):
     seats_number: int
 
 
+class UpdateRideSeriesRequest(BaseModel):
+    """Update ride series request schema."""
+
+    description: Annotated[str | None, Field(max_length=500)] = None
+    price: PriceInputSchema | None = None
+    seats_number: Annotated[int, Field(ge=1, le=MAX_VEHICLE_SEATS)] | None = None
+
+    @model_validator(mode='after')
+    def require_one_field(self) -> Self:
+        """Require at least one field."""
+        if not any([self.description, self.price, self.seats_number]):
+            msg = 'At least one field required'
+            raise ValueError(msg)
+        return self
+
+
+class CreateRideAlertRequest(BaseModel):
+    """Create ride alert request schema. The day of departure is in UTC."""
+
+    day: date
+    max_price: PriceInputSchema | None = None
+    route: RouteInputSchema
+
+    @field_validator('day', mode='after')
+    @classmethod
+    def check_day(cls, value: date) -> date:
+        """Check the day is from today till MAX_DEPARTURE_DAYS."""
+        today = datetime.now(UTC).date()
+        if not today <= value <= today + timedelta(days=MAX_DEPARTURE_DAYS):
+            msg = f'The day must be from today till {MAX_DEPARTURE_DAYS} days later'
+            raise ValueError(msg)
+        return value
+
+
+class RideAlertResponse(BaseModel):
+    """Ride alert response schema."""
+
+    day: date
+    id: RideAlertId
+    max_price: PriceBaseSchema | None
+    route: RouteBaseSchema
+
+
+class ExportParams(BaseModel):
+    """Request params. since is X-Export-Until of the previous export, without it all
+    the rows are exported.
+    """
+
+    since: AwareDatetime | None = None
+    table: Literal['passengers', 'rides']
+
+
 class FilterRidesParams(BaseModel):
+    """Request params. Departure times are times of the day in UTC."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    departure_date: FutureDate
+    departure_time_from: time | None = None
+    departure_time_to: time | None = None
+    max_price_currency: Currency | None = None
+    max_price_value: Annotated[int | None, Field(gt=0)] = None
+    min_seats_available: Annotated[int, Field(ge=1, le=MAX_VEHICLE_SEATS)]
+    radius_km: Annotated[int | None, Field(ge=1, le=MAX_SEARCH_RADIUS_KM)] = None
+    sort_by: Literal['departure_time', 'price'] = 'departure_time'
+
+    @field_validator('departure_time_from', 'departure_time_to', mode='after')
+    @classmethod
+    def check_time_is_naive(cls, value: time | None) -> time | None:
+        """Reject offsets, times are in UTC."""
+        if value is not None and value.tzinfo is not None:
+            msg = 'Time must be in UTC without an offset'
+            raise ValueError(msg)
+        return value
+
+    @model_validator(mode='after')
+    def check_filters(self) -> Self:
+        """Check the time window and that max price has a currency."""
+        if self.departure_time_from and self.departure_time_to and self.departure_time_from >= self.departure_time_to:
+            msg = 'departure_time_to must be later than departure_time_from'
+            raise ValueError(msg)
+
+        if (self.max_price_currency is None) != (self.max_price_value is None):
+            msg = 'max_price_currency and max_price_value must be set together'
+            raise ValueError(msg)
+
+        return self
+
+
+class RideCalendarParams(BaseModel):
+    """Request params."""
+
+    city_id_departure: CityId
+    city_id_destination: CityId
+    date_from: date
+    date_to: date
+
+    @model_validator(mode='after')
+    def check_dates(self) -> Self:
+        """Check the range of days."""
+        if not 0 <= (self.date_to - self.date_from).days < MAX_CALENDAR_DAYS:
+            msg = f'date_to must be from date_from to {MAX_CALENDAR_DAYS - 1} days later'
+            raise ValueError(msg)
+
+        return self
+
+
+class RideEventsParams(BaseModel):
+    """Request params."""
+
+    ride_ids: Annotated[list[RideId], Field(min_length=1, max_length=MAX_EVENTS_RIDES)]
+
+
+class SearchItinerariesParams(BaseModel):
     """Request params."""
 
     city_id_departure: CityId
     city_id_destination: CityId
     departure_date: FutureDate
+    limit: Annotated[int, Field(ge=1, le=MAX_ITINERARIES)] = 5
     min_seats_available: Annotated[int, Field(ge=1, le=MAX_VEHICLE_SEATS)]
 
 
+class SuggestCitiesParams(BaseModel):
+    """Request params."""
+
+    limit: Annotated[int, Field(ge=1, le=MAX_CITY_SUGGESTIONS)] = 10
+    q: Annotated[str, Field(min_length=1, max_length=100)]
+
+
+class UserRidesParams(BaseModel):
+    """Request params. The cursor is next_cursor of the previous page."""
+
+    cursor: Annotated[str | None, Field(max_length=200)] = None
+    limit: Annotated[int, Field(ge=1, le=MAX_USER_RIDES_PAGE)] = 20
+    period: Literal['past', 'upcoming'] = 'upcoming'
+
+    @field_validator('cursor', mode='after')
+    @classmethod
+    def check_cursor(cls, value: str | None) -> str | None:
+        """Check the cursor can be decoded."""
+        if value is not None:
+            decode_cursor(value)
+        return value
+
+
 class BookRideRequest(BaseModel):
     """Book ride schema."""
 
     seats_booked: int
+
+
+class JoinWaitlistRequest(BaseModel):
+    """Join waitlist schema."""
+
+    seats_requested: int
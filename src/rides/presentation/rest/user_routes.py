@@ -0,0 +1,48 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from auth import UserBearerAuthDep
+from shared.presentation.serialization import JSONBytesResponse, json_response
+
+from ...application import use_cases as uc
+from ...application.queries.user_rides import UserRole
+from . import schemas
+from .cursors import decode_cursor, encode_cursor
+from .dependencies import UserRidesQueryDep
+
+router = APIRouter()
+
+
+@router.get('/rides', response_model=dict)
+async def list_my_rides(
+    params: Annotated[schemas.UserRidesParams, Query()], user_id: UserBearerAuthDep, query_handler: UserRidesQueryDep
+) -> JSONBytesResponse:
+    """List rides of the user as the owner. Upcoming ones go soonest first, past ones
+    latest first.
+    """
+    return await _list_user_rides(params, user_id, 'owner', query_handler)
+
+
+@router.get('/bookings', response_model=dict)
+async def list_my_bookings(
+    params: Annotated[schemas.UserRidesParams, Query()], user_id: UserBearerAuthDep, query_handler: UserRidesQueryDep
+) -> JSONBytesResponse:
+    """List rides the user has booked with the booked seats, ordered as own rides."""
+    return await _list_user_rides(params, user_id, 'passenger', query_handler)
+
+
+async def _list_user_rides(
+    params: schemas.UserRidesParams, user_id: UserBearerAuthDep, role: UserRole, query_handler: UserRidesQueryDep
+) -> JSONBytesResponse:
+    params_dto = uc.UserRidesParamsDTO(
+        cursor=decode_cursor(params.cursor) if params.cursor else None,
+        limit=params.limit,
+        period=params.period,
+        role=role,
+        user_id=user_id,
+    )
+    list_user_rides_uc = uc.ListUserRidesUsecase(query_handler)
+    page = await list_user_rides_uc.execute(params_dto)
+
+    return json_response({'next_cursor': encode_cursor(page.next_cursor), 'results': page.results})
@@ -0,0 +1,30 @@
+"""Encoding of analytics exports, shared by the REST endpoint and the CLI
+(export_rides.py).
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
+
+async def encode_csv(
+    columns: Sequence[str], chunks: AsyncIterable[Sequence[tuple[object, ...]]]
+) -> AsyncIterator[bytes]:
+    """Yield the header, then a piece of CSV per chunk of rows, so only a chunk is in
+    memory. Values are written as str(), e.g. 2026-10-19 08:30:00+00:00 for times,
+    None is empty.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    def pop() -> bytes:
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value.encode()
+
+    writer.writerow(columns)
+    yield pop()
+    async for chunk in chunks:
+        writer.writerows(chunk)
+        yield pop()
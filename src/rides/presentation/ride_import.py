@@ -0,0 +1,182 @@
+"""Parsing of ride imports, shared by the REST endpoint and the CLI (import_rides.py).
+
+Input is streamed: CSV with a header, or NDJSON of objects, both with the fields of
+ImportRideRow. Records are collected to batches of IMPORT_BATCH_SIZE, each batch is
+validated by one call of pydantic in a thread, so requests are served meanwhile,
+rejected rows are reported by their lines.
+"""
+
+import asyncio
+import csv
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, Literal
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
+
+from ..application import use_cases as uc
+from ..constants import IMPORT_BATCH_SIZE
+from ..errors import ImportHeaderError
+from .rest.schemas import ImportRideRow
+
+type ImportFormat = Literal['csv', 'ndjson']
+type ImportRecord = tuple[int, dict[str, Any] | str]  # the first line and the values or an error
+
+MAX_RECORD_BYTES = 10_000  # longer records are rejected, e.g. of an unclosed quote
+RECORD_TOO_LONG = f'The record is longer than {MAX_RECORD_BYTES} bytes'
+REQUIRED_COLUMNS = tuple(name for name, field in ImportRideRow.model_fields.items() if field.is_required())
+ROWS_ADAPTER = TypeAdapter(list[ImportRideRow])
+
+
+async def read_import_batches(
+    chunks: AsyncIterable[bytes], format: ImportFormat, batch_size: int = IMPORT_BATCH_SIZE
+) -> AsyncIterator[uc.ImportBatchDTO]:
+    """Yield batches of the parsed rows and the rejected ones.
+
+    Raise:
+        - ImportHeaderError, if the CSV header can't be read or lacks columns;
+    """
+    records = _read_csv_records(chunks) if format == 'csv' else _read_ndjson_records(chunks)
+    lines: list[int] = []
+    values: list[dict[str, Any]] = []
+    errors: list[uc.ImportRowErrorDTO] = []
+    async for line, record in records:
+        if isinstance(record, str):
+            errors.append(uc.ImportRowErrorDTO(detail=record, line=line))
+        else:
+            lines.append(line)
+            values.append(record)
+
+        if len(lines) + len(errors) >= batch_size:
+            yield await asyncio.to_thread(_parse_batch, lines, values, errors)
+            lines, values, errors = [], [], []
+
+    if lines or errors:
+        yield await asyncio.to_thread(_parse_batch, lines, values, errors)
+
+
+def _parse_batch(
+    lines: list[int], values: list[dict[str, Any]], errors: list[uc.ImportRowErrorDTO]
+) -> uc.ImportBatchDTO:
+    """Validate the batch at once. If some rows are invalid, the others are validated
+    again without them.
+    """
+    try:
+        rows = ROWS_ADAPTER.validate_python(values)
+    except ValidationError as err:
+        invalid: dict[int, str] = {}
+        for error in err.errors(include_url=False):
+            index, *loc = error['loc']
+            field = '.'.join(map(str, loc))
+            invalid.setdefault(int(index), f'{field}: {error["msg"]}' if field else error['msg'])
+
+        errors.extend(uc.ImportRowErrorDTO(detail=detail, line=lines[i]) for i, detail in invalid.items())
+        valid = [i for i in range(len(values)) if i not in invalid]
+        lines = [lines[i] for i in valid]
+        rows = ROWS_ADAPTER.validate_python([values[i] for i in valid])
+
+    return uc.ImportBatchDTO(
+        errors=errors,
+        rows=[
+            uc.ImportRideRowDTO(
+                departure_time=row.departure_time,
+                description=row.description,
+                line=line,
+                price=uc.PriceDTO(currency=row.price_currency, value=row.price_value),
+                route=uc.RouteDTO(city_id_departure=row.city_id_departure, city_id_destination=row.city_id_destination),
+                seats_number=row.seats_number,
+            )
+            for line, row in zip(lines, rows, strict=True)
+        ],
+    )
+
+
+async def _read_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRecord]:
+    header: list[str] | None = None
+    async for line, record in _read_records(chunks, quoted=True):
+        if isinstance(record, str):
+            if header is None:
+                raise ImportHeaderError(REQUIRED_COLUMNS)
+            yield line, record
+            continue
+
+        try:
+            values = next(csv.reader((record.decode(),), strict=True))
+        except (UnicodeDecodeError, csv.Error) as err:
+            if header is None:
+                raise ImportHeaderError(REQUIRED_COLUMNS) from None
+            yield line, f'Invalid CSV: {err}'
+            continue
+
+        if header is None:
+            header = [column.strip() for column in values]
+            if not set(REQUIRED_COLUMNS) <= set(header):
+                raise ImportHeaderError(REQUIRED_COLUMNS)
+        elif len(values) != len(header):
+            yield line, f'Expected {len(header)} fields, got {len(values)}'
+        else:
+            yield line, dict(zip(header, values, strict=True))
+
+
+async def _read_ndjson_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRecord]:
+    async for line, record in _read_records(chunks, quoted=False):
+        if isinstance(record, str):
+            yield line, record
+            continue
+
+        try:
+            values = orjson.loads(record)
+        except orjson.JSONDecodeError as err:
+            yield line, f'Invalid JSON: {err}'
+            continue
+
+        yield line, values if isinstance(values, dict) else 'A JSON object expected'
+
+
+async def _read_records(chunks: AsyncIterable[bytes], *, quoted: bool) -> AsyncIterator[tuple[int, bytes | str]]:
+    """Yield non-blank records with the numbers of their first lines, or errors.
+
+    A quoted CSV field may have line breaks, so a record goes on while the number of
+    its quotes is odd, escaped quotes are doubled and keep it. Bytes are split as is,
+    quotes and line breaks never occur inside UTF-8 sequences of other characters.
+    """
+    line = first_line = 0
+    record = b''
+    async for part in _read_lines(chunks):
+        line += 1
+        if not record:
+            first_line = line
+        if part is None or len(record) + len(part) > MAX_RECORD_BYTES:
+            yield first_line, RECORD_TOO_LONG
+            record = b''
+            continue
+
+        record += part
+        if quoted and record.count(b'"') % 2:
+            continue
+        if record.strip():
+            yield first_line, record
+        record = b''
+
+    if record.strip():
+        yield first_line, record
+
+
+async def _read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes | None]:
+    """Yield lines with their line breaks, None for a line longer than
+    MAX_RECORD_BYTES. Its bytes are skipped till the line break, so input without
+    line breaks isn't held in memory.
+    """
+    tail = b''
+    too_long = False
+    async for chunk in chunks:
+        *lines, tail = (tail + chunk).split(b'\n')
+        for part in lines:
+            yield None if too_long else part + b'\n'
+            too_long = False
+
+        if len(tail) > MAX_RECORD_BYTES:
+            tail, too_long = b'', True
+
+    if too_long or tail:
+        yield None if too_long else tail
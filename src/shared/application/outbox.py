@@ -0,0 +1,20 @@
+from typing import Protocol
+
+
+class Outbox(Protocol):
+    """Side effects of a unit of work. They're recorded in its transaction and
+    performed after the commit at least once, or discarded on rollback.
+    """
+
+    def add_to_stream(self, stream: str, event: object) -> None:
+        """Add the event to the stream, which workers consume. The event is encoded
+        as JSON, e.g. a dataclass.
+        """
+
+    def delete_from_cache(self, *keys: str) -> None:
+        """Delete the keys from the cache."""
+
+    def publish(self, channel: str, event: object) -> None:
+        """Publish the event to subscribers of the channel. The event is encoded as
+        JSON, e.g. a dataclass.
+        """
@@ -0,0 +1,43 @@
+import os
+import time
+from uuid import UUID
+
+_VERSION_7_FLAGS = (7 << 76) | (0b10 << 62)  # version and RFC 9562 variant bits
+_MAX_COUNTER = (1 << 42) - 1
+
+_last_timestamp_ms = 0
+_last_counter = 0
+
+
+def _get_counter_and_tail() -> tuple[int, int]:
+    """Return a random 42-bit counter with the top bit unset, leaving room to grow,
+    and random 32 bits.
+    """
+    rand = int.from_bytes(os.urandom(10))
+    return (rand >> 32) & (_MAX_COUNTER >> 1), rand & 0xFFFF_FFFF
+
+
+def uuid7() -> UUID:
+    """Return a time-ordered UUID (version 7), as uuid.uuid7() of Python 3.14.
+
+    The first 48 bits are the Unix time in milliseconds, so new ids are appended
+    to the right edge of B-tree indexes instead of being scattered over them. Ids
+    of the same millisecond are ordered by a 42-bit counter, which starts randomly
+    every millisecond; the last 32 bits are random. Ids are monotonic within the
+    process even if the clock goes back.
+    """
+    global _last_counter, _last_timestamp_ms
+
+    timestamp_ms = time.time_ns() // 1_000_000
+    if timestamp_ms > _last_timestamp_ms:
+        counter, tail = _get_counter_and_tail()
+    else:
+        timestamp_ms = _last_timestamp_ms
+        counter, tail = _last_counter + 1, int.from_bytes(os.urandom(4))
+        if counter > _MAX_COUNTER:
+            timestamp_ms += 1
+            counter, tail = _get_counter_and_tail()
+
+    _last_timestamp_ms, _last_counter = timestamp_ms, counter
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | (counter >> 30) << 64 | (counter & 0x3FFF_FFFF) << 32 | tail
+    return UUID(int=value | _VERSION_7_FLAGS)
@@ -1,19 +1,67 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _tracking_setter(setter: Callable[[Any, Any], None], bit: int) -> Callable[[Any, Any], None]:
+    def fset(self: Entity, value: object) -> None:
+        setter(self, value)
+        try:  # noqa: SIM105, contextlib.suppress() is slower
+            self._changed_mask |= bit
+        except AttributeError:  # i.e. still initializing, tracking hasn't started
+            pass
+
+    return fset
+
+
 class Entity:
-    """Base entity with tracking of changed fields."""
+    """Base entity with tracking of changed fields.
 
-    def __init__(self) -> None:
-        self._changed_fields: set[str] = set()
+    Tracked fields are public properties with setters, they are collected once per
+    class. A change sets the field bit in an integer mask, so entities stay slotted,
+    and reads and writes of private slots bypass any Python-level hook.
+    Changes which aren't field assignments are listed in _changed_markers and
+    recorded via _mark_changed().
+
+    Tracking starts in Entity.__init__(), so subclasses call it after initializing.
+    """
 
-    def __setattr__(self, key: str, value: object) -> None:
-        if not key.startswith('_') and hasattr(self, '_changed_fields'):
-            self._changed_fields.add(key)
+    __slots__ = ('_changed_mask',)
+
+    _changed_markers: ClassVar[tuple[str, ...]] = ()
+    _field_bits: ClassVar[dict[str, int]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init_subclass__(**kwargs)
+
+        field_bits = dict(cls._field_bits)
+
+        def next_bit(name: str) -> int:
+            return field_bits.setdefault(name, 1 << len(field_bits))
+
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith('_') and isinstance(attr, property) and attr.fset is not None:
+                setattr(cls, name, attr.setter(_tracking_setter(attr.fset, next_bit(name))))
+
+        for name in cls._changed_markers:
+            next_bit(name)
+
+        cls._field_bits = field_bits
+
+    def __init__(self) -> None:
+        self._changed_mask = 0
 
-        super().__setattr__(key, value)
+    def _mark_changed(self, name: str) -> None:
+        self._changed_mask |= self._field_bits[name]
 
     def get_changed_fields(self) -> set[str]:
         """Return changed fields."""
-        return self._changed_fields
+        mask = self._changed_mask
+        return {name for name, bit in self._field_bits.items() if mask & bit}
 
     def clear_changed_fields(self) -> None:
         """Clear changed fields."""
-        self._changed_fields.clear()
+        self._changed_mask = 0
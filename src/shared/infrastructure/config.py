@@ -1,4 +1,5 @@
-from functools import cached_property
+from functools import cache, cached_property
+from typing import Literal
 
 from pydantic import computed_field
 from pydantic_settings import BaseSettings
@@ -7,9 +8,14 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     """Envs."""
 
+    CITIES_RELOAD_INTERVAL_SECS: float = 60  # the index is rebuilt only if the cities table has changed
+    COMPRESSION_MIN_SIZE: int = 500  # bytes, smaller responses aren't compressed
     CORS_ORIGINS_REGEX: str
     DEBUG: bool = False
     EMAIL_FROM: str
+    EXPORT_TOKEN: str | None = None  # of analytics exports by the X-Export-Token header, they're disabled without it
+    MAIL_WORKER_CONNECTIONS: int = 4  # to the mail provider, each is used by a consumer of the queue
+    OUTBOX_RELAY_INTERVAL_SECS: float = 1  # how often messages of other instances are relayed
     POSTGRESQL_HOST: str
     POSTGRESQL_NAME: str
     POSTGRESQL_PASSWORD: str
@@ -19,6 +25,12 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str | None = None
     REDIS_PORT: int = 6379
     REDIS_USER: str | None = None
+    RIDES_ARCHIVE_AFTER_DAYS: int = 180  # partitions of rides departed earlier are moved to the archive schema
+    RIDES_PARTITIONS_INTERVAL_SECS: float = 3600  # partitions are created ahead and archived by the app
+    RIDE_CONNECTIONS_TTL_SECS: float = 10  # rides of a day for itineraries search are reloaded after it
+    STORAGE_BACKEND: Literal['memory', 'sqlalchemy'] = 'sqlalchemy'  # 'memory' is for DB-less benchmarking
+    TRACING_EXPORT_PATH: str | None = None  # OTLP/JSON lines file
+    TRACING_SAMPLE_RATE: float = 0.0  # share of requests to trace, all of them are traced in debug mode
 
     class Config:
         case_sensitive = True
@@ -44,4 +56,7 @@ class Settings(BaseSettings):
         return url + f'{self.REDIS_HOST}:{self.REDIS_PORT}'
 
 
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    """Return settings. Envs are read on the first call, not on import."""
+    return Settings()
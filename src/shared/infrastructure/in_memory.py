@@ -0,0 +1,78 @@
+"""Building blocks of in-memory storages.
+
+They mimic the semantics of the relational storage the app relies on, so use cases
+behave the same without Postgres: rows locked for update are locked until the end of
+the transaction, and changes are applied on commit only, all or none of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+
+class RowLocks:
+    """Locks of rows by their keys. Locks nobody holds or waits for are dropped."""
+
+    def __init__(self) -> None:
+        self._locks: WeakValueDictionary[Hashable, asyncio.Lock] = WeakValueDictionary()
+
+    def get(self, key: Hashable) -> asyncio.Lock:
+        """Return the lock of the row."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+
+class InMemoryTransaction:
+    """A transaction over in-memory storages.
+
+    Changes are collected as callables and applied on commit at once, i.e. without
+    switching to other coroutines in between. A change returns a callable undoing it,
+    so if a change fails, e.g. of a unique constraint, the applied ones are undone.
+    Row locks are held until close().
+    """
+
+    def __init__(self) -> None:
+        self._changes: list[Callable[[], Callable[[], None]]] = []
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    async def lock(self, locks: RowLocks, key: Hashable) -> None:
+        """Lock the row until the end of the transaction, like SELECT FOR UPDATE."""
+        if (locks, key) in self._locks:
+            return
+
+        lock = locks.get(key)
+        await lock.acquire()
+        self._locks[locks, key] = lock
+
+    def add_change(self, change: Callable[[], Callable[[], None]]) -> None:
+        """Apply the change on commit. The change returns a callable undoing it."""
+        self._changes.append(change)
+
+    def commit(self) -> None:
+        """Apply the changes. If a change fails, the applied ones are undone and the
+        error is raised.
+        """
+        undos: list[Callable[[], None]] = []
+        try:
+            for change in self._changes:
+                undos.append(change())  # noqa: PERF401  # the applied ones are kept on an error
+        except BaseException:
+            for undo in reversed(undos):
+                undo()
+            raise
+        finally:
+            self._changes.clear()
+
+    def close(self) -> None:
+        """Discard not committed changes and release the locks."""
+        self._changes.clear()
+        for lock in self._locks.values():
+            lock.release()
+        self._locks.clear()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from time import monotonic
+
+
+class InMemoryCache:
+    """In-memory implementation of Cache protocol. Values are stored in the process.
+
+    Expired values are evicted on reading and by periodic sweeps on writing.
+    """
+
+    SWEEP_EVERY_N_SETS = 10_000
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[str | bytes, float]] = {}
+        self._sets_till_sweep = self.SWEEP_EVERY_N_SETS
+
+    async def delete(self, *keys: str) -> None:
+        """Delete value by key."""
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def get(self, key: str) -> str | None:
+        """Get value by key."""
+        if (item := self._data.get(key)) is None:
+            return None
+
+        value, expires_at = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            return None
+
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str | bytes, expires_in_secs: int) -> None:
+        """Set value by key with expiration time."""
+        self._sweep_if_needed()
+        self._data[key] = (value, monotonic() + expires_in_secs)
+
+    async def set_if_not_exists(self, key: str, value: str | bytes, expires_in_secs: int) -> bool:
+        """Set value by key with expiration time if the key doesn't exist, like SET NX.
+
+        Return whether the value was set.
+        """
+        if await self.get(key) is not None:
+            return False
+
+        await self.set(key, value, expires_in_secs)
+        return True
+
+    def _sweep_if_needed(self) -> None:
+        self._sets_till_sweep -= 1
+        if self._sets_till_sweep:
+            return
+
+        self._sets_till_sweep = self.SWEEP_EVERY_N_SETS
+        now = monotonic()
+        for key in [k for k, (_, expires_at) in self._data.items() if expires_at <= now]:
+            del self._data[key]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import orjson
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ..application.cache import Cache
+
+
+class InMemoryOutbox:
+    """In-memory implementation of Outbox protocol. Messages are delivered by
+    deliver() after the in-memory transaction is committed.
+
+    Published events are passed to the subscriber of the process, e.g. a hub of
+    server-sent events. The memory backend has no workers, so events of streams are
+    only encoded.
+    """
+
+    def __init__(self, cache: Cache, subscriber: Callable[[str, bytes], None]) -> None:
+        self._cache = cache
+        self._cache_keys: list[str] = []
+        self._events: list[tuple[str, bytes]] = []
+        self._subscriber = subscriber
+
+    def add_to_stream(self, stream: str, event: object) -> None:
+        """Add the event to the stream, which workers consume."""
+        orjson.dumps(event, option=orjson.OPT_UTC_Z)
+
+    def delete_from_cache(self, *keys: str) -> None:
+        """Delete the keys from the cache."""
+        self._cache_keys.extend(keys)
+
+    def publish(self, channel: str, event: object) -> None:
+        """Publish the event to subscribers of the channel."""
+        self._events.append((channel, orjson.dumps(event, option=orjson.OPT_UTC_Z)))
+
+    async def deliver(self) -> None:
+        """Perform the recorded side effects."""
+        if self._cache_keys:
+            await self._cache.delete(*self._cache_keys)
+            self._cache_keys.clear()
+
+        for channel, event in self._events:
+            self._subscriber(channel, event)
+        self._events.clear()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy import TIMESTAMP, BigInteger, Identity, String, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .logging import logger
+from .sqlalchemy import Base
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class OutboxSQLAlchemyModel(Base):
+    """Outbox message model for SQLAlchemy ORM. Messages are deleted once relayed."""
+
+    cache_keys: Mapped[list[str] | None] = mapped_column(ARRAY(String))  # to delete
+    channel: Mapped[str | None]  # of the event
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    event: Mapped[bytes | None]  # JSON
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    stream: Mapped[str | None]  # to add the event to
+
+    __tablename__ = 'outbox'
+
+
+class SQLAlchemyOutbox:
+    """SQLAlchemy implementation of Outbox protocol, messages are inserted in the
+    session's transaction and delivered by SQLAlchemyOutboxRelay.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def add_to_stream(self, stream: str, event: object) -> None:
+        """Add the event to the stream, which workers consume."""
+        self._session.add(OutboxSQLAlchemyModel(event=orjson.dumps(event, option=orjson.OPT_UTC_Z), stream=stream))
+
+    def delete_from_cache(self, *keys: str) -> None:
+        """Delete the keys from the cache."""
+        self._session.add(OutboxSQLAlchemyModel(cache_keys=list(keys)))
+
+    def publish(self, channel: str, event: object) -> None:
+        """Publish the event to subscribers of the channel."""
+        self._session.add(OutboxSQLAlchemyModel(channel=channel, event=orjson.dumps(event, option=orjson.OPT_UTC_Z)))
+
+
+class SQLAlchemyOutboxRelay:
+    """Delivers outbox messages to Redis: cache keys are deleted, events are
+    published or added to streams.
+
+    A batch of the oldest messages is deleted in a transaction, which is committed
+    once a pipeline of their Redis commands succeeds, so messages are delivered at
+    least once. Rows locked by relays of other instances are skipped, so relays
+    drain the outbox in parallel, and the order of messages is kept only roughly.
+
+    The relay is woken up after commits of this instance, other messages (e.g. of
+    failed deliveries) are picked up every interval.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], redis: Redis) -> None:
+        self._redis = redis
+        self._session_factory = session_factory
+        self._wakeup = asyncio.Event()
+
+    def wake(self) -> None:
+        """Relay the messages without waiting for the interval."""
+        self._wakeup.set()
+
+    async def relay(self) -> int:
+        """Deliver a batch of messages. Return their number."""
+        Outbox = OutboxSQLAlchemyModel  # noqa: N806
+        batch = select(Outbox.id).order_by(Outbox.id).limit(self.BATCH_SIZE).with_for_update(skip_locked=True)
+        q = (
+            delete(Outbox)
+            .where(Outbox.id.in_(batch.scalar_subquery()))
+            .returning(Outbox.cache_keys, Outbox.channel, Outbox.event, Outbox.stream)
+        )
+
+        async with self._session_factory() as session, session.begin():
+            messages = (await session.execute(q)).all()
+            if messages:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for cache_keys, channel, event, stream in messages:
+                        if cache_keys:
+                            pipe.delete(*cache_keys)
+                        if channel:
+                            pipe.publish(channel, event)
+                        if stream:
+                            pipe.xadd(stream, {'event': event})
+                    await pipe.execute()
+
+        return len(messages)
+
+    async def relay_periodically(self, interval_secs: float) -> None:
+        """Relay messages till cancelled. Full batches are followed by the next one
+        at once. Errors are logged, the messages are retried then.
+        """
+        while True:
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay()
+            except (RedisError, SQLAlchemyError):
+                logger.exception('Outbox relay failed')
+                relayed = 0
+
+            if relayed < self.BATCH_SIZE:
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), interval_secs)
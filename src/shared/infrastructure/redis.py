@@ -1,8 +1,18 @@
-from redis.asyncio import Redis
+from __future__ import annotations
 
-from .config import settings
+from typing import TYPE_CHECKING
 
-common = Redis.from_url(settings.REDIS_URL, db=0, decode_responses=True)
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
 
-# For closing connections in the app lifespan (main.py)
-connections = (common,)
+    from .config import Settings
+
+
+def create_redis(settings: Settings) -> Redis:
+    """Create a Redis client. Connections are opened on demand.
+
+    The client is created in the app lifespan (main.py) and closed on shutdown.
+    """
+    from redis.asyncio import Redis  # deferred till the app startup
+
+    return Redis.from_url(settings.REDIS_URL, db=0, decode_responses=True)  # type: ignore[no-any-return]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import socket
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+from redis.exceptions import ResponseError
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.client import Pipeline
+
+type StreamEntry = tuple[str, dict[str, Any]]  # id, fields
+
+
+def get_consumer_name(number: int = 0) -> str:
+    """Return a name of the consumer unique among processes."""
+    return f'{socket.gethostname()}-{os.getpid()}-{number}'
+
+
+class RedisStreamGroup:
+    """A consumer group of a Redis stream, every entry is delivered to one of its
+    consumers.
+
+    Entries are pending till acknowledged, entries of a crashed consumer are
+    claimed by another one once idle for claim_idle_ms. So they're processed at
+    least once.
+    """
+
+    def __init__(
+        self, redis_con: Redis, stream: str, group: str, *, block_ms: int = 1000, claim_idle_ms: int = 60_000
+    ) -> None:
+        self._block_ms = block_ms
+        self._claim_idle_ms = claim_idle_ms
+        self._group = group
+        self._redis_con = redis_con
+        self._stream = stream
+
+    async def create(self) -> None:
+        """Create the group and the stream if they don't exist."""
+        with suppress(ResponseError):  # BUSYGROUP, the group exists
+            await self._redis_con.xgroup_create(self._stream, self._group, id='0', mkstream=True)
+
+    async def read(self, consumer: str, count: int) -> list[StreamEntry]:
+        """Return entries lost by other consumers or wait block_ms for new ones."""
+        _, entries, _ = await self._redis_con.xautoclaim(
+            self._stream, self._group, consumer, self._claim_idle_ms, count=count
+        )
+        if entries:
+            return entries  # type: ignore[no-any-return]
+
+        streams = await self._redis_con.xreadgroup(
+            self._group, consumer, {self._stream: '>'}, count=count, block=self._block_ms
+        )
+        return streams[0][1] if streams else []
+
+    def ack(self, pipe: Pipeline, *entry_ids: str) -> None:
+        """Acknowledge the entries and delete them from the stream."""
+        pipe.xack(self._stream, self._group, *entry_ids)
+        pipe.xdel(self._stream, *entry_ids)
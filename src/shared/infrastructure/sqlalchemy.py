@@ -1,39 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from sqlalchemy import event
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
-from .config import settings
 from .logging import logger
 
-if settings.DEBUG:
-    engine = create_async_engine(
-        settings.DATABASE_URL, pool_size=3, max_overflow=1, pool_recycle=1800, echo=settings.DEBUG
-    )
-else:
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+    from .config import Settings
+
+
+def create_engine(settings: Settings) -> AsyncEngine:
+    """Create the engine. Connections are opened on demand.
+
+    The engine is created in the app lifespan (main.py) and disposed on shutdown,
+    so importing models (e.g. by alembic) doesn't load the DB driver.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine  # deferred till the app startup
+
+    pool_size, max_overflow = (3, 1) if settings.DEBUG else (10, 5)
     engine = create_async_engine(
-        settings.DATABASE_URL, pool_size=10, max_overflow=5, pool_recycle=1800, echo=settings.DEBUG
+        settings.DATABASE_URL,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=1800,
+        echo=settings.DEBUG,
     )
 
-sessionmaker = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    if settings.DEBUG:
+        event.listen(engine.sync_engine, 'before_cursor_execute', explain_all_queries)
+
+    return engine
+
+
+def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Create a session factory bound to the engine."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker  # deferred till the app startup
 
+    return async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
 
-if settings.DEBUG:
 
-    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
-    def explain_all_queries(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
-        """EXPLAIN all queries."""
-        stmt_lower = statement.lstrip().upper()
-        if stmt_lower.startswith('EXPLAIN'):
-            return
+def explain_all_queries(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    """EXPLAIN all queries."""
+    stmt_lower = statement.lstrip().upper()
+    if stmt_lower.startswith('EXPLAIN'):
+        return
 
-        raw_cursor = conn.connection.cursor()
-        try:
-            raw_cursor.execute('EXPLAIN ' + statement, parameters or ())
-            plan_rows = raw_cursor.fetchall()
-        finally:
-            raw_cursor.close()
+    raw_cursor = conn.connection.cursor()
+    try:
+        raw_cursor.execute('EXPLAIN ' + statement, parameters or ())
+        plan_rows = raw_cursor.fetchall()
+    finally:
+        raw_cursor.close()
 
-        logger.info('\n'.join(str(row) for row in plan_rows))
+    logger.info('\n'.join(str(row) for row in plan_rows))
 
 
 class Base(DeclarativeBase):
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction, isfunction
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+SERVICE_NAME = 'example-project'
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation inside a trace.
+
+    kind - a layer of the operation (usecase, query, repository, cache, sql, etc.);
+    name - a particular operation, e.g. 'BookRideUsecase.execute'.
+    """
+
+    kind: str
+    name: str
+    parent_id: str | None
+    span_id: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        """Return the span duration in milliseconds."""
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+@dataclass(slots=True)
+class Trace:
+    """Spans of one sampled request."""
+
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar('current_trace', default=None)
+_current_span: ContextVar[Span | None] = ContextVar('current_span', default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+
+def start_trace() -> Trace:
+    """Start a new trace in the current context. Spans opened below are added to it."""
+    trace = Trace(trace_id=_new_id(128))
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def open_span(kind: str, name: str) -> Span | None:
+    """Open a span without making it current. Return None if the request isn't sampled.
+
+    It's meant for leaf operations reported through callbacks (e.g. SQLAlchemy events),
+    the span has to be passed to close_span() afterwards.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+
+    parent = _current_span.get()
+    return Span(
+        kind=kind,
+        name=name,
+        parent_id=parent.span_id if parent else None,
+        span_id=_new_id(64),
+        start_ns=time.time_ns(),
+    )
+
+
+def close_span(span: Span) -> None:
+    """Finish the span opened with open_span()."""
+    span.end_ns = time.time_ns()
+
+    if trace := _current_trace.get():
+        trace.spans.append(span)
+
+
+@contextmanager
+def span(kind: str, name: str) -> Iterator[Span | None]:
+    """Record the wrapped block as a span. Does nothing if the request isn't sampled."""
+    new_span = open_span(kind, name)
+    if new_span is None:
+        yield None
+        return
+
+    token = _current_span.set(new_span)
+    try:
+        yield new_span
+    finally:
+        _current_span.reset(token)
+        close_span(new_span)
+
+
+def traced(kind: str, name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a function or a coroutine function to be recorded as a span."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                if _current_trace.get() is None:
+                    return await func(*args, **kwargs)
+
+                with span(kind, name):
+                    return await func(*args, **kwargs)
+
+            async_wrapper.__traced__ = True  # type: ignore[attr-defined]
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+
+            with span(kind, name):
+                return func(*args, **kwargs)
+
+        wrapper.__traced__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def instrument(cls: type, kind: str) -> None:
+    """Record public methods defined in the class as spans.
+
+    It's called once by the composition root, so the application and domain layers
+    stay unaware of tracing. Repeated calls are no-op.
+    """
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith('_') or not isfunction(attr) or getattr(attr, '__traced__', False):
+            continue
+
+        setattr(cls, attr_name, traced(kind, f'{cls.__name__}.{attr_name}')(attr))
+
+
+def _start_sql_span(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    if sql_span := open_span('sql', statement.lstrip().split(None, 1)[0].upper()):
+        sql_span.attributes['db.statement'] = statement
+        context._tracing_span = sql_span  # noqa: SLF001
+
+
+def _finish_sql_span(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    if sql_span := getattr(context, '_tracing_span', None):
+        close_span(sql_span)
+
+
+def _fail_sql_span(exception_context):  # type: ignore[no-untyped-def]
+    if sql_span := getattr(exception_context.execution_context, '_tracing_span', None):
+        sql_span.attributes['error'] = type(exception_context.original_exception).__name__
+        close_span(sql_span)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record SQL statements executed by the engine as spans."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, 'before_cursor_execute', _start_sql_span):
+        return
+
+    event.listen(sync_engine, 'before_cursor_execute', _start_sql_span)
+    event.listen(sync_engine, 'after_cursor_execute', _finish_sql_span)
+    event.listen(sync_engine, 'handle_error', _fail_sql_span)
+
+
+class FileSpanExporter:
+    """Exports traces to a file in OTLP/JSON format.
+
+    Each line is an ExportTraceServiceRequest, so the file can be replayed to any OTLP
+    collector (e.g. with the otlpjsonfile receiver).
+    Traces are buffered and written in batches off the event loop.
+    """
+
+    BATCH_SIZE = 64
+
+    def __init__(self, path: str) -> None:
+        self._buffer: list[Trace] = []
+        self._path = path
+
+    def export(self, trace: Trace) -> None:
+        """Buffer the trace. Flush the buffer in a thread when it's full."""
+        self._buffer.append(trace)
+
+        if len(self._buffer) >= self.BATCH_SIZE:
+            batch, self._buffer = self._buffer, []
+            asyncio.get_running_loop().run_in_executor(None, self._write, batch)
+
+    def flush(self) -> None:
+        """Write the buffered traces."""
+        batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def _write(self, batch: list[Trace]) -> None:
+        if not batch:
+            return
+
+        lines = b''.join(orjson.dumps(self._to_otlp(trace)) + b'\n' for trace in batch)
+        with open(self._path, 'ab') as f:  # noqa: PTH123
+            f.write(lines)
+
+    @staticmethod
+    def _to_otlp(trace: Trace) -> dict[str, Any]:
+        spans = [
+            {
+                'attributes': [
+                    {'key': 'span.kind', 'value': {'stringValue': s.kind}},
+                    *({'key': k, 'value': {'stringValue': v}} for k, v in s.attributes.items()),
+                ],
+                'endTimeUnixNano': str(s.end_ns),
+                'kind': 1,  # SPAN_KIND_INTERNAL
+                'name': s.name,
+                'parentSpanId': s.parent_id or '',
+                'spanId': s.span_id,
+                'startTimeUnixNano': str(s.start_ns),
+                'traceId': trace.trace_id,
+            }
+            for s in trace.spans
+        ]
+        return {
+            'resourceSpans': [
+                {
+                    'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+                    'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}],
+                }
+            ]
+        }
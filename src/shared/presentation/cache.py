@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from ..application.cache import Cache
+from ..infrastructure.config import get_settings
+from ..infrastructure.redis_cache import RedisCache
+
+
+async def get_cache(request: Request) -> Cache:
+    """Return the cache of the configured storage backend."""
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return request.app.state.in_memory_cache  # type: ignore[no-any-return]
+    return RedisCache(request.app.state.redis)
+
+
+CacheDep = Annotated[Cache, Depends(get_cache)]
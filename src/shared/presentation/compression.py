@@ -0,0 +1,286 @@
+"""Response compression.
+
+CompressionMiddleware compresses responses of at least COMPRESSION_MIN_SIZE bytes
+with the best encoding accepted by the client: zstd, br or gzip. Responses that
+already have Content-Encoding are passed as is, so hot responses can be compressed
+once and served from PrecompressedBodies, see precompressed_response().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import zlib
+from collections import OrderedDict
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Protocol
+
+import brotli  # type: ignore[import-untyped]
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+
+from ..infrastructure.config import get_settings
+from .serialization import JSONBytesResponse, encode
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from fastapi import Request
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ENCODINGS = ('zstd', 'br', 'gzip')  # by preference on equal client's q-values
+
+# Levels of per-request compression are cheap ones, precompressed bodies are hot
+# ones compressed once in a thread, so they get better ratios.
+LEVELS = {'br': 4, 'gzip': 6, 'zstd': 3}
+PRECOMPRESSED_LEVELS = {'br': 9, 'gzip': 9, 'zstd': 12}
+
+# Streams must reach the client event by event.
+UNCOMPRESSED_CONTENT_TYPES = ('text/event-stream',)
+
+
+class StreamCompressor(Protocol):
+    """An incremental compressor."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, the output may be buffered."""
+
+    def flush(self) -> bytes:
+        """Return the rest of the output and end the stream."""
+
+
+class _BrotliStreamCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)  # type: ignore[no-any-return]
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()  # type: ignore[no-any-return]
+
+
+class _GzipStreamCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """Compress the data at once. The level is the per-request one by default."""
+    level = LEVELS[encoding] if level is None else level
+
+    if encoding == 'zstd':
+        return _get_zstd_compressor(level).compress(data)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)  # type: ignore[no-any-return]
+    return zlib.compress(data, level, wbits=16 + zlib.MAX_WBITS)
+
+
+def create_stream_compressor(encoding: str) -> StreamCompressor:
+    """Return an incremental compressor of the per-request level."""
+    level = LEVELS[encoding]
+
+    if encoding == 'zstd':
+        return _get_zstd_compressor(level).compressobj()
+    if encoding == 'br':
+        return _BrotliStreamCompressor(level)
+    return _GzipStreamCompressor(level)
+
+
+@cache
+def _get_zstd_compressor(level: int) -> zstandard.ZstdCompressor:
+    """Return a reusable compressor. It isn't thread-safe, the app runs in one
+    thread per event loop.
+    """
+    return zstandard.ZstdCompressor(level)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Return the best encoding of the Accept-Encoding header or None.
+    Clients send a few distinct headers, so results are cached.
+    """
+    q_values: dict[str, float] = {}
+    for item in accept_encoding.lower().split(','):
+        name, _, params = item.partition(';')
+        q = 1.0
+        if (param := params.strip()).startswith('q='):
+            try:
+                q = float(param[2:])
+            except ValueError:
+                continue
+        q_values[name.strip()] = q
+
+    default_q = q_values.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        if (q := q_values.get(encoding, default_q)) > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses of at least minimum_size bytes.
+
+    A single-message response is compressed at once and gets Content-Length.
+    A streamed one is compressed incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int) -> None:
+        self._app = app
+        self._minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compress the response if the client accepts an encoding."""
+        if scope['type'] != 'http' or not (
+            encoding := negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        ):
+            await self._app(scope, receive, send)
+            return
+
+        await self._app(scope, receive, _CompressingSender(send, encoding, self._minimum_size).send)
+
+
+class _CompressingSender:
+    """Compresses messages of a response. The start message is held till the first
+    body chunk, which decides if the response is compressed.
+    """
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self._compressor: StreamCompressor | None = None
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._passthrough = False
+        self._send = send
+        self._start_message: Message | None = None
+
+    async def send(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            headers = Headers(raw=message['headers'])
+            self._passthrough = 'content-encoding' in headers or headers.get('content-type', '').startswith(
+                UNCOMPRESSED_CONTENT_TYPES
+            )
+            if self._passthrough:
+                await self._send(message)
+            else:
+                self._start_message = message
+        elif self._passthrough or message['type'] != 'http.response.body':
+            await self._send(message)
+        elif self._start_message is not None:
+            await self._send_first_body(self._start_message, message)
+            self._start_message = None
+        elif self._compressor:
+            more_body = message.get('more_body', False)
+            chunk = self._compressor.compress(message.get('body', b''))
+            if not more_body:
+                chunk += self._compressor.flush()
+            await self._send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+
+    async def _send_first_body(self, start_message: Message, message: Message) -> None:
+        body: bytes = message.get('body', b'')
+        more_body: bool = message.get('more_body', False)
+
+        if not more_body and len(body) < self._minimum_size:
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(scope=start_message)
+        headers['Content-Encoding'] = self._encoding
+        headers.add_vary_header('Accept-Encoding')
+
+        if not more_body:
+            body = compress(body, self._encoding)
+            headers['Content-Length'] = str(len(body))
+            await self._send(start_message)
+            await self._send({'type': 'http.response.body', 'body': body})
+            return
+
+        del headers['Content-Length']
+        self._compressor = create_stream_compressor(self._encoding)
+        await self._send(start_message)
+        await self._send({'type': 'http.response.body', 'body': self._compressor.compress(body), 'more_body': True})
+
+
+class PrecompressedBodies:
+    """Compressed bodies of hot responses by key, least recently used are evicted.
+
+    An entry is stored with the version of the content it's encoded of, e.g. the
+    ride fields which may change, so a hit is served without encoding the content,
+    and invalidation of the data it is built of needs no hooks. A body is compressed
+    once it's requested hot_after times with the same version, colder ones are left
+    to CompressionMiddleware, so they don't evict the hot ones.
+    """
+
+    def __init__(self, max_entries: int = 4096, hot_after: int = 3) -> None:
+        self._entries: OrderedDict[str, tuple[Hashable, dict[str, bytes]]] = OrderedDict()
+        self._hot_after = hot_after
+        self._max_entries = max_entries
+        self._requests: OrderedDict[tuple[str, Hashable], int] = OrderedDict()  # of not hot versions
+
+    def get(self, key: str, version: Hashable, encoding: str) -> bytes | None:
+        """Return the compressed body of the version or None."""
+        if (entry := self._entries.get(key)) and entry[0] == version and (body := entry[1].get(encoding)):
+            self._entries.move_to_end(key)
+            return body
+        return None
+
+    def is_hot(self, key: str, version: Hashable) -> bool:
+        """Count the request of the version, return if its body is worth compressing."""
+        if (entry := self._entries.get(key)) and entry[0] == version:
+            return True
+
+        requests_key = (key, version)
+        requests = self._requests.pop(requests_key, 0) + 1
+        if requests >= self._hot_after:
+            return True
+
+        self._requests[requests_key] = requests
+        if len(self._requests) > self._max_entries:
+            self._requests.popitem(last=False)
+        return False
+
+    def set(self, key: str, version: Hashable, encoding: str, body: bytes) -> None:
+        """Store the compressed body of the version, drop the ones of other versions."""
+        if (entry := self._entries.get(key)) and entry[0] == version:
+            entry[1][encoding] = body
+        else:
+            self._entries[key] = (version, {encoding: body})
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def _precompress(data: bytes, encoding: str) -> bytes:
+    """Compress the data at the precompression level. Run in a thread, so zstd gets
+    a compressor of its own.
+    """
+    level = PRECOMPRESSED_LEVELS[encoding]
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level).compress(data)
+    return compress(data, encoding, level)
+
+
+async def precompressed_response(request: Request, content: object, key: str, version: Hashable) -> JSONBytesResponse:
+    """Return the JSON of the content, its body is compressed once per version when
+    it gets hot, see PrecompressedBodies. The version must change whenever the JSON
+    does.
+    """
+    bodies: PrecompressedBodies = request.app.state.precompressed_bodies
+    encoding = negotiate_encoding(request.headers.get('accept-encoding', ''))
+    headers = {'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'} if encoding else None
+    if encoding and (compressed := bodies.get(key, version, encoding)):
+        return JSONBytesResponse(compressed, headers=headers)
+
+    body = encode(content)
+    if not encoding or len(body) < get_settings().COMPRESSION_MIN_SIZE or not bodies.is_hot(key, version):
+        return JSONBytesResponse(body)  # compressed by CompressionMiddleware at the per-request level
+
+    compressed = await asyncio.to_thread(_precompress, body, encoding)
+    bodies.set(key, version, encoding, compressed)
+    return JSONBytesResponse(compressed, headers=headers)
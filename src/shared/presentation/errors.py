@@ -0,0 +1,8 @@
+from fastapi import HTTPException
+
+
+class APIError(HTTPException):
+    """An exception for raising in API endpoints."""
+
+    def __init__(self, status_code: int, project_code: int | None = None, detail: str | None = None) -> None:
+        super().__init__(status_code=status_code, detail={'code': project_code, 'detail': detail})
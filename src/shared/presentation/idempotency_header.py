@@ -1,22 +1,25 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 
-from ..infrastructure.config import settings
-from ..infrastructure.redis import common as redis_connection
+from ..infrastructure.config import get_settings
 
 CACHE_KEY_PATTERN = 'idempotency:{key}'
 IDEMPOTENCY_TIMEOUT = 60  # 1 min
 
 
-async def check_idempotency(idempotency_key: Annotated[UUID, Header()]) -> None:
+async def check_idempotency(idempotency_key: Annotated[UUID, Header()], request: Request) -> None:
     """Validate user bearer token through graphql service."""
+    settings = get_settings()
     if settings.DEBUG:
         return
 
     key = CACHE_KEY_PATTERN.format(key=idempotency_key)
-    was_set = await redis_connection.set(key, 1, IDEMPOTENCY_TIMEOUT, nx=True)
+    if settings.STORAGE_BACKEND == 'memory':
+        was_set = await request.app.state.in_memory_cache.set_if_not_exists(key, '1', IDEMPOTENCY_TIMEOUT)
+    else:
+        was_set = await request.app.state.redis.set(key, 1, IDEMPOTENCY_TIMEOUT, nx=True)
 
     if not was_set:
         raise HTTPException(status.HTTP_425_TOO_EARLY)
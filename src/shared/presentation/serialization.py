@@ -0,0 +1,90 @@
+"""Fast path of JSON responses.
+
+Routes declare response_model for OpenAPI, but return JSONBytesResponse, so FastAPI
+neither validates nor serializes the return value twice:
+- frozen DTOs (dataclasses) are encoded by orjson natively;
+- domain entities are turned into dicts by encoders compiled once per response
+  schema, see compile_encoder().
+
+Output matches pydantic's JSON mode: UTC datetimes end with Z, enums are values.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from operator import attrgetter
+from types import NoneType, UnionType
+from typing import TYPE_CHECKING, Any, Union, get_args, get_origin
+
+import orjson
+from fastapi import status
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    type Encoder = Callable[[Any], dict[str, Any]]
+
+
+class JSONBytesResponse(Response):
+    """A response with content already encoded to JSON."""
+
+    media_type = 'application/json'
+
+
+def encode(content: object) -> bytes:
+    """Encode the content (DTOs, dicts, lists, datetimes, UUIDs, enums) to JSON."""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def json_response(
+    content: object, schema: type[BaseModel] | None = None, status_code: int = status.HTTP_200_OK
+) -> JSONBytesResponse:
+    """Return the encoded content. The schema picks the fields of an entity."""
+    if schema is not None:
+        content = compile_encoder(schema)(content)
+    return JSONBytesResponse(encode(content), status_code)
+
+
+@cache
+def compile_encoder(schema: type[BaseModel]) -> Encoder:
+    """Return a function turning an object into a dict by the schema fields.
+
+    Values are read with attributes and aren't validated. Nested schemas are
+    compiled as well. Computed fields are evaluated against the object, so they
+    must use only the attributes the object has. Excluded fields are skipped.
+    """
+    fields: list[tuple[str, Callable[[Any], Any], Encoder | None]] = [
+        (name, attrgetter(name), _nested_encoder(field.annotation))
+        for name, field in schema.model_fields.items()
+        if not field.exclude
+    ]
+    fields.extend(
+        (name, field.wrapped_property.fget, None)  # type: ignore[misc]
+        for name, field in schema.model_computed_fields.items()
+    )
+
+    if not any(nested for _, _, nested in fields):
+        getters = [(name, getter) for name, getter, _ in fields]
+        return lambda obj: {name: getter(obj) for name, getter in getters}
+
+    def encoder(obj: Any) -> dict[str, Any]:  # noqa: ANN401
+        data = {}
+        for name, getter, nested in fields:
+            value = getter(obj)
+            data[name] = nested(value) if nested and value is not None else value
+        return data
+
+    return encoder
+
+
+def _nested_encoder(annotation: Any) -> Encoder | None:  # noqa: ANN401
+    """Return the encoder of a nested schema, e.g. of `PriceSchema | None`."""
+    if get_origin(annotation) in {Union, UnionType}:
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        annotation = args[0] if len(args) == 1 else None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return compile_encoder(annotation)
+    return None
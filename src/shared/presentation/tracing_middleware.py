@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import MutableHeaders
+
+from ..infrastructure import tracing
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from ..infrastructure.tracing import FileSpanExporter, Span, Trace
+
+
+class TracingMiddleware:
+    """Samples requests and records them as traces.
+
+    Unsampled requests cost one random() call, inner layers spans are no-op for them.
+    With breakdown_header (debug mode) every request is sampled, and the response gets
+    a Server-Timing header with time spent per span kind.
+    """
+
+    def __init__(
+        self, app: ASGIApp, *, exporter: FileSpanExporter | None, sample_rate: float, breakdown_header: bool
+    ) -> None:
+        self._app = app
+        self._breakdown_header = breakdown_header
+        self._exporter = exporter
+        self._sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Trace the request if it's sampled."""
+        if scope['type'] != 'http' or not (self._breakdown_header or random.random() < self._sample_rate):  # noqa: S311
+            await self._app(scope, receive, send)
+            return
+
+        trace = tracing.start_trace()
+        root: Span | None = None
+
+        async def send_with_breakdown(message: Message) -> None:
+            if message['type'] == 'http.response.start' and root:
+                MutableHeaders(scope=message).append('Server-Timing', self._get_breakdown(trace, root))
+            await send(message)
+
+        try:
+            with tracing.span('http', f'{scope["method"]} {scope["path"]}') as root:
+                await self._app(scope, receive, send_with_breakdown if self._breakdown_header else send)
+        finally:
+            if root and (route := scope.get('route')):
+                root.name = f'{scope["method"]} {route.path}'
+
+            if self._exporter:
+                self._exporter.export(trace)
+
+    @staticmethod
+    def _get_breakdown(trace: Trace, root: Span) -> str:
+        """Sum durations per span kind. Nested spans of the same kind are counted once.
+        'other' is the time outside of traced layers (validation, serialization, etc.).
+        """
+        total_ms = (time.time_ns() - root.start_ns) / 1_000_000
+        kinds = {s.span_id: s.kind for s in trace.spans}
+
+        per_kind: dict[str, float] = {}
+        traced_ms = 0.0
+        for s in trace.spans:
+            if kinds.get(s.parent_id or '') != s.kind:
+                per_kind[s.kind] = per_kind.get(s.kind, 0.0) + s.duration_ms
+            if s.parent_id == root.span_id:
+                traced_ms += s.duration_ms
+
+        metrics = [f'total;dur={total_ms:.2f}', f'other;dur={total_ms - traced_ms:.2f}']
+        metrics.extend(f'{kind};dur={dur:.2f}' for kind, dur in per_kind.items())
+        return ', '.join(metrics)
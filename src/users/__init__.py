@@ -1,5 +1,42 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .domain.models import UserId
-from .infrastructure.repositories.sqlalchemy import UserSQLAlchemyModel
-from .presentation.functions.get_users_data import get_users_data
 
-__all__ = ['UserId', 'UserSQLAlchemyModel', 'get_users_data']
+if TYPE_CHECKING:
+    from .application.protocols.mail_service import MailDTO
+    from .infrastructure.repositories.in_memory import UserInMemoryStorage
+    from .infrastructure.repositories.sqlalchemy import UserSQLAlchemyModel
+    from .presentation.functions.enqueue_mails import enqueue_mails
+    from .presentation.functions.get_users_data import get_in_memory_users_data, get_users_data, get_users_emails
+
+__all__ = [
+    'MailDTO',
+    'UserId',
+    'UserInMemoryStorage',
+    'UserSQLAlchemyModel',
+    'enqueue_mails',
+    'get_in_memory_users_data',
+    'get_users_data',
+    'get_users_emails',
+]
+
+# Imported on first access, so the domain users (e.g. UserId in rides) don't load
+# SQLAlchemy, Redis and pydantic
+_LAZY_EXPORTS = {
+    'MailDTO': '.application.protocols.mail_service',
+    'UserInMemoryStorage': '.infrastructure.repositories.in_memory',
+    'UserSQLAlchemyModel': '.infrastructure.repositories.sqlalchemy',
+    'enqueue_mails': '.presentation.functions.enqueue_mails',
+    'get_in_memory_users_data': '.presentation.functions.get_users_data',
+    'get_users_data': '.presentation.functions.get_users_data',
+    'get_users_emails': '.presentation.functions.get_users_data',
+}
+
+
+def __getattr__(name: str) -> object:
+    if module := _LAZY_EXPORTS.get(name):
+        return getattr(import_module(module, __name__), name)
+
+    msg = f'module {__name__!r} has no attribute {name!r}'
+    raise AttributeError(msg)
@@ -12,8 +12,23 @@ class MailDTO:
     subject: str
 
 
+class MailClientError(Exception):
+    """Mail sending error, the mail can be retried."""
+
+
 class MailClient(Protocol):
     """A client for mail service."""
 
     async def send(self, mail: MailDTO) -> None:
-        """Send an email."""
+        """Send an email.
+
+        Raise:
+            - MailClientError, if the mail isn't sent;
+        """
+
+
+class MailQueue(Protocol):
+    """A queue of mails, they are sent by a worker."""
+
+    async def enqueue(self, mail: MailDTO) -> None:
+        """Enqueue the mail for sending."""
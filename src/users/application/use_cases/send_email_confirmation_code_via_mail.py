@@ -10,26 +10,28 @@ if TYPE_CHECKING:
     from ...domain.models import UserId
     from ...domain.uow import UserUnitOfWork
     from ..protocols.email_confirmation_code_service import EmailConfirmationCodeService
-    from ..protocols.mail_service import MailClient
+    from ..protocols.mail_service import MailQueue
 
 
 class SendEmailConfirmationCodeUsecase:
-    """Email confirmation usecase that generates a confirmation code and sends it."""
+    """Email confirmation usecase that generates a confirmation code and enqueues
+    a mail with it.
+    """
 
     def __init__(
         self,
         uow: UserUnitOfWork,
         email_confirmation_code_service: EmailConfirmationCodeService,
-        mail_client: MailClient,
+        mail_queue: MailQueue,
         email_from: str,
     ) -> None:
         self._email_confirmation_code_service = email_confirmation_code_service
         self._email_from = email_from
-        self._mail_client = mail_client
+        self._mail_queue = mail_queue
         self._uow = uow
 
     async def execute(self, user_id: UserId) -> None:
-        """Get the user, generate a confirmation code, send it.
+        """Get the user, generate a confirmation code, enqueue the mail.
 
         Raise:
             - EmailIsConfirmedError, if user's email is already confirmed;
@@ -51,4 +53,4 @@ class SendEmailConfirmationCodeUsecase:
         mail = MailDTO(
             content=html_content, email_from=self._email_from, email_to=user.email, subject='Email confirmation'
         )
-        await self._mail_client.send(mail)
+        await self._mail_queue.enqueue(mail)
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, NewType
-from uuid import UUID, uuid4
+from uuid import UUID
 
+from shared.domain.ids import uuid7
 from shared.domain.models import Entity
 
 from ..errors import AgeRestrictionError
@@ -24,7 +25,7 @@ class User(Entity):
     Their use can be implemented later for passports verification.
     """
 
-    __slots__ = ('_birth_date', '_email', '_id', 'email_confirmed', 'first_name', 'last_name')
+    __slots__ = ('_birth_date', '_email', '_email_confirmed', '_first_name', '_id', '_last_name')
 
     def __init__(
         self,
@@ -37,10 +38,10 @@ class User(Entity):
         last_name: str,
         _for_creating: bool = False,
     ) -> None:
-        self.email_confirmed = email_confirmed
-        self.first_name = first_name
+        self._email_confirmed = email_confirmed
+        self._first_name = first_name
         self._id = id
-        self.last_name = last_name
+        self._last_name = last_name
 
         if not _for_creating:  # i.e. just initializing, validation not required
             self._birth_date = birth_date
@@ -59,7 +60,7 @@ class User(Entity):
         Email of a new user is always NOT confirmed.
         """
         email_confirmed = False
-        id = UserId(uuid4())
+        id = UserId(uuid7())
 
         return cls(
             birth_date=params.birth_date,
@@ -99,7 +100,34 @@ class User(Entity):
         self._email = value
         self.email_confirmed = False
 
+    @property
+    def email_confirmed(self) -> bool:
+        """Return email_confirmed."""
+        return self._email_confirmed
+
+    @email_confirmed.setter
+    def email_confirmed(self, value: bool) -> None:
+        self._email_confirmed = value
+
+    @property
+    def first_name(self) -> str:
+        """Return first_name."""
+        return self._first_name
+
+    @first_name.setter
+    def first_name(self, value: str) -> None:
+        self._first_name = value
+
     @property
     def id(self) -> UserId:
         """Return id."""
         return self._id
+
+    @property
+    def last_name(self) -> str:
+        """Return last_name."""
+        return self._last_name
+
+    @last_name.setter
+    def last_name(self, value: str) -> None:
+        self._last_name = value
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from secrets import randbelow
+from typing import TYPE_CHECKING
+
+from ..application.protocols.email_confirmation_code_service import (
+    EMAIL_CONFIRMATION_CODE_TIMEOUT_SECS,
+    EmailConfirmationCodeServiceValidationError,
+)
+
+if TYPE_CHECKING:
+    from shared.application.cache import Cache
+
+    from ..domain.models import UserId
+
+
+class CacheStoredEmailConfirmationCodeService:
+    """Email confirmation code service. Generates and verifies codes.
+    Codes are stored in any cache, e.g. the in-memory one.
+    """
+
+    CACHE_KEY_PATTERN = 'users:{user_id}:email:{email}:code'
+
+    def __init__(self, cache: Cache) -> None:
+        self._cache = cache
+
+    async def generate(self, user_id: UserId, email: str) -> str:
+        """Generate a code. Cache it for N mins."""
+        code = str(randbelow(1_000_000)).zfill(6)
+
+        cache_key = self.CACHE_KEY_PATTERN.format(user_id=user_id, email=email)
+        await self._cache.set(cache_key, code, EMAIL_CONFIRMATION_CODE_TIMEOUT_SECS)
+
+        return code
+
+    async def verify(self, user_id: UserId, email: str, code: str) -> None:
+        """Verify the received code against the cached one.
+        Delete the cached code if successful.
+
+        Raise:
+            - EmailConfirmationCodeServiceValidationError, if the code isn't valid;
+        """
+        cache_key = self.CACHE_KEY_PATTERN.format(user_id=user_id, email=email)
+        cached_code = await self._cache.get(cache_key)
+
+        if not cached_code or code != cached_code:
+            raise EmailConfirmationCodeServiceValidationError
+
+        await self._cache.delete(cache_key)
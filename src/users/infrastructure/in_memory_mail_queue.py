@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from shared.infrastructure.logging import logger
+
+from ..application.protocols.mail_service import MailClientError
+
+if TYPE_CHECKING:
+    from ..application.protocols.mail_service import MailClient, MailDTO
+
+
+class InMemoryMailQueue:
+    """In-memory implementation of MailQueue protocol. Mails are sent by a task of
+    the process, see run(). Failed mails are logged and dropped.
+    """
+
+    def __init__(self, client: MailClient) -> None:
+        self._client = client
+        self._queue: asyncio.Queue[MailDTO] = asyncio.Queue()
+
+    async def enqueue(self, mail: MailDTO) -> None:
+        """Enqueue the mail for sending."""
+        self._queue.put_nowait(mail)
+
+    async def run(self) -> None:
+        """Send the enqueued mails till cancelled."""
+        while True:
+            mail = await self._queue.get()
+            try:
+                await self._client.send(mail)
+            except MailClientError:
+                logger.exception('Mail to %s failed', mail.email_to)
@@ -9,10 +9,13 @@ if TYPE_CHECKING:
 
 
 class FakeMailClient:
-    """A fake client for mail service. Just prints mails."""
+    """A fake client for mail service, a local stand-in for tests. Just prints mails
+    and keeps them in sent.
+    """
 
     def __init__(self, logger: Logger) -> None:
         self._logger = logger
+        self.sent: list[MailDTO] = []
 
     async def send(self, mail: MailDTO) -> None:
         """Print a mail."""
@@ -20,3 +23,4 @@ class FakeMailClient:
         self._logger.info(mail.email_from)
         self._logger.info(mail.email_to)
         self._logger.info(mail.subject)
+        self.sent.append(mail)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING
+
+import orjson
+from redis.exceptions import RedisError
+
+from shared.infrastructure.logging import logger
+from shared.infrastructure.redis_stream import RedisStreamGroup, get_consumer_name
+
+from ..application.protocols.mail_service import MailDTO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from redis.asyncio import Redis
+
+    from shared.infrastructure.redis_stream import StreamEntry
+
+    from ..application.protocols.mail_service import MailClient
+
+QUEUE_KEY = 'users:mail:queue'  # stream of jobs
+RETRY_KEY = 'users:mail:retry'  # sorted set of jobs by the time of the next attempt
+DEAD_KEY = 'users:mail:dead'  # list of jobs that ran out of attempts
+GROUP = 'mail_workers'
+
+# Move the due retries to the queue atomically, so a job is never lost or doubled
+RESCHEDULE_SCRIPT = """
+local jobs = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, job in ipairs(jobs) do
+    redis.call('ZREM', KEYS[1], job)
+    redis.call('XADD', KEYS[2], '*', 'job', job)
+end
+return #jobs
+"""
+
+
+def encode_job(mail: MailDTO, attempts: int = 0) -> bytes:
+    """Encode the mail and the number of its failed attempts."""
+    return orjson.dumps({'attempts': attempts, 'mail': mail})
+
+
+def decode_job(job: str) -> tuple[MailDTO, int]:
+    """Return the mail and the number of its failed attempts."""
+    data = orjson.loads(job)
+    return MailDTO(**data['mail']), data['attempts']
+
+
+class RedisMailQueue:
+    """Redis implementation of MailQueue protocol. Jobs are added to a stream,
+    which RedisMailWorker consumes.
+    """
+
+    def __init__(self, redis_con: Redis) -> None:
+        self._redis_con = redis_con
+
+    async def enqueue(self, mail: MailDTO) -> None:
+        """Enqueue the mail for sending."""
+        await self._redis_con.xadd(QUEUE_KEY, {'job': encode_job(mail)})
+
+    async def enqueue_many(self, mails: Iterable[MailDTO]) -> None:
+        """Enqueue the mails for sending in one round trip."""
+        async with self._redis_con.pipeline(transaction=False) as pipe:
+            for mail in mails:
+                pipe.xadd(QUEUE_KEY, {'job': encode_job(mail)})
+            await pipe.execute()
+
+
+class RedisMailWorker:
+    """Sends mails of the Redis queue.
+
+    Every client is a persistent connection to the mail provider, the worker runs
+    a consumer per client. A consumer reads a batch of jobs of the consumer group
+    and sends them one by one over its connection. Jobs are acknowledged after the
+    batch, see RedisStreamGroup.
+
+    A failed job is retried after a backoff (exponential, with jitter), after
+    MAX_ATTEMPTS it is pushed to the dead-letter list. A job which can't be decoded
+    is dead-lettered at once, so it isn't redelivered.
+    """
+
+    BATCH_SIZE = 50
+    BACKOFF_BASE_SECS = 2.0
+    BACKOFF_MAX_SECS = 600.0
+    ERROR_PAUSE_SECS = 1.0
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, redis_con: Redis, clients: Sequence[MailClient]) -> None:
+        self._clients = clients
+        self._group = RedisStreamGroup(redis_con, QUEUE_KEY, GROUP)
+        self._redis_con = redis_con
+        self._reschedule = redis_con.register_script(RESCHEDULE_SCRIPT)
+
+    async def run(self) -> None:
+        """Run the consumers till cancelled."""
+        await self._group.create()
+        async with asyncio.TaskGroup() as tg:
+            for number, client in enumerate(self._clients):
+                tg.create_task(self._consume(get_consumer_name(number), client))
+
+    async def _consume(self, consumer: str, client: MailClient) -> None:
+        """Send batches of jobs till cancelled. Redis errors are logged and the
+        batch is retried after a pause.
+        """
+        while True:
+            try:
+                await self._reschedule(keys=[RETRY_KEY, QUEUE_KEY], args=[time.time(), self.BATCH_SIZE])
+                jobs = await self._group.read(consumer, self.BATCH_SIZE)
+                if jobs:
+                    await self._send(client, jobs)
+            except RedisError:
+                logger.exception('Mail consumer %s failed', consumer)
+                await asyncio.sleep(self.ERROR_PAUSE_SECS)
+
+    async def _send(self, client: MailClient, jobs: list[StreamEntry]) -> None:
+        """Send the mails, then acknowledge the jobs and schedule the failed ones."""
+        async with self._redis_con.pipeline(transaction=True) as pipe:
+            for job_id, fields in jobs:
+                try:
+                    mail, attempts = decode_job(fields['job'])
+                except (KeyError, TypeError, ValueError):
+                    logger.exception('Mail job %s is invalid, it is dead-lettered', job_id)
+                    pipe.lpush(DEAD_KEY, fields.get('job') or orjson.dumps(fields))
+                    continue
+
+                try:
+                    await client.send(mail)
+                except Exception:  # noqa: BLE001  # a failed mail must not stop the others
+                    attempts += 1
+                    logger.exception('Mail to %s failed, attempt %s', mail.email_to, attempts)
+                    if attempts < self.MAX_ATTEMPTS:
+                        pipe.zadd(RETRY_KEY, {encode_job(mail, attempts): time.time() + self._get_backoff(attempts)})
+                    else:
+                        pipe.lpush(DEAD_KEY, encode_job(mail, attempts))
+
+            self._group.ack(pipe, *(job_id for job_id, _ in jobs))
+            await pipe.execute()
+
+    def _get_backoff(self, attempts: int) -> float:
+        """Return seconds till the next attempt, a random share of the exponential
+        backoff, so retries of a provider outage don't come at once.
+        """
+        backoff = min(self.BACKOFF_MAX_SECS, self.BACKOFF_BASE_SECS * 2**attempts)
+        return random.uniform(backoff / 2, backoff)  # noqa: S311
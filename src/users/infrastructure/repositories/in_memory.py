@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from shared.errors import NotFoundError
+
+from ...domain.models import User, UserId
+from ...errors import EmailIsUsedError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import date
+
+    from shared.infrastructure.in_memory import InMemoryTransaction
+
+
+@dataclass(frozen=True, slots=True)
+class UserInMemoryModel:
+    """User model for the in-memory storage. Mirrors UserSQLAlchemyModel."""
+
+    birth_date: date
+    email: str
+    email_confirmed: bool
+    first_name: str
+    id: UserId
+    last_name: str
+
+    def to_entity(self) -> User:
+        """Return the domain user."""
+        return User(
+            birth_date=self.birth_date,
+            email=self.email,
+            email_confirmed=self.email_confirmed,
+            first_name=self.first_name,
+            id=self.id,
+            last_name=self.last_name,
+        )
+
+
+class UserInMemoryStorage:
+    """Committed users. Emails are unique, like the unique index of users table."""
+
+    def __init__(self) -> None:
+        self.emails: dict[str, UserId] = {}
+        self.users: dict[UserId, UserInMemoryModel] = {}
+
+    def save(self, user: UserInMemoryModel) -> Callable[[], None]:
+        """Insert or replace the user. Return a callable undoing it.
+
+        Raise:
+            - EmailIsUsedError, if the email is already used by another user;
+        """
+        if self.emails.get(user.email, user.id) != user.id:
+            raise EmailIsUsedError
+
+        if (old_user := self.users.get(user.id)) and old_user.email != user.email:
+            del self.emails[old_user.email]
+
+        self.emails[user.email] = user.id
+        self.users[user.id] = user
+        return lambda: self._restore(user, old_user)
+
+    def _restore(self, user: UserInMemoryModel, old_user: UserInMemoryModel | None) -> None:
+        del self.emails[user.email]
+        del self.users[user.id]
+        if old_user:
+            self.emails[old_user.email] = old_user.id
+            self.users[old_user.id] = old_user
+
+
+class InMemoryUserRepository:
+    """A user repository based on the in-memory storage."""
+
+    def __init__(self, storage: UserInMemoryStorage, transaction: InMemoryTransaction) -> None:
+        self._storage = storage
+        self._transaction = transaction
+
+    async def check_email_unique(self, email: str) -> None:
+        """Check if email is unique.
+
+        Raise:
+            - EmailIsUsedError, if the email is already used;
+        """
+        if email in self._storage.emails:
+            raise EmailIsUsedError
+
+    async def create(self, user: User) -> None:
+        """Create a new user."""
+        stored_user = UserInMemoryModel(
+            birth_date=user.birth_date,
+            email=user.email,
+            email_confirmed=user.email_confirmed,
+            first_name=user.first_name,
+            id=user.id,
+            last_name=user.last_name,
+        )
+        self._transaction.add_change(lambda: self._storage.save(stored_user))
+
+    async def get(self, id: UserId) -> User:
+        """Obtain the user.
+
+        Raise:
+            - shared.errors.NotFoundError, if the user wasn't found
+        """
+        if not (user := self._storage.users.get(id)):
+            raise NotFoundError
+
+        return user.to_entity()
+
+    async def list(self, ids: Iterable[UserId]) -> dict[UserId, User]:
+        """Return users data."""
+        users = self._storage.users
+        return {id_: users[id_].to_entity() for id_ in ids if id_ in users}
+
+    async def update(self, user: User) -> None:
+        """Save the user changes."""
+        updates: dict[str, Any] = {k: getattr(user, k) for k in user.get_changed_fields()}
+
+        self._transaction.add_change(lambda: self._storage.save(replace(self._storage.users[user.id], **updates)))
+
+        user.clear_changed_fields()
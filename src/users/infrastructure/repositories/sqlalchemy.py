@@ -19,7 +19,7 @@ class UserSQLAlchemyModel(Base):
     email: Mapped[str] = mapped_column(unique=True)
     email_confirmed: Mapped[bool]
     first_name: Mapped[str]
-    id: Mapped[UserId] = mapped_column(primary_key=True, index=True)
+    id: Mapped[UserId] = mapped_column(primary_key=True)
     last_name: Mapped[str]
 
     __tablename__ = 'users'
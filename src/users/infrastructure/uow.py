@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from shared.infrastructure.in_memory import InMemoryTransaction
+
+from .repositories.in_memory import InMemoryUserRepository
 from .repositories.redis_cached_sqlalchemy import RedisCachedSQLAlchemyUserRepository
 
 if TYPE_CHECKING:
@@ -11,6 +14,7 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
     from ..domain.repositories import UserRepository
+    from .repositories.in_memory import UserInMemoryStorage
 
 
 class UserSQLAlchemyUnitOfWork:
@@ -39,3 +43,27 @@ class UserSQLAlchemyUnitOfWork:
     def commit(self) -> None:
         """Commit changes."""
         self._to_commit = True
+
+
+class UserInMemoryUnitOfWork:
+    """Unit of work for users stored in memory."""
+
+    def __init__(self, storage: UserInMemoryStorage) -> None:
+        self._storage = storage
+        self._to_commit = False
+
+    async def __aenter__(self) -> Self:
+        self._transaction = InMemoryTransaction()
+        self.user_repo: UserRepository = InMemoryUserRepository(self._storage, self._transaction)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore[no-untyped-def]  # noqa: ANN001
+        try:
+            if not exc_type and self._to_commit:
+                self._transaction.commit()
+        finally:
+            self._transaction.close()
+
+    def commit(self) -> None:
+        """Commit changes."""
+        self._to_commit = True
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ...infrastructure.redis_mail_queue import RedisMailQueue
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from redis.asyncio import Redis
+
+    from ...application.protocols.mail_service import MailDTO
+
+
+async def enqueue_mails(mails: Iterable[MailDTO], redis_con: Redis) -> None:
+    """Enqueue the mails to the mail worker in one round trip."""
+    await RedisMailQueue(redis_con).enqueue_many(mails)
@@ -3,14 +3,16 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, TypedDict
 
-from shared.infrastructure.redis import common as common_redis
-
 from ...infrastructure.repositories.redis_cached_sqlalchemy import RedisCachedSQLAlchemyUserRepository
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from redis.asyncio import Redis
     from sqlalchemy.ext.asyncio import AsyncSession
 
-    from ...domain.models import UserId
+    from ...domain.models import User, UserId
+    from ...infrastructure.repositories.in_memory import UserInMemoryStorage
 
 
 class UserDict(TypedDict):
@@ -21,13 +23,28 @@ class UserDict(TypedDict):
     first_name: str
 
 
-async def get_users_data(ids: list[UserId], db_session: AsyncSession) -> dict[UserId, UserDict]:
+async def get_users_data(ids: list[UserId], db_session: AsyncSession, redis_con: Redis) -> dict[UserId, UserDict]:
     """Return users data by ids."""
-    repo = RedisCachedSQLAlchemyUserRepository(common_redis, db_session)
+    repo = RedisCachedSQLAlchemyUserRepository(redis_con, db_session)
     users_data = await repo.list(ids)
+    return _to_users_dict(users_data.values())
+
+
+async def get_users_emails(ids: list[UserId], db_session: AsyncSession, redis_con: Redis) -> dict[UserId, str]:
+    """Return emails of users by ids, e.g. to notify them."""
+    repo = RedisCachedSQLAlchemyUserRepository(redis_con, db_session)
+    return {id_: user.email for id_, user in (await repo.list(ids)).items()}
+
+
+def get_in_memory_users_data(ids: list[UserId], storage: UserInMemoryStorage) -> dict[UserId, UserDict]:
+    """Return users data by ids in case of STORAGE_BACKEND = 'memory'."""
+    users = storage.users
+    return _to_users_dict(users[id_].to_entity() for id_ in ids if id_ in users)
+
 
+def _to_users_dict(users: Iterable[User]) -> dict[UserId, UserDict]:
     users_dict = {}
-    for user in users_data.values():
+    for user in users:
         today = datetime.now(UTC).date()
         age = (
             today.year
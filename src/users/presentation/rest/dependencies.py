@@ -0,0 +1,44 @@
+"""Storage-dependent objects of the routes, selected by STORAGE_BACKEND."""
+
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from shared.infrastructure.config import get_settings
+
+from ...application.protocols.email_confirmation_code_service import EmailConfirmationCodeService
+from ...application.protocols.mail_service import MailQueue
+from ...domain.uow import UserUnitOfWork
+from ...infrastructure.cache_stored_email_confirmation_code_service import CacheStoredEmailConfirmationCodeService
+from ...infrastructure.redis_mail_queue import RedisMailQueue
+from ...infrastructure.redis_stored_email_confirmation_code_service import RedisStoredEmailConfirmationCodeService
+from ...infrastructure.uow import UserInMemoryUnitOfWork, UserSQLAlchemyUnitOfWork
+
+
+async def get_user_uow(request: Request) -> UserUnitOfWork:
+    """Return unit of work for users."""
+    state = request.app.state
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return UserInMemoryUnitOfWork(state.user_storage)
+    return UserSQLAlchemyUnitOfWork(state.redis, state.db_sessionmaker)
+
+
+async def get_email_confirmation_code_service(request: Request) -> EmailConfirmationCodeService:
+    """Return email confirmation code service."""
+    state = request.app.state
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return CacheStoredEmailConfirmationCodeService(state.in_memory_cache)
+    return RedisStoredEmailConfirmationCodeService(state.redis)
+
+
+async def get_mail_queue(request: Request) -> MailQueue:
+    """Return the queue of mails."""
+    state = request.app.state
+    if get_settings().STORAGE_BACKEND == 'memory':
+        return state.mail_queue  # type: ignore[no-any-return]
+    return RedisMailQueue(state.redis)
+
+
+EmailConfirmationCodeServiceDep = Annotated[EmailConfirmationCodeService, Depends(get_email_confirmation_code_service)]
+MailQueueDep = Annotated[MailQueue, Depends(get_mail_queue)]
+UserUoWDep = Annotated[UserUnitOfWork, Depends(get_user_uow)]
@@ -0,0 +1,42 @@
+"""Background worker: sends mails of the Redis queue, notifies passengers of ride
+changes and users of alerts matching new rides, see RedisMailWorker,
+RedisRideNotificationsWorker and RedisRideAlertsWorker.
+
+Run: python worker.py
+"""
+
+import asyncio
+from contextlib import suppress
+
+from rides.infrastructure.ride_alerts import RedisRideAlertsWorker
+from rides.infrastructure.ride_notifications import RedisRideNotificationsWorker
+from shared.infrastructure.config import get_settings
+from shared.infrastructure.logging import logger
+from shared.infrastructure.redis import create_redis
+from shared.infrastructure.sqlalchemy import create_engine, create_sessionmaker
+from users.infrastructure.mail_service import FakeMailClient
+from users.infrastructure.redis_mail_queue import RedisMailWorker
+
+
+async def main() -> None:
+    """Run the workers till interrupted."""
+    settings = get_settings()
+    db_engine = create_engine(settings)
+    redis = create_redis(settings)
+    session_factory = create_sessionmaker(db_engine)
+    clients = [FakeMailClient(logger) for _ in range(settings.MAIL_WORKER_CONNECTIONS)]
+
+    logger.info('Worker is started with %s mail connections', len(clients))
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(RedisMailWorker(redis, clients).run())
+            tg.create_task(RedisRideNotificationsWorker(redis, session_factory, settings.EMAIL_FROM).run())
+            tg.create_task(RedisRideAlertsWorker(redis, session_factory, settings.EMAIL_FROM).run())
+    finally:
+        await redis.aclose()
+        await db_engine.dispose()
+
+
+if __name__ == '__main__':
+    with suppress(KeyboardInterrupt):
+        asyncio.run(main())